@@ -0,0 +1,173 @@
+"""Неблокирующее логирование.
+
+Вызов logger.info(...) только раскладывает запись по ограниченным очередям
+приёмников. Файлы и консоль пишет один фоновый поток пачками, виджет Tk
+получает пачки строк в своём потоке через master.after.
+"""
+import atexit
+import collections
+import logging
+import threading
+from logging.handlers import BaseRotatingHandler
+
+DROP_OLDEST = "drop_oldest"
+DROP_NEWEST = "drop_newest"
+
+
+class LogSink:
+    """Приёмник логов с собственной ограниченной очередью и политикой сброса.
+
+    Записи уровня keep_level и выше (ошибки, аварии) не сбрасываются: они
+    принимаются и в полную очередь, а политика применяется к остальным.
+    """
+
+    def __init__(self, maxsize=10000, policy=DROP_OLDEST, level=logging.NOTSET, keep_level=logging.ERROR):
+        self.queue = collections.deque()
+        self.maxsize = maxsize
+        self.policy = policy
+        self.level = level
+        self.keep_level = keep_level
+        self.dropped = 0
+        self._lock = threading.Lock()
+
+    def offer(self, record):
+        """Поставить запись в очередь; возвращает длину очереди"""
+        if record.levelno < self.level:
+            return 0
+        keep = record.levelno >= self.keep_level
+        with self._lock:
+            queue = self.queue
+            if len(queue) >= self.maxsize and not keep:
+                self.dropped += 1
+                # Старейшая запись уходит, только если она сама не из сохраняемых
+                if self.policy == DROP_NEWEST or queue[0].levelno >= self.keep_level:
+                    return len(queue)
+                queue.popleft()
+            queue.append(record)
+            return len(queue)
+
+    def drain(self):
+        with self._lock:
+            batch = list(self.queue)
+            self.queue.clear()
+        return batch
+
+
+class HandlerSink(LogSink):
+    """Обёртка над обычным logging.Handler; пишется фоновым потоком"""
+
+    def __init__(self, handler, **kwargs):
+        super().__init__(**kwargs)
+        self.handler = handler
+
+    def write(self, batch):
+        handler = self.handler
+        # Ротируемые файлы должны проверять размер на каждой записи
+        if isinstance(handler, BaseRotatingHandler) or not isinstance(handler, logging.StreamHandler):
+            for record in batch:
+                handler.handle(record)
+            return
+        handler.acquire()
+        try:
+            if handler.stream is None:
+                handler.stream = handler._open()
+            text = "".join(handler.format(r) + handler.terminator for r in batch if handler.filter(r))
+            handler.stream.write(text)
+            handler.flush()
+        except Exception:
+            handler.handleError(batch[-1])
+        finally:
+            handler.release()
+
+    def close(self):
+        self.handler.close()
+
+
+class TkSink(LogSink):
+    """Передаёт отформатированные строки в виджет пачками в потоке Tk"""
+
+    def __init__(self, master, consumer, interval_ms=50, formatter=None, **kwargs):
+        super().__init__(**kwargs)
+        self.master = master
+        self.consumer = consumer
+        self.interval_ms = interval_ms
+        self.formatter = formatter or logging.Formatter()
+        self.master.after(interval_ms, self._poll)
+
+    def _poll(self):
+        batch = self.drain()
+        if batch:
+            self.consumer([(r.levelno, self.formatter.format(r)) for r in batch])
+        self.master.after(self.interval_ms, self._poll)
+
+
+class AsyncLogDispatcher(logging.Handler):
+    """Обработчик логгера: кладёт записи в очереди и будит поток записи"""
+
+    def __init__(self, flush_interval=0.2, wake_backlog=1000):
+        super().__init__()
+        self.sinks = []
+        self.flush_interval = flush_interval
+        self.wake_backlog = wake_backlog
+        self._wake = threading.Event()
+        self._write_lock = threading.Lock()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="log-writer", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def add_sink(self, sink):
+        self.sinks.append(sink)
+        return sink
+
+    def handle(self, record):
+        # Без блокировки обработчика: у каждого приёмника своя очередь
+        if not self.filter(record):
+            return False
+        if record.args:
+            record.msg = record.getMessage()
+            record.args = None
+        backlog = 0
+        for sink in self.sinks:
+            backlog = max(backlog, sink.offer(record))
+        # Большой хвост пишем сразу, не дожидаясь интервала
+        if backlog >= self.wake_backlog:
+            self._wake.set()
+        return True
+
+    def emit(self, record):
+        self.handle(record)
+
+    def _write_pending(self):
+        with self._write_lock:
+            for sink in self.sinks:
+                if isinstance(sink, HandlerSink):
+                    batch = sink.drain()
+                    if batch:
+                        sink.write(batch)
+
+    def _run(self):
+        while not self._closed:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            self._write_pending()
+
+    def flush(self):
+        """Синхронно дописать всё, что накопилось в файловых очередях"""
+        self._write_pending()
+
+    def stats(self):
+        return [{"sink": type(s.handler if isinstance(s, HandlerSink) else s).__name__,
+                 "queued": len(s.queue), "dropped": s.dropped} for s in self.sinks]
+
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        self._wake.set()
+        self._thread.join(timeout=2)
+        self._write_pending()
+        for sink in self.sinks:
+            if isinstance(sink, HandlerSink):
+                sink.close()
+        super().close()
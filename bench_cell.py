@@ -0,0 +1,139 @@
+"""Ячейка манипуляторов: процессор и память на каждый добавленный манипулятор.
+
+Каждый замер - отдельный процесс: N манипуляторов строятся в одном окне Tk,
+включаются и --seconds секунд двигаются демонстрационным движением
+(10 раз в секунду), опрос моторов раз в секунду. Сравниваются:
+    cell - CellManager: одно колесо таймеров, плитки на общих холстах;
+    gui  - N окон RobotARM_IMR165_GUI (Toplevel), у каждого свой поток опроса,
+           рассылка телеметрии и дерево виджетов (до --gui-max манипуляторов).
+Память: прирост RSS процесса (Linux, /proc/self/statm) и объём объектов
+Python по tracemalloc. Нужен дисплей с настоящим Tk (рабочий стол или
+xvfb-run); версия Tk, оконная система и дисплей печатаются перед таблицей,
+чтобы цифры не расходились с условиями замера.
+
+Запуск: python bench_cell.py [--sizes 1 4 12 25 50] [--seconds 3] [--gui-max 12]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+import tkinter as tk
+
+import gui
+from cell_manager import CellManager, demo_pose
+
+
+def has_display():
+    return sys.platform.startswith("win") or sys.platform == "darwin" or bool(os.environ.get("DISPLAY"))
+
+
+def rss_kb():
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") // 1024
+    except (OSError, ValueError, AttributeError):
+        return 0
+
+
+def build_cell(root, arms):
+    cell = CellManager(root, arms=arms)
+    cell.power_on_all()
+    cell.start_demo()
+
+
+def build_gui(root, arms):
+    gui.RobotARM_IMR165_GUI.TELEMETRY_PORT = 0
+    # Индекс рабочей зоны можно разделить между окнами, в сравнение он не входит
+    gui.RobotARM_IMR165_GUI.setup_workspace = lambda self: None
+    apps = [gui.RobotARM_IMR165_GUI(tk.Toplevel(root)) for _ in range(arms)]
+    for app in apps:
+        app.power_on()
+    start = time.perf_counter()
+
+    def step():
+        t = time.perf_counter() - start
+        for k, app in enumerate(apps):
+            app.core.set_joints(demo_pose(t, k))
+        root.after(100, step)
+
+    step()
+
+
+def child(kind, arms, seconds):
+    root = tk.Tk()
+    root.geometry("1200x800")
+    root.update()
+    threads = threading.active_count()
+    rss = rss_kb()
+    tracemalloc.start()
+    start = time.perf_counter()
+    (build_cell if kind == "cell" else build_gui)(root, arms)
+    root.update()
+    build = time.perf_counter() - start
+    python_kb = tracemalloc.get_traced_memory()[0] // 1024
+    tracemalloc.stop()
+
+    cpu, wall = time.process_time(), time.perf_counter()
+    root.after(int(seconds * 1000), root.quit)
+    root.mainloop()
+    cpu = (time.process_time() - cpu) / (time.perf_counter() - wall)
+    print(json.dumps({"build_ms": build * 1000, "python_kb": python_kb, "rss_kb": rss_kb() - rss,
+                      "cpu": cpu, "threads": threading.active_count() - threads,
+                      "tk": f"Tk {root.tk.call('info', 'patchlevel')}, {root.tk.call('tk', 'windowingsystem')}"}))
+    sys.stdout.flush()
+    # Потоки опроса окон gui не останавливаются: процесс завершается сразу
+    os._exit(0)
+
+
+def run(kind, arms, seconds, directory):
+    output = subprocess.run([sys.executable, os.path.abspath(__file__), "--child", kind, str(arms), str(seconds)],
+                            capture_output=True, text=True, check=True, cwd=directory).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Процессор и память ячейки манипуляторов")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 4, 12, 25, 50])
+    parser.add_argument("--seconds", type=float, default=3.0)
+    parser.add_argument("--gui-max", type=int, default=12)
+    parser.add_argument("--child", nargs=3, help=argparse.SUPPRESS)
+    options = parser.parse_args()
+    if options.child:
+        kind, arms, seconds = options.child
+        child(kind, int(arms), float(seconds))
+    if not has_display():
+        print("Нет дисплея: замер требует Tk")
+        return
+
+    header = True
+    with tempfile.TemporaryDirectory() as directory:
+        for kind in ("cell", "gui"):
+            sizes = [n for n in options.sizes if kind == "cell" or n <= options.gui_max]
+            first = None
+            for arms in sizes:
+                result = run(kind, arms, options.seconds, directory)
+                if header:
+                    header = False
+                    print(f"{result['tk']}, дисплей {os.environ.get('DISPLAY', '-')}")
+                    print(f"{'вариант':>8}{'манип.':>8}{'сборка, мс':>12}{'CPU, %':>8}{'RSS, КБ':>10}"
+                          f"{'Python, КБ':>12}{'потоков':>9}{'CPU/манип.':>12}{'КБ/манип.':>11}")
+                # Прирост относительно наименьшей ячейки: цена ещё одного манипулятора
+                if first is None:
+                    first = (arms, result)
+                    per_cpu = per_kb = ""
+                else:
+                    added = arms - first[0]
+                    per_cpu = f"{(result['cpu'] - first[1]['cpu']) * 100 / added:.2f}"
+                    per_kb = f"{(result['rss_kb'] - first[1]['rss_kb']) / added:.0f}"
+                print(f"{kind:>8}{arms:>8}{result['build_ms']:>12.1f}{result['cpu'] * 100:>8.1f}"
+                      f"{result['rss_kb']:>10,}{result['python_kb']:>12,}{result['threads']:>9}"
+                      f"{per_cpu:>12}{per_kb:>11}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""Обратная кинематика: решений в секунду и среднее число итераций.
+
+1. Пошаговое перемещение инструмента (шаг --step вперёд-назад, как кнопки X/Y)
+   с кэшем и без.
+2. Холодные решения из домашней позы до случайных достижимых точек.
+3. Путь из --path точек: по одной через solve() с тёплым стартом против
+   solve_path (тот же тёплый старт за один вызов) и solve_path с закреплённой
+   стойкой (маска суставов).
+
+Запуск: python bench_ik.py [--jogs 5000] [--step 5] [--path 10000]
+"""
+import argparse
+import random
+import time
+
+from inverse_kinematics import IKSolver
+from kinematics import forward_kinematics
+
+START = [30, 60, 30, 20, 0, 0]
+
+
+def jog_sequence(count, step, rng):
+    """Направления шагов: оператор ходит туда-обратно по небольшой области"""
+    directions = [(step, 0), (-step, 0), (0, step), (0, -step)]
+    sequence = []
+    while len(sequence) < count:
+        dx, dy = rng.choice(directions)
+        repeat = rng.randint(1, 8)
+        sequence += [(dx, dy)] * repeat + [(-dx, -dy)] * repeat
+    return sequence[:count]
+
+
+def bench_jog(solver, sequence):
+    current = list(START)
+    failed = 0
+    start = time.perf_counter()
+    for dx, dy in sequence:
+        x, y = forward_kinematics(current)[0][-1]
+        result = solver.solve((x + dx, y + dy), current)
+        if result.converged:
+            current = result.angles
+        else:
+            failed += 1
+    return len(sequence) / (time.perf_counter() - start), failed
+
+
+def reachable_targets(count, rng):
+    return [forward_kinematics([rng.uniform(0, 180) for _ in range(4)] + [0, 0])[0][-1] for _ in range(count)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Скорость обратной кинематики")
+    parser.add_argument("--jogs", type=int, default=5000)
+    parser.add_argument("--step", type=float, default=5.0)
+    parser.add_argument("--cold", type=int, default=500)
+    parser.add_argument("--path", type=int, default=10000)
+    options = parser.parse_args()
+    rng = random.Random(1)
+
+    sequence = jog_sequence(options.jogs, options.step, rng)
+    print(f"Пошаговое перемещение, {options.jogs} шагов по {options.step:g}:")
+    print(f"{'кэш':>10}{'решений/с':>12}{'итераций':>10}{'попаданий':>11}{'неудач':>8}")
+    for name, cache_size in (("нет", 0), ("LRU 256", 256)):
+        solver = IKSolver(cache_size=cache_size)
+        rate, failed = bench_jog(solver, sequence)
+        stats = solver.stats()
+        print(f"{name:>10}{rate:>12,.0f}{stats['avg_iterations']:>10.2f}{stats['hit_ratio']:>11.0%}{failed:>8}")
+
+    solver = IKSolver(cache_size=0)
+    targets = reachable_targets(options.cold, rng)
+    start = time.perf_counter()
+    failed = sum(not solver.solve(target, START).converged for target in targets)
+    rate = options.cold / (time.perf_counter() - start)
+    print(f"\nХолодные решения из {START[:4]}: {rate:,.0f} решений/с, "
+          f"итераций {solver.stats()['avg_iterations']:.1f}, не сошлось {failed} из {options.cold}")
+
+    # Прямая линия от текущей точки инструмента
+    x0, y0 = forward_kinematics(START)[0][-1]
+    path = [(x0 + 60 * k / options.path, y0 - 40 * k / options.path) for k in range(options.path)]
+    solver = IKSolver(cache_size=0)
+    current = list(START)
+    start = time.perf_counter()
+    for target in path:
+        result = solver.solve(target, current)
+        current = result.angles
+    sequential = time.perf_counter() - start
+    print(f"\nПуть из {options.path} точек:")
+    print(f"  {'по одной с тёплым стартом:':<31}{options.path / sequential:>12,.0f} точек/с, "
+          f"итераций {solver.stats()['avg_iterations']:.2f}")
+    try:
+        import numpy  # импорт numpy не входит в замер
+        for name, mask in (("solve_path:", None), ("solve_path, стойка закреплена:", [0, 1, 1, 1])):
+            solver = IKSolver(cache_size=0)
+            start = time.perf_counter()
+            result = solver.solve_path(path, START, mask=mask)
+            batch = time.perf_counter() - start
+            print(f"  {name:<31}{options.path / batch:>12,.0f} точек/с, "
+                  f"итераций {result.iterations / options.path:.2f}, сошлось {int(result.converged.sum())}, "
+                  f"ошибка max {float(result.error.max()):.3f}")
+    except ImportError:
+        print("  solve_path: numpy не установлен")
+
+if __name__ == "__main__":
+    main()
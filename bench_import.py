@@ -0,0 +1,77 @@
+"""Время импорта и запуска: RobotCore без интерфейса против окна gui.py.
+
+Каждый замер - отдельный процесс python, печатается медиана по --runs
+запускам: время импорта модуля, загружен ли tkinter и время до готовности
+(RobotCore включён / окно построено). Окно строится, только если есть дисплей.
+Ни один модуль, включая gui, не должен загружать tkinter при импорте: иначе
+код возврата 1.
+
+Запуск: python bench_import.py [--runs 10]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+CASES = [
+    ("robot_core", "import robot_core",
+     "core = robot_core.RobotCore(); core.power_on()"),
+    ("control_server", "import control_server",
+     "control_server.ControlServer(port=0)"),
+    ("gui", "import gui",
+     "import tkinter; root = tkinter.Tk(); app = gui.RobotARM_IMR165_GUI(root); root.update(); "
+     "app.telemetry_hub.close(); app.positions.close(); app.log_dispatcher.close(); root.destroy()"),
+]
+
+PROBE = """
+import sys, time
+t0 = time.perf_counter()
+{imports}
+t1 = time.perf_counter()
+tk_loaded = 'tkinter' in sys.modules
+{startup}
+t2 = time.perf_counter()
+print(t1 - t0, t2 - t1, int(tk_loaded))
+"""
+
+
+def has_display():
+    return sys.platform.startswith("win") or sys.platform == "darwin" or bool(os.environ.get("DISPLAY"))
+
+
+def measure(imports, startup, runs):
+    results = []
+    for _ in range(runs):
+        output = subprocess.run([sys.executable, "-c", PROBE.format(imports=imports, startup=startup)],
+                                capture_output=True, text=True, check=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__))).stdout.split()
+        results.append((float(output[0]), float(output[1]), output[2] == "1"))
+    return (statistics.median(r[0] for r in results), statistics.median(r[1] for r in results),
+            results[0][2])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Время импорта и запуска")
+    parser.add_argument("--runs", type=int, default=10)
+    options = parser.parse_args()
+
+    print(f"{'модуль':>16}{'импорт, мс':>12}{'запуск, мс':>12}  tkinter")
+    eager = []
+    for name, imports, startup in CASES:
+        if name == "gui" and not has_display():
+            startup_ms = "нет дисплея"
+            imported, _, tk_loaded = measure(imports, "pass", options.runs)
+        else:
+            imported, started, tk_loaded = measure(imports, startup, options.runs)
+            startup_ms = f"{started * 1000:.2f}"
+        print(f"{name:>16}{imported * 1000:>12.1f}{startup_ms:>12}  {'да' if tk_loaded else 'нет'}")
+        if tk_loaded:
+            eager.append(name)
+    if eager:
+        print(f"tkinter загружается при импорте: {', '.join(eager)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""Пропускная способность прямой кинематики: прежний цикл из draw_robot,
+поштучный forward_kinematics и пакетный forward_kinematics_batch (numpy).
+
+Запуск: python bench_kinematics.py [поз]
+"""
+import math
+import random
+import sys
+import time
+
+import numpy as np
+
+from kinematics import KinematicChain, forward_kinematics, forward_kinematics_batch
+
+
+def legacy_fk(joint_angles):
+    """Расчёт в том виде, в каком он был встроен в draw_robot"""
+    base_radius, lengths = 50, [80, 120, 80, 40]
+    angles = [math.radians(a) for a in joint_angles]
+    points = [(0, 0)]
+    for i in range(4):
+        x = points[-1][0] + (base_radius if i == 0 else lengths[i - 1]) * math.cos(sum(angles[:i + 1]))
+        y = points[-1][1] + (base_radius if i == 0 else lengths[i - 1]) * math.sin(sum(angles[:i + 1]))
+        points.append((x, y))
+    return points, sum(angles[:5]) + angles[5]
+
+
+def measure(func, poses, count):
+    start = time.perf_counter()
+    func(poses)
+    return count / (time.perf_counter() - start)
+
+
+def replay_trace(steps=100_000):
+    """Трасса оператора: каждый шаг двигает один сустав, чаще запястье и инструмент"""
+    rng = random.Random(1)
+    chain = KinematicChain()
+    angles = [0] * 6
+    start = time.perf_counter()
+    for _ in range(steps):
+        idx = rng.choices(range(6), weights=[1, 1, 1, 3, 3, 3])[0]
+        angles[idx] = rng.randint(0, 180)
+        chain.set_angle(idx, angles[idx])
+        chain.update()
+    elapsed = time.perf_counter() - start
+    assert chain.points == forward_kinematics(angles)[0]
+    return chain.stats(), steps / elapsed
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    poses = np.random.default_rng(0).uniform(0, 180, size=(n, 6))
+    sample = [[random.uniform(0, 180) for _ in range(6)] for _ in range(min(n, 100_000))]
+
+    # Проверка совпадения с прежним расчётом
+    points, tool = forward_kinematics_batch(np.array(sample[:100]))
+    for i, pose in enumerate(sample[:100]):
+        old_points, old_tool = legacy_fk(pose)
+        assert np.allclose(points[i], old_points) and math.isclose(tool[i], old_tool)
+
+    results = [
+        ("прежний цикл draw_robot", measure(lambda p: [legacy_fk(a) for a in p], sample, len(sample))),
+        ("forward_kinematics", measure(lambda p: [forward_kinematics(a) for a in p], sample, len(sample))),
+    ]
+    for size in sorted({min(size, n) for size in (1_000, 100_000, n)}):
+        batch = poses[:size]
+        results.append((f"batch, N={size}", measure(forward_kinematics_batch, batch, size)))
+
+    print(f"{'способ':<28}{'поз/с':>16}")
+    for name, rate in results:
+        print(f"{name:<28}{rate:>16,.0f}")
+
+    stats, rate = replay_trace()
+    print(f"\nKinematicChain на трассе оператора: {rate:,.0f} шагов/с, "
+          f"звеньев взято из кэша {stats['reused']}, пересчитано {stats['recomputed']} "
+          f"({stats['reuse_ratio']:.0%} повторного использования)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""Большой журнал: последние строки, строка N и обратный проход через LineIndex.
+
+Создаётся журнал --size-mb МБ в формате robot_system.log. Прежний способ -
+пройти файл построчно (for line in file) и оставить последние --tail строк.
+Для LineIndex меряются: построение индекса с нуля, повторное открытие с
+готовым индексом, хвост, случайный доступ к строкам, обратный проход и
+дописывание в файл с последующим refresh. Файл остаётся в кэше ОС, время
+холодного диска сюда не входит.
+
+Запуск: python bench_line_index.py [--size-mb 1024] [--tail 1000] [--dir /tmp]
+"""
+import argparse
+import collections
+import os
+import random
+import tempfile
+import time
+
+from line_index import LineIndex
+
+LEVELS = ("INFO", "INFO", "INFO", "WARNING", "ERROR")
+
+
+def write_log(path, size):
+    """Журнал размером около size байт; возвращает число строк"""
+    rng = random.Random(0)
+    block = []
+    for n in range(20000):
+        block.append(f"2026-10-17 12:{n // 60 % 60:02d}:{n % 60:02d},{n % 1000:03d} - robot_logger - "
+                     f"{rng.choice(LEVELS)} - Двигатель {rng.randint(1, 6)}: {rng.uniform(25, 45):.1f}°C, "
+                     f"углы {[rng.randint(0, 180) for _ in range(6)]}\n")
+    data = "".join(block).encode('utf-8')
+    count = 0
+    with open(path, 'wb') as f:
+        while f.tell() < size:
+            f.write(data)
+            count += len(block)
+    return count
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, (time.perf_counter() - start) * 1000
+
+
+def scan_tail(path, count):
+    with open(path, encoding='utf-8') as f:
+        return list(collections.deque(f, maxlen=count))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Чтение большого журнала по индексу строк")
+    parser.add_argument("--size-mb", type=int, default=1024)
+    parser.add_argument("--tail", type=int, default=1000)
+    parser.add_argument("--random", type=int, default=10000, help="строк для случайного доступа")
+    parser.add_argument("--reverse", type=int, default=100000, help="строк обратного прохода")
+    parser.add_argument("--dir", default=None, help="каталог для временного журнала")
+    options = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(dir=options.dir) as directory:
+        path = os.path.join(directory, "robot_system.log")
+        lines, elapsed = timed(write_log, path, options.size_mb << 20)
+        print(f"Журнал: {os.path.getsize(path) / (1 << 20):,.0f} МБ, строк {lines:,}, запись {elapsed / 1000:.1f} с")
+        rows = []
+
+        tail, elapsed = timed(scan_tail, path, options.tail)
+        rows.append((f"построчный проход, {options.tail} посл.", elapsed))
+
+        index, elapsed = timed(LineIndex, path)
+        rows.append(("индекс с нуля", elapsed))
+        assert len(index) == lines
+        index.close()
+
+        index, elapsed = timed(LineIndex, path)
+        rows.append(("открытие с готовым индексом", elapsed))
+        result, elapsed = timed(index.tail, options.tail)
+        rows.append((f"tail({options.tail})", elapsed))
+        assert result == [line.rstrip("\n") for line in tail]
+
+        numbers = [random.randrange(lines) for _ in range(options.random)]
+        _, elapsed = timed(lambda: [index[n] for n in numbers])
+        rows.append((f"{options.random} случайных строк", elapsed))
+
+        _, elapsed = timed(lambda: sum(1 for _ in zip(range(options.reverse), index.reverse())))
+        rows.append((f"обратный проход, {options.reverse} строк", elapsed))
+
+        with open(path, 'ab') as f:
+            f.write(b"2026-10-17 13:00:00,000 - robot_logger - INFO - new\n" * 200000)
+        added, elapsed = timed(index.refresh)
+        rows.append((f"refresh после +{added} строк", elapsed))
+        index.close()
+
+        print(f"{'операция':>40}{'мс':>12}")
+        for name, ms in rows:
+            print(f"{name:>40}{ms:>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
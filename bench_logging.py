@@ -0,0 +1,89 @@
+"""Логирование до и после: синхронная цепочка обработчиков из setup_logging
+против AsyncLogDispatcher. Меряются вызовы в секунду и задержка в вызывающем потоке.
+
+Запуск: python bench_logging.py [записей]
+Файлы пишутся во временный каталог, консольный вывод - в os.devnull.
+"""
+import logging
+import os
+import sys
+import tempfile
+import time
+from logging.handlers import RotatingFileHandler
+
+from async_logging import AsyncLogDispatcher, HandlerSink, LogSink
+
+
+class WidgetStandIn(logging.Handler):
+    """Замена TextHandler без Tk: форматирует и копит строки, как вставка в виджет"""
+
+    def __init__(self):
+        super().__init__()
+        self.lines = []
+
+    def emit(self, record):
+        self.lines.append(self.format(record) + '\n')
+
+
+def make_handlers(directory, devnull):
+    formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
+    handlers = [
+        RotatingFileHandler(os.path.join(directory, 'robot_system.log'), maxBytes=16, backupCount=3),
+        logging.FileHandler(os.path.join(directory, 'emergency.log')),
+        logging.StreamHandler(devnull),
+    ]
+    for handler in handlers:
+        handler.setFormatter(formatter)
+    return handlers
+
+
+def run(logger, count):
+    samples = []
+    start = time.perf_counter()
+    for i in range(count):
+        t = time.perf_counter()
+        logger.info(f"Сустав {i % 6 + 1} установлен на {i % 180}°")
+        samples.append(time.perf_counter() - t)
+    elapsed = time.perf_counter() - start
+    samples.sort()
+    return count / elapsed, samples[len(samples) // 2], samples[int(len(samples) * 0.99)], samples[-1]
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    results = {}
+    with tempfile.TemporaryDirectory() as directory, open(os.devnull, 'w') as devnull:
+        logger = logging.getLogger('bench_sync')
+        logger.propagate = False
+        logger.setLevel(logging.INFO)
+        for handler in make_handlers(directory, devnull) + [WidgetStandIn()]:
+            logger.addHandler(handler)
+        results["синхронно (4 обработчика)"] = run(logger, count)
+        for handler in logger.handlers:
+            handler.close()
+
+        logger = logging.getLogger('bench_async')
+        logger.propagate = False
+        logger.setLevel(logging.INFO)
+        dispatcher = AsyncLogDispatcher()
+        for handler in make_handlers(directory, devnull):
+            dispatcher.add_sink(HandlerSink(handler, maxsize=count))
+        dispatcher.add_sink(LogSink(maxsize=1000))
+        logger.addHandler(dispatcher)
+        results["AsyncLogDispatcher"] = run(logger, count)
+        start = time.perf_counter()
+        dispatcher.close()
+        drain = time.perf_counter() - start
+        stats = dispatcher.stats()
+
+    print(f"Записей: {count}")
+    print(f"{'вариант':<28}{'вызовов/с':>12}{'p50, мкс':>10}{'p99, мкс':>10}{'max, мкс':>10}")
+    for name, (rate, p50, p99, worst) in results.items():
+        print(f"{name:<28}{rate:>12,.0f}{p50 * 1e6:>10.1f}{p99 * 1e6:>10.1f}{worst * 1e6:>10.0f}")
+    print(f"Дозапись очередей при закрытии: {drain * 1000:.0f} мс")
+    for sink in stats:
+        print(f"  {sink['sink']}: отброшено {sink['dropped']}")
+
+
+if __name__ == "__main__":
+    main()
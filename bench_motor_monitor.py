@@ -0,0 +1,94 @@
+"""Работа update_motor_monitor на обновление: полная перезапись строк против TreeviewDiff.
+
+Телеметрия моделируется на частотах 10, 100 и 1000 Гц в течение 10 с: температура
+меняется медленно с небольшим шумом, суставы двигаются только часть времени.
+С дисплеем используется настоящий ttk.Treeview, без него - счётчик вызовов.
+
+Запуск: python bench_motor_monitor.py
+"""
+import math
+import random
+import time
+
+from tree_diff import TreeviewDiff
+
+COLUMNS = ('motor', 'temp', 'pos_ticks', 'pos_rad', 'pos_deg')
+
+
+class CountingTree:
+    """Заменитель Treeview без дисплея: только считает обращения к Tk"""
+
+    def __init__(self):
+        self.calls = 0
+
+    def item(self, item, values=None):
+        self.calls += 1
+
+    def set(self, item, column, value):
+        self.calls += 1
+
+
+def make_tree():
+    try:
+        import tkinter as tk
+        from tkinter import ttk
+        root = tk.Tk()
+    except Exception:
+        return None, [CountingTree(), CountingTree()], "счётчик вызовов (нет дисплея)"
+    trees = []
+    for _ in range(2):
+        tree = ttk.Treeview(root, columns=COLUMNS, show='headings', height=6)
+        for i in range(6):
+            tree.insert('', 'end', values=(f'Мотор {i + 1}', '0.0', '0', '0.00', '0'))
+        trees.append(tree)
+    return root, trees, "ttk.Treeview"
+
+
+def telemetry(rate, seconds, seed=0):
+    rng = random.Random(seed)
+    temps = [35.0] * 6
+    angles = [0.0] * 6
+    for n in range(int(rate * seconds)):
+        t = n / rate
+        moving = int(t) % 4 == 0  # сустав 2 двигается одну секунду из четырёх
+        if moving:
+            angles[1] = (angles[1] + 20.0 / rate) % 180
+        for i in range(6):
+            temps[i] += rng.gauss(0, 0.02) + 0.01 * math.sin(t / 30)
+        yield temps, angles
+
+
+def rows(items, temps, angles):
+    for i, item in enumerate(items):
+        yield item, (f'Мотор {i + 1}', f'{temps[i]:.1f}', f'{int(angles[i] * 10)}',
+                     f'{math.radians(angles[i]):.2f}', f'{angles[i]:.0f}')
+
+
+def main():
+    root, (full_tree, diff_tree), kind = make_tree()
+    items = [f"I00{i + 1}" for i in range(6)] if root is None else list(full_tree.get_children())
+    print(f"Дерево: {kind}")
+    print(f"{'частота':>8}{'обновлений':>12}{'ячеек/обн.':>15}{'ячеек/обн. diff':>17}"
+          f"{'мкс (полн.)':>13}{'мкс (diff)':>12}")
+    for rate in (10, 100, 1000):
+        diff = TreeviewDiff(diff_tree, COLUMNS)
+        full_time = diff_time = 0.0
+        refreshes = 0
+        for temps, angles in telemetry(rate, 10):
+            refreshes += 1
+            start = time.perf_counter()
+            for item, values in rows(items, temps, angles):
+                full_tree.item(item, values=values)
+            full_time += time.perf_counter() - start
+            start = time.perf_counter()
+            diff.update(rows(items, temps, angles))
+            diff_time += time.perf_counter() - start
+        stats = diff.stats()
+        print(f"{rate:>6} Гц{refreshes:>12}{len(COLUMNS) * len(items):>15}{stats['updated_per_refresh']:>17.2f}"
+              f"{full_time / refreshes * 1e6:>13.1f}{diff_time / refreshes * 1e6:>12.1f}")
+    if root is not None:
+        root.destroy()
+
+
+if __name__ == "__main__":
+    main()
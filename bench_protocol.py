@@ -0,0 +1,147 @@
+"""Сравнение текстового и бинарного протоколов сервера управления.
+
+1. Кодирование и разбор без сети: сообщений в секунду.
+2. Обмен через сокет с конвейером глубины --depth: SET_JOINTS и запрос
+   состояния, сообщений в секунду и байт на сообщение (запрос + ответ).
+Сервер поднимается в этом же процессе в отдельном потоке.
+
+Запуск: python bench_protocol.py [--messages 20000] [--depth 32]
+"""
+import argparse
+import asyncio
+import random
+import socket
+import threading
+import time
+
+import protocol
+from control_server import ControlServer
+
+
+def bench_codec(count):
+    rng = random.Random(1)
+    angles = [[rng.uniform(0, 180) for _ in range(6)] for _ in range(256)]
+
+    start = time.perf_counter()
+    for i in range(count):
+        line = ("JOINTS " + " ".join(f"{a:g}" for a in angles[i & 255]) + "\n").encode()
+        parts = line.decode().split()
+        [float(a) for a in parts[1:]]
+    text_rate = count / (time.perf_counter() - start)
+
+    buffer = bytearray(64)
+    parser = protocol.FrameParser()
+    start = time.perf_counter()
+    for i in range(count):
+        size = protocol.encode_into(buffer, 0, protocol.SET_JOINTS, *angles[i & 255])
+        target = parser.free()
+        target[:size] = buffer[:size]
+        parser.feed(size)
+        for kind, payload in parser.frames():
+            protocol.decode(kind, payload)
+    binary_rate = count / (time.perf_counter() - start)
+    return text_rate, binary_rate
+
+
+def start_server():
+    """Сервер в фоновом потоке; возвращает (сервер, цикл событий)"""
+    ready = threading.Event()
+    holder = {}
+
+    def run():
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        holder["loop"] = loop
+        holder["server"] = loop.run_until_complete(ControlServer(port=0, binary_port=0).start())
+        ready.set()
+        loop.run_forever()
+
+    threading.Thread(target=run, daemon=True).start()
+    ready.wait()
+    return holder["server"], holder["loop"]
+
+
+def text_requests(count, rng):
+    for i in range(count):
+        if i % 4 == 3:
+            yield b"GET\n"
+        else:
+            yield ("JOINTS " + " ".join(f"{rng.uniform(0, 180):.2f}" for _ in range(6)) + "\n").encode()
+
+
+def bench_text(port, count, depth):
+    rng = random.Random(2)
+    sock = socket.create_connection(("127.0.0.1", port))
+    sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    replies = sock.makefile('rb')
+    sent = received = done = 0
+    requests = text_requests(count, rng)
+    start = time.perf_counter()
+    for i, line in enumerate(requests):
+        sock.sendall(line)
+        sent += len(line)
+        if i + 1 - done >= depth:
+            received += len(replies.readline())
+            done += 1
+    while done < count:
+        received += len(replies.readline())
+        done += 1
+    elapsed = time.perf_counter() - start
+    sock.close()
+    return count / elapsed, (sent + received) / count
+
+
+def bench_binary(port, count, depth):
+    rng = random.Random(2)
+    sock = socket.create_connection(("127.0.0.1", port))
+    sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    client = protocol.BinaryClient(sock)
+    request_size = {protocol.SET_JOINTS: protocol.HEADER.size + protocol.PAYLOADS[protocol.SET_JOINTS].size,
+                    protocol.STATE_QUERY: protocol.HEADER.size}
+    sent = received = done = 0
+    start = time.perf_counter()
+    for i in range(count):
+        if i % 4 == 3:
+            client.query_state()
+            sent += request_size[protocol.STATE_QUERY]
+        else:
+            client.set_joints([rng.uniform(0, 180) for _ in range(6)])
+            sent += request_size[protocol.SET_JOINTS]
+        if i + 1 - done >= depth:
+            kind, payload = client.reader.read_frame()
+            received += protocol.HEADER.size + len(payload)
+            done += 1
+    while done < count:
+        kind, payload = client.reader.read_frame()
+        received += protocol.HEADER.size + len(payload)
+        done += 1
+    elapsed = time.perf_counter() - start
+    sock.close()
+    return count / elapsed, (sent + received) / count
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Текстовый и бинарный протоколы")
+    parser.add_argument("--messages", type=int, default=20000)
+    parser.add_argument("--depth", type=int, default=32, help="глубина конвейера")
+    options = parser.parse_args()
+
+    text_rate, binary_rate = bench_codec(options.messages)
+    print("Кодирование + разбор JOINTS без сети, сообщений/с:")
+    print(f"  текст    {text_rate:>12,.0f}")
+    print(f"  бинарный {binary_rate:>12,.0f}  (x{binary_rate / text_rate:.1f})")
+
+    server, loop = start_server()
+    print(f"\nОбмен через сокет, {options.messages} сообщений, конвейер {options.depth}:")
+    print(f"{'протокол':>10}{'сообщений/с':>14}{'байт/сообщение':>16}")
+    for name, bench, port in (("текст", bench_text, server.port),
+                              ("бинарный", bench_binary, server.binary_port)):
+        rate, size = bench(port, options.messages, options.depth)
+        print(f"{name:>10}{rate:>14,.0f}{size:>16.1f}")
+    print(f"Применено команд: {server.commands_applied}")
+    asyncio.run_coroutine_threadsafe(server.close(), loop).result()
+    loop.call_soon_threadsafe(loop.stop)
+
+
+if __name__ == "__main__":
+    main()
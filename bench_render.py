@@ -0,0 +1,99 @@
+"""Сравнение старой (delete("all") + create_*) и новой отрисовки манипулятора.
+
+Запуск: python bench_render.py [кадров]
+Нужен дисплей (на сервере - через xvfb-run).
+"""
+import math
+import sys
+import time
+import tkinter as tk
+
+from renderer import RobotRenderer
+
+
+def pose_points(x0, y0, joint_angles, gripper_state):
+    base_radius, lengths = 50, [80, 120, 80, 40]
+    angles = [math.radians(a) for a in joint_angles]
+    points = [(x0, y0)]
+    for i in range(4):
+        x = points[-1][0] + (base_radius if i == 0 else lengths[i - 1]) * math.cos(sum(angles[:i + 1]))
+        y = points[-1][1] - (base_radius if i == 0 else lengths[i - 1]) * math.sin(sum(angles[:i + 1]))
+        points.append((x, y))
+    gripper_width = 30 if gripper_state else 60
+    angle = sum(angles)
+    fingers = [(points[-1][0] + gripper_width * math.cos(angle + side),
+                points[-1][1] - gripper_width * math.sin(angle + side)) for side in (math.pi / 2, -math.pi / 2)]
+    return points, fingers
+
+
+def legacy_draw(canvas, joint_angles, gripper_state, system_state):
+    """Прежний draw_robot: всё стирается и создаётся заново"""
+    canvas.delete("all")
+    w, h = canvas.winfo_width(), canvas.winfo_height()
+    x0, y0 = w // 2, h - 50
+    canvas.create_oval(x0 - 50, y0 - 20, x0 + 50, y0 + 20, fill="gray", outline="black")
+    points, fingers = pose_points(x0, y0, joint_angles, gripper_state)
+    for i in range(4):
+        (xa, ya), (xb, yb) = points[i], points[i + 1]
+        canvas.create_line(xa, ya, xb, yb, width=10 - 2 * i, fill=["blue", "green"][i % 2])
+        canvas.create_oval(xb - 5, yb - 5, xb + 5, yb + 5, fill="red")
+    for x, y in fingers:
+        canvas.create_line(points[-1][0], points[-1][1], x, y, width=3, fill="red")
+    canvas.create_text(w // 2, 20, text=f"Координаты: X={int(points[-1][0])}, Y={int(points[-1][1])}",
+                       font=('Arial', 10))
+    colors = {"off": "gray", "ready": "yellow", "running": "green", "paused": "orange", "emergency": "red"}
+    canvas.create_rectangle(10, 10, 20, 20, fill=colors.get(system_state, "white"))
+
+
+def retained_draw(renderer, joint_angles, gripper_state, system_state):
+    x0, y0 = renderer.origin()
+    points, fingers = pose_points(x0, y0, joint_angles, gripper_state)
+    renderer.draw(points, fingers, system_state)
+
+
+def next_item_id(canvas):
+    # Идентификаторы элементов холста выдаются последовательно
+    item = canvas.create_line(0, 0, 0, 0)
+    canvas.delete(item)
+    return item
+
+
+def run(canvas, draw, frames):
+    times = []
+    first = next_item_id(canvas)
+    for n in range(frames):
+        angles = [(n * (i + 1)) % 181 for i in range(6)]
+        start = time.perf_counter()
+        draw(angles, n % 50 < 25, "ready")
+        canvas.update_idletasks()
+        times.append(time.perf_counter() - start)
+    allocated = next_item_id(canvas) - first - 1
+    times.sort()
+    return allocated, sum(times) / frames, times[int(frames * 0.95)]
+
+
+def main():
+    frames = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    try:
+        root = tk.Tk()
+    except tk.TclError as e:
+        sys.exit(f"Нет дисплея: {e}")
+    root.geometry("500x500")
+    canvas = tk.Canvas(root, bg='white', width=400, height=400)
+    canvas.pack(fill=tk.BOTH, expand=True)
+    root.update()
+
+    results = {"старый (delete all)": run(canvas, lambda a, g, s: legacy_draw(canvas, a, g, s), frames)}
+    canvas.delete("all")
+    renderer = RobotRenderer(canvas)
+    results["новый (retained)"] = run(canvas, lambda a, g, s: retained_draw(renderer, a, g, s), frames)
+    root.destroy()
+
+    print(f"Кадров: {frames}")
+    print(f"{'рендерер':<22}{'элементов':>12}{'на кадр':>10}{'кадр, мс':>10}{'p95, мс':>10}")
+    for name, (allocated, mean, p95) in results.items():
+        print(f"{name:<22}{allocated:>12}{allocated / frames:>10.1f}{mean * 1000:>10.3f}{p95 * 1000:>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""Потоковая статистика: пропускная способность RollingStats против пересчёта по истории.
+
+Телеметрия 6 моторов с общей частотой --rate отсчётов в секунду (по
+умолчанию 100 000, т.е. ~16 700 кадров/с) за --seconds секунд; окна
+--windows секунд. Для каждого отсчёта обновляются минимум, максимум,
+среднее и дисперсия окон, среднее Уэлфорда и EWMA. Пересчёт - прежний
+подход: список отсчётов окна и min()/max()/sum() на каждом кадре;
+он меряется на последних --naive-frames кадрах, когда окно уже заполнено.
+Значения обоих способов сверяются.
+
+Запуск: python bench_rolling_stats.py [--rate 100000] [--seconds 10] [--windows 1 5]
+"""
+import argparse
+import collections
+import math
+import random
+import time
+
+from rolling_stats import RollingStats
+
+MOTORS = 6
+
+
+def telemetry(frames, rate, seed=0):
+    """Кадры (время, температуры): медленный дрейф и шум датчика"""
+    rng = random.Random(seed)
+    temps = [35.0] * MOTORS
+    for n in range(frames):
+        t = n * MOTORS / rate
+        for i in range(MOTORS):
+            temps[i] += rng.gauss(0, 0.02) + 0.001 * math.sin(t / 3 + i)
+        yield t, list(temps)
+
+
+class NaiveWindow:
+    """Прежний подход: хранить отсчёты окна и пересчитывать на каждом кадре"""
+
+    def __init__(self, span):
+        self.span = span
+        self.samples = collections.deque()
+
+    def add(self, ts, value):
+        self.samples.append((ts, value))
+        while self.samples[0][0] <= ts - self.span:
+            self.samples.popleft()
+        values = [v for _, v in self.samples]
+        return min(values), max(values), sum(values) / len(values)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Пропускная способность потоковой статистики")
+    parser.add_argument("--rate", type=int, default=100_000, help="отсчётов в секунду на все моторы")
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--windows", type=float, nargs="+", default=[1.0, 5.0])
+    parser.add_argument("--naive-frames", type=int, default=300)
+    options = parser.parse_args()
+
+    frames = int(options.rate * options.seconds / MOTORS)
+    data = list(telemetry(frames, options.rate))
+    samples = frames * MOTORS
+    print(f"Отсчётов: {samples:,} ({MOTORS} моторов, {options.rate:,}/с, {options.seconds:g} с), "
+          f"окна {', '.join(f'{w:g}' for w in options.windows)} с")
+
+    stats = RollingStats(MOTORS, windows=options.windows)
+    start = time.perf_counter()
+    for ts, temps in data:
+        stats.add(ts, temps)
+    elapsed = time.perf_counter() - start
+    throughput = samples / elapsed
+
+    start = time.perf_counter()
+    for _ in range(1000):
+        stats.snapshot()
+    snapshot_us = (time.perf_counter() - start) * 1000
+
+    # Пересчёт: окно заполняется без замера, меряются последние кадры
+    span = max(options.windows)
+    naive = [NaiveWindow(span) for _ in range(MOTORS)]
+    tail = data[-options.naive_frames:]
+    for ts, temps in data[:-options.naive_frames]:
+        for window, value in zip(naive, temps):
+            window.samples.append((ts, value))
+    start = time.perf_counter()
+    results = [[window.add(ts, value) for window, value in zip(naive, temps)] for ts, temps in tail]
+    naive_us = (time.perf_counter() - start) / (len(tail) * MOTORS) * 1e6
+
+    mismatch = 0
+    for motor, summary in enumerate(stats.snapshot()):
+        lo, hi, mean = results[-1][motor]
+        window = summary[span]
+        mismatch += (lo != window["min"]) + (hi != window["max"]) + (abs(mean - window["mean"]) > 1e-9)
+
+    per_sample = elapsed / samples * 1e6
+    print(f"{'способ':>22}{'мкс/отсчёт':>12}{'отсчётов/с':>14}{'CPU при ' + format(options.rate, ',') + '/с':>20}")
+    print(f"{'RollingStats':>22}{per_sample:>12.2f}{throughput:>14,.0f}{options.rate / throughput:>20.1%}")
+    print(f"{'пересчёт окна':>22}{naive_us:>12.0f}{1e6 / naive_us:>14,.0f}{options.rate * naive_us / 1e6:>20.0%}")
+    print(f"Снимок всех моторов для Treeview: {snapshot_us:.1f} мкс; расхождений с пересчётом: {mismatch}")
+    print(f"Запас к {options.rate:,} отсчётов/с: {throughput / options.rate:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
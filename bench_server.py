@@ -0,0 +1,81 @@
+"""Нагрузочный клиент для control_server.py.
+
+Для 1-500 одновременных клиентов меряет запросы в секунду и задержку p50/p99.
+По умолчанию поднимает сервер в этом же процессе; --port подключает к уже
+запущенному.
+
+Запуск: python bench_server.py [--clients 1 10 100 500] [--requests 200] [--depth 1]
+"""
+import argparse
+import asyncio
+import random
+import time
+
+from control_server import ControlServer
+
+REQUESTS = [b"GET\n", b"POSE\n", b"STATUS\n"]
+
+
+async def client(host, port, count, depth, latencies, seed):
+    rng = random.Random(seed)
+    reader, writer = await asyncio.open_connection(host, port)
+    sent = []
+    done = 0
+    issued = 0
+    while done < count:
+        # Конвейер: держим до depth запросов в полёте
+        while issued < count and issued - done < depth:
+            if rng.random() < 0.2:
+                line = f"SET {rng.randint(1, 6)} {rng.randint(0, 180)}\n".encode()
+            else:
+                line = rng.choice(REQUESTS)
+            writer.write(line)
+            sent.append(time.perf_counter())
+            issued += 1
+        await writer.drain()
+        response = await reader.readline()
+        if not response or response.startswith(b"ERR busy"):
+            raise ConnectionError("сервер отклонил соединение")
+        latencies.append(time.perf_counter() - sent[done])
+        done += 1
+    writer.close()
+    await writer.wait_closed()
+
+
+async def run(host, port, clients, count, depth):
+    latencies = []
+    start = time.perf_counter()
+    await asyncio.gather(*(client(host, port, count, depth, latencies, i) for i in range(clients)))
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    return (len(latencies) / elapsed, latencies[len(latencies) // 2],
+            latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))])
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Нагрузка на сервер управления")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=None, help="порт уже запущенного сервера")
+    parser.add_argument("--clients", type=int, nargs="+", default=[1, 10, 50, 100, 500])
+    parser.add_argument("--requests", type=int, default=200, help="запросов на клиента")
+    parser.add_argument("--depth", type=int, default=1, help="глубина конвейера")
+    options = parser.parse_args()
+
+    server = None
+    port = options.port
+    if port is None:
+        server = await ControlServer(host=options.host, port=0, max_connections=max(options.clients)).start()
+        port = server.port
+
+    print(f"{'клиентов':>9}{'запросов/с':>14}{'p50, мс':>10}{'p99, мс':>10}")
+    for clients in options.clients:
+        rate, p50, p99 = await run(options.host, port, clients, options.requests, options.depth)
+        print(f"{clients:>9}{rate:>14,.0f}{p50 * 1000:>10.2f}{p99 * 1000:>10.2f}")
+
+    if server is not None:
+        print(f"Применено команд: {server.commands_applied}")
+        await server.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,432 @@
+"""Набор бенчмарков горячих путей интерфейса и ввода-вывода.
+
+Для каждого пути: операций в секунду, задержка p50/p95/p99 и память на
+операцию по tracemalloc (прирост и пик). Результаты сохраняются в JSON;
+с --baseline сравниваются с сохранённым прогоном, и код возврата 1, если
+какой-то путь стал медленнее порога. Пути через Tk пропускаются, если
+нет дисплея (под Xvfb они выполняются).
+
+Опорный прогон bench_baseline.json лежит в репозитории. Цифры зависят от
+машины, поэтому сравнивать имеет смысл только с прогоном на той же машине:
+после изменения, которое осознанно меняет скорость, или на новой машине
+опорный файл снимается заново и коммитится вместе с изменением:
+    xvfb-run python bench_suite.py --output bench_baseline.json
+Без дисплея в него попадут только пути без Tk, остальные отмечены skipped и
+при сравнении не учитываются.
+
+Запуск:
+    python bench_suite.py [--iterations 2000] [--output bench_results.json]
+    python bench_suite.py --baseline bench_baseline.json [--threshold 0.25]
+    python bench_suite.py --cases logging save_position
+"""
+import argparse
+import contextlib
+import json
+import logging
+import os
+import platform
+import random
+import socket
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from array import array
+
+CASES = []
+FLUSH_EVERY = 50  # сохранений позиции между сбросами на диск (в окне - таймер POSITIONS_FLUSH_MS)
+
+
+def case(name, tk=False):
+    """Регистрация пути: фабрика получает контекст и возвращает (операция, завершение)"""
+    def register(factory):
+        CASES.append((name, tk, factory))
+        return factory
+    return register
+
+
+class Context:
+    """Общие ресурсы прогона: временный каталог и окно Tk"""
+
+    def __init__(self, directory):
+        self.directory = directory
+        self._root = None
+        self._app = None
+
+    def app(self):
+        if self._app is None:
+            import tkinter as tk
+            import gui
+            gui.RobotARM_IMR165_GUI.TELEMETRY_PORT = 0
+            # Журналы и позиции окна пишутся во временный каталог
+            self._cwd = os.getcwd()
+            os.chdir(self.directory)
+            self._root = tk.Tk()
+            self._app = gui.RobotARM_IMR165_GUI(self._root)
+            # Консоль окна пишет в /dev/null: стоимость записи остаётся, таблица не засоряется
+            self._devnull = open(os.devnull, 'w')
+            for sink in self._app.log_dispatcher.sinks:
+                if type(getattr(sink, "handler", None)) is logging.StreamHandler:
+                    sink.handler.setStream(self._devnull)
+            self._app.power_on()
+            self._root.update()
+        return self._app
+
+    def close(self):
+        if self._app is not None:
+            # Поздние записи (загрузка индекса рабочей зоны) не должны писать в удалённый каталог
+            self._app.logger.removeHandler(self._app.log_dispatcher)
+            self._app.on_close()
+            self._devnull.close()
+            os.chdir(self._cwd)
+
+
+def has_display():
+    if sys.platform.startswith("win") or sys.platform == "darwin":
+        return True
+    return bool(os.environ.get("DISPLAY"))
+
+
+# --- Пути через Tk ---
+
+@case("draw_robot", tk=True)
+def draw_robot(context):
+    """Только перерисовка: поза задана заранее через RobotCore, кинематика не пересчитывается"""
+    app = context.app()
+    app.core.set_joints([90, 45, 30, 20, 0, 0])
+    app.render_scheduler.flush()
+
+    def op(k):
+        app.draw_robot()
+        app.master.update_idletasks()
+    return op, None
+
+
+@case("update_joint_angle", tk=True)
+def update_joint_angle(context):
+    app = context.app()
+
+    def op(k):
+        app.update_joint_angle(k % 180, k % 6)
+        app.render_scheduler.flush()
+        app.master.update_idletasks()
+    return op, None
+
+
+@case("update_motor_monitor", tk=True)
+def update_motor_monitor(context):
+    app = context.app()
+    rng = random.Random(1)
+
+    def op(k):
+        with app.telemetry.writing() as frame:
+            for axis in app.motors.axes:
+                frame.temp[axis] = rng.uniform(25.0, 45.0)
+        app.update_motor_monitor()
+        app.master.update_idletasks()
+    return op, None
+
+
+@case("gui_save_position", tk=True)
+def gui_save_position(context):
+    """Кнопка «Сохранить позицию»: запись, журнал и сброс на диск каждые FLUSH_EVERY нажатий"""
+    app = context.app()
+
+    def op(k):
+        app.save_position()
+        if k % FLUSH_EVERY == FLUSH_EVERY - 1:
+            app.flush_positions()
+        app.master.update_idletasks()
+    return op, None
+
+
+# --- Пути без дисплея ---
+
+@case("core_set_joint")
+def core_set_joint(context):
+    from robot_core import RobotCore
+    core = RobotCore(logger=logging.getLogger("bench_suite.core"))
+    core.power_on()
+
+    def op(k):
+        core.set_joint(k % 6, k % 180)
+        core.points
+    return op, None
+
+
+def _instrumented_core(enabled):
+    from instrumentation import Instrumentation
+    from robot_core import RobotCore
+    core = RobotCore(logger=logging.getLogger("bench_suite.core"))
+    core.power_on()
+    instrumentation = Instrumentation(enabled=enabled)
+    instrumentation.install(core, ["set_joint"])
+
+    def op(k):
+        core.set_joint(k % 6, k % 180)
+        core.points
+    return op, instrumentation.uninstall
+
+
+@case("instrumented_off")
+def instrumented_off(context):
+    """core_set_joint через обёртку с выключенной записью"""
+    return _instrumented_core(False)
+
+
+@case("instrumented_on")
+def instrumented_on(context):
+    return _instrumented_core(True)
+
+
+@case("motor_monitor_diff")
+def motor_monitor_diff(context):
+    from bench_motor_monitor import COLUMNS, CountingTree
+    from telemetry import TelemetryStore
+    from tree_diff import TreeviewDiff
+    store = TelemetryStore()
+    axes = store.allocate(6)
+    diff = TreeviewDiff(CountingTree(), COLUMNS)
+    items = [f"I00{i + 1}" for i in range(6)]
+    rng = random.Random(1)
+
+    def op(k):
+        with store.writing() as frame:
+            for axis in axes:
+                frame.temp[axis] = rng.uniform(25.0, 45.0)
+                frame.position_deg[axis] = k % 180
+        data = store.snapshot()
+        diff.update((item, (f'Мотор {i + 1}', f'{data.temp[axis]:.1f}', f'{data.position_ticks[axis]:.0f}',
+                            f'{data.position_rad[axis]:.2f}', f'{data.position_deg[axis]:.0f}'))
+                    for i, (item, axis) in enumerate(zip(items, axes)))
+    return op, None
+
+
+class AfterThread:
+    """Замена master для TkSink без дисплея: after() выполняется таймером в отдельном потоке,
+    как опрос очереди в потоке Tk"""
+
+    def __init__(self):
+        self.closed = False
+
+    def after(self, ms, func, *args):
+        if not self.closed:
+            timer = threading.Timer(ms / 1000, func, args)
+            timer.daemon = True
+            timer.start()
+
+
+@case("logging")
+def logging_path(context):
+    """Приёмники как в окне: три обработчика файлов и консоли и TkSink журнала"""
+    from async_logging import AsyncLogDispatcher, HandlerSink, TkSink
+    from bench_logging import make_handlers
+    devnull = open(os.devnull, 'w')
+    dispatcher = AsyncLogDispatcher()
+    for handler in make_handlers(context.directory, devnull):
+        dispatcher.add_sink(HandlerSink(handler))
+    # Виджет журнала заменён пустым приёмником: форматирование строк остаётся
+    master = AfterThread()
+    dispatcher.add_sink(TkSink(master, lambda lines: None,
+                               formatter=logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')))
+    logger = logging.getLogger("bench_suite.logging")
+    logger.propagate = False
+    logger.setLevel(logging.INFO)
+    logger.addHandler(dispatcher)
+
+    def op(k):
+        logger.info(f"Сустав {k % 6 + 1} установлен на {k % 180}°")
+
+    def cleanup():
+        logger.removeHandler(dispatcher)
+        dispatcher.close()
+        master.closed = True
+        devnull.close()
+    return op, cleanup
+
+
+@case("save_position")
+def save_position(context):
+    from position_store import PositionStore
+    store = PositionStore(os.path.join(context.directory, "positions.bin"))
+    joints = [0, 45, 90, 30, 0, 0]
+
+    def op(k):
+        joints[1] = k % 180
+        store.append(joints, k & 1, f"P{k}")
+        if k % FLUSH_EVERY == FLUSH_EVERY - 1:
+            store.flush()
+    return op, store.close
+
+
+def _serve_main3(listener):
+    """Сервер в духе main3.py: на каждое соединение один ответ"""
+    content = 'Well done, buddy...'.encode('utf-8')
+    while True:
+        try:
+            client_socket, _ = listener.accept()
+        except OSError:
+            return
+        with client_socket:
+            client_socket.recv(1024)
+            client_socket.send(content)
+
+
+@case("socket_main3")
+def socket_main3(context):
+    listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    listener.bind(('127.0.0.1', 0))
+    listener.listen(64)
+    address = listener.getsockname()
+    threading.Thread(target=_serve_main3, args=(listener,), daemon=True).start()
+
+    def op(k):
+        with socket.create_connection(address) as sock:
+            sock.sendall(b"PING")
+            sock.recv(1024)
+    return op, listener.close
+
+
+@case("socket_control_server")
+def socket_control_server(context):
+    import asyncio
+    from control_server import ControlServer
+    ready = threading.Event()
+    holder = {}
+
+    def run():
+        loop = asyncio.new_event_loop()
+        holder["loop"] = loop
+        holder["server"] = loop.run_until_complete(ControlServer(port=0).start())
+        ready.set()
+        loop.run_forever()
+
+    threading.Thread(target=run, daemon=True).start()
+    ready.wait()
+    sock = socket.create_connection(("127.0.0.1", holder["server"].port))
+    sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    replies = sock.makefile('rb')
+
+    def op(k):
+        sock.sendall(b"SET 2 %d\n" % (k % 180))
+        replies.readline()
+
+    def cleanup():
+        replies.close()
+        sock.close()
+        loop = holder["loop"]
+        asyncio.run_coroutine_threadsafe(holder["server"].close(), loop).result()
+        loop.call_soon_threadsafe(loop.stop)
+    return op, cleanup
+
+
+# --- Измерение ---
+
+def percentile(values, q):
+    return values[min(len(values) - 1, int(len(values) * q))]
+
+
+def measure(op, iterations, warmup):
+    for k in range(warmup):
+        op(k)
+    timings = array('d', bytes(8 * iterations))
+    clock = time.perf_counter
+    start = clock()
+    for k in range(iterations):
+        t = clock()
+        op(k)
+        timings[k] = clock() - t
+    elapsed = clock() - start
+    timings = sorted(timings)
+
+    # Память - отдельным проходом: tracemalloc замедляет операции
+    count = max(1, iterations // 10)
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    before, _ = tracemalloc.get_traced_memory()
+    for k in range(count):
+        op(warmup + k)
+    after, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        "iterations": iterations,
+        "ops_per_s": iterations / elapsed,
+        "p50_us": percentile(timings, 0.50) * 1e6,
+        "p95_us": percentile(timings, 0.95) * 1e6,
+        "p99_us": percentile(timings, 0.99) * 1e6,
+        "max_us": timings[-1] * 1e6,
+        "bytes_per_op": (after - before) / count,
+        "peak_kb": (peak - before) / 1024,
+    }
+
+
+def compare(results, baseline, threshold):
+    """Пути, у которых p50 вырос или пропускная способность упала больше чем на threshold"""
+    regressions = []
+    for name, current in results.items():
+        previous = baseline.get(name)
+        if not previous or "skipped" in current or "skipped" in previous:
+            continue
+        slower = current["p50_us"] / previous["p50_us"] - 1 if previous["p50_us"] else 0.0
+        fewer = 1 - current["ops_per_s"] / previous["ops_per_s"] if previous["ops_per_s"] else 0.0
+        if slower > threshold or fewer > threshold:
+            regressions.append((name, slower, fewer))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Бенчмарки горячих путей")
+    parser.add_argument("--iterations", type=int, default=2000)
+    parser.add_argument("--warmup", type=int, default=100)
+    parser.add_argument("--cases", nargs="+", help="только эти пути")
+    parser.add_argument("--output", default="bench_results.json")
+    parser.add_argument("--baseline", help="JSON прошлого прогона для сравнения")
+    parser.add_argument("--threshold", type=float, default=0.25, help="допустимое ухудшение, доля")
+    options = parser.parse_args()
+
+    display = has_display()
+    results = {}
+    print(f"{'путь':>22}{'оп/с':>12}{'p50, мкс':>10}{'p95, мкс':>10}{'p99, мкс':>10}{'байт/оп':>10}{'пик, КБ':>9}")
+    with tempfile.TemporaryDirectory() as directory:
+        context = Context(directory)
+        try:
+            for name, tk, factory in CASES:
+                if options.cases and name not in options.cases:
+                    continue
+                if tk and not display:
+                    results[name] = {"skipped": "нет дисплея"}
+                    print(f"{name:>22}  пропущен: нет дисплея")
+                    continue
+                op, cleanup = factory(context)
+                try:
+                    result = measure(op, options.iterations, options.warmup)
+                finally:
+                    if cleanup is not None:
+                        cleanup()
+                results[name] = result
+                print(f"{name:>22}{result['ops_per_s']:>12,.0f}{result['p50_us']:>10.1f}{result['p95_us']:>10.1f}"
+                      f"{result['p99_us']:>10.1f}{result['bytes_per_op']:>10.0f}{result['peak_kb']:>9.1f}")
+        finally:
+            with contextlib.suppress(Exception):
+                context.close()
+
+    report = {"python": platform.python_version(), "platform": platform.platform(),
+              "time": time.strftime("%Y-%m-%d %H:%M:%S"), "results": results}
+    with open(options.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"Результаты: {options.output}")
+
+    if options.baseline:
+        with open(options.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)["results"]
+        regressions = compare(results, baseline, options.threshold)
+        for name, slower, fewer in regressions:
+            print(f"РЕГРЕССИЯ {name}: p50 {slower:+.0%}, пропускная способность {-fewer:+.0%}")
+        if regressions:
+            sys.exit(1)
+        print(f"Регрессий нет (порог {options.threshold:.0%})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""Нагрузка на рассылку телеметрии: 100 подписчиков, один из них не читает.
+
+Производитель публикует снимки с частотой --rate в отдельном потоке, как
+поток MotorMonitor. Для каждой политики переполнения печатаются задержка вызова
+publish() (она не должна зависеть от зависшего подписчика), доставка
+нормальным подписчикам и что стало с зависшим.
+
+Запуск: python bench_telemetry_hub.py [--subscribers 100] [--rate 1000] [--seconds 3]
+"""
+import argparse
+import asyncio
+import random
+import socket
+import time
+
+import protocol
+from telemetry_hub import POLICIES, TelemetryHub
+
+FRAME_SIZE = protocol.HEADER.size + protocol.PAYLOADS[protocol.TELEMETRY].size
+
+
+def produce(hub, rate, seconds, latencies):
+    rng = random.Random(1)
+    period = 1.0 / rate
+    start = time.perf_counter()
+    count = int(rate * seconds)
+    for k in range(count):
+        temps = [rng.uniform(25.0, 45.0) for _ in range(6)]
+        angles = [rng.uniform(0, 180) for _ in range(6)]
+        t0 = time.perf_counter()
+        hub.publish(time.time(), temps, angles)
+        latencies.append(time.perf_counter() - t0)
+        delay = start + (k + 1) * period - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+
+
+async def reader_client(port, policy, received, index, stop):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(f"SUBSCRIBE {policy}\n".encode())
+    await writer.drain()
+    while not stop.is_set():
+        data = await reader.read(65536)
+        if not data:
+            break
+        received[index] += len(data)
+    writer.close()
+
+
+def stalled_client(port, policy):
+    """Подписчик, который ничего не читает"""
+    sock = socket.socket()
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 4096)
+    sock.connect(("127.0.0.1", port))
+    sock.sendall(f"SUBSCRIBE {policy} 32\n".encode())
+    return sock
+
+
+async def run(policy, subscribers, rate, seconds):
+    # Маленький буфер ядра, чтобы зависший подписчик быстро упёрся в очередь хаба
+    hub = TelemetryHub(port=0, send_buffer=16384).start()
+    stalled = stalled_client(hub.port, policy)
+    received = [0] * (subscribers - 1)
+    stop = asyncio.Event()
+    readers = [asyncio.create_task(reader_client(hub.port, policy, received, i, stop))
+               for i in range(subscribers - 1)]
+    while len(hub.subscribers) < subscribers:
+        await asyncio.sleep(0.01)
+
+    latencies = []
+    await asyncio.to_thread(produce, hub, rate, seconds, latencies)
+    await asyncio.sleep(0.5)  # дочитать хвост
+    stalled_state = next((s for s in list(hub.subscribers) if s.writer.get_extra_info('peername') and
+                          s.writer.get_extra_info('peername')[1] == stalled.getsockname()[1]), None)
+    stats = hub.stats()
+    stop.set()
+    hub.close()
+    stalled.close()
+    await asyncio.gather(*readers, return_exceptions=True)
+
+    latencies.sort()
+    delivered = sum(received) / FRAME_SIZE / len(received) / max(1, stats["published"])
+    if stalled_state is None:
+        fate = "отключён"
+    else:
+        fate = f"в очереди {len(stalled_state.queue)}, выброшено {stalled_state.dropped}"
+    return latencies, stats, delivered, fate
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Рассылка телеметрии с зависшим подписчиком")
+    parser.add_argument("--subscribers", type=int, default=100)
+    parser.add_argument("--rate", type=int, default=1000, help="снимков в секунду")
+    parser.add_argument("--seconds", type=float, default=3)
+    options = parser.parse_args()
+
+    print(f"{options.subscribers} подписчиков, {options.rate} снимков/с, {options.seconds:g} с")
+    print(f"{'политика':>12}{'publish p50, мкс':>18}{'p99, мкс':>10}{'max, мкс':>10}"
+          f"{'доставлено':>12}  зависший подписчик")
+    for policy in POLICIES:
+        latencies, stats, delivered, fate = asyncio.run(
+            run(policy, options.subscribers, options.rate, options.seconds))
+        p50 = latencies[len(latencies) // 2] * 1e6
+        p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1e6
+        print(f"{policy:>12}{p50:>18.1f}{p99:>10.1f}{latencies[-1] * 1e6:>10.1f}"
+              f"{delivered:>11.1%}  {fate}")
+
+
+if __name__ == "__main__":
+    main()
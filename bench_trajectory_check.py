@@ -0,0 +1,99 @@
+"""Проверка траекторий: отсчётов в секунду для 10 тыс. и 1 млн отсчётов.
+
+1. Полный проход по допустимой траектории (все проверки, нарушений нет).
+2. Нарушение в начале траектории: проверка останавливается на первой части.
+3. Trajectory из plan_trajectory через check_trajectory (без копирования).
+4. Для сравнения - поштучная проверка на чистом Python (только 10 тыс.).
+
+Запуск: python bench_trajectory_check.py [--sizes 10000 1000000] [--chunk 65536]
+"""
+import argparse
+import math
+import time
+
+import numpy as np
+
+import trajectory_check
+from kinematics import FLOOR_Y, forward_kinematics
+from trajectory import STYLE_LIMITS, Trajectory
+
+RATE = 50
+STYLE = "normal"
+CENTER = [90, 20, 20, 20, 90, 90]
+
+
+def smooth_trajectory(count, rng):
+    """Синусоиды вокруг безопасной позы; скорость в пределах стиля normal"""
+    t = np.arange(count)[:, None]
+    periods = rng.uniform(200, 2000, size=len(CENTER))
+    phases = rng.uniform(0, 2 * np.pi, size=len(CENTER))
+    return np.asarray(CENTER, dtype=np.float64) + 15 * np.sin(2 * np.pi * t / periods + phases)
+
+
+def python_check(samples, max_step):
+    """Поштучная проверка тем же набором правил без numpy"""
+    previous = None
+    for k, q in enumerate(samples):
+        if any(not 0 <= a <= 180 for a in q):
+            return k
+        if previous is not None and any(abs(a - b) > max_step for a, b in zip(q, previous)):
+            return k
+        points, _ = forward_kinematics(q)
+        if any(y < FLOOR_Y for _, y in points[1:]):
+            return k
+        # Те же проверки отрезков, что и в векторном проходе, на скалярах одной позы
+        xs, ys = [p[0] for p in points], [p[1] for p in points]
+        if any(trajectory_check._intersect(xs, ys, i, j) for i, j in trajectory_check.PAIRS):
+            return k
+        if any(trajectory_check._folded(xs, ys, i) for i, _ in trajectory_check.FOLDS):
+            return k
+        previous = q
+    return None
+
+
+def timed(func, repeat):
+    best = math.inf
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Скорость проверки траекторий")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 1000000])
+    parser.add_argument("--chunk", type=int, default=trajectory_check.CHUNK)
+    parser.add_argument("--repeat", type=int, default=3)
+    options = parser.parse_args()
+    rng = np.random.default_rng(1)
+    v_max = STYLE_LIMITS[STYLE][0]
+
+    print(f"Частота {RATE} Гц, стиль {STYLE}, часть {options.chunk} отсчётов")
+    print(f"{'отсчётов':>10}{'проход':>22}{'мс':>10}{'отсчётов/с':>14}  результат")
+    for size in options.sizes:
+        samples = smooth_trajectory(size, rng)
+        broken = samples.copy()
+        broken[10, 1] = 200
+
+        trajectory = Trajectory(RATE)
+        trajectory.samples.frombytes(samples.tobytes())
+        trajectory.gripper.frombytes(bytes(size))
+
+        cases = [
+            ("полный", lambda: trajectory_check.check(samples, RATE, v_max, chunk=options.chunk)),
+            ("нарушение в начале", lambda: trajectory_check.check(broken, RATE, v_max, chunk=options.chunk)),
+            ("check_trajectory", lambda: trajectory_check.check_trajectory(trajectory, STYLE)),
+        ]
+        if size <= 10000:
+            rows = samples.tolist()
+            cases.append(("Python по одному", lambda: python_check(rows, v_max / RATE)))
+        for name, func in cases:
+            elapsed, result = timed(func, options.repeat)
+            if isinstance(result, trajectory_check.Violation):
+                result = f"отсчёт {result.index}: {trajectory_check.describe(result)}"
+            print(f"{size:>10,}{name:>22}{elapsed * 1000:>10.2f}{size / elapsed:>14,.0f}  {result}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+"""Повтор телеметрии через сторожевой таймер: задержка срабатывания.
+
+Синтетическая запись: 6 моторов, --rate отсчётов в секунду на мотор, шум
+датчика около 35°C и --events событий, чередуются скачок выше предела и
+быстрый рост без превышения предела. Запись проигрывается в реальном
+времени отдельным потоком, как поток опроса; обработчик срабатывания
+блокирует движение RobotCore.trip, как в motor_monitor.py.
+
+Два прогона: без нагрузки и с занятым главным потоком (обработчики Tk
+держат GIL --load-ms из каждых --period-ms). Для каждого - число
+срабатываний, ложные и пропущенные, задержка от прихода отсчёта до
+блокировки движения (p50/p99/max) и задержка от начала события до
+блокировки по часам (с опозданием потока под нагрузкой). Запись идёт с
+частотой датчика; в приложении задержку ограничивает период опроса, поэтому
+для сравнения рассчитаны прежняя проверка (кадр раз в секунду и очередь Tk)
+и опрос MotorMonitor раз в POLL_INTERVAL.
+
+Запуск: python bench_watchdog.py [--events 100] [--rate 1000] [--load-ms 30] [--period-ms 100]
+"""
+import argparse
+import logging
+import math
+import random
+import threading
+import time
+
+from motor_monitor import MotorMonitor
+from robot_core import RobotCore
+from safety_watchdog import Watchdog, describe
+
+MOTORS = 6
+BASE, NOISE = 35.0, 0.05
+LIMIT = 60.0
+STEP_TEMP, HOLD = 65.0, 0.08  # скачок: температура и длительность, с
+RISE_RATE = 80.0  # быстрый рост, °C/с, длительность HOLD (+6.4°C, ниже предела)
+MAX_RISE, RISE_WINDOW = 30.0, 0.04
+POLL = MotorMonitor.POLL_INTERVAL  # опрос датчиков, с
+RISE_HYSTERESIS = 15.0  # шум датчика на коротком окне даёт до ~10°C/с
+
+
+def build_record(events, spacing, rate, rng):
+    """Плоский список температур (отсчёт за отсчётом по MOTORS) и события (начало, мотор, вид)"""
+    schedule = [((k + 0.5) * spacing + rng.uniform(0, spacing * 0.2), rng.randrange(MOTORS),
+                 "limit" if k % 2 == 0 else "rise") for k in range(events)]
+    count = int((events + 1) * spacing * rate)
+    temps = [BASE + rng.gauss(0, NOISE) for _ in range(count * MOTORS)]
+    for onset, motor, kind in schedule:
+        first = math.ceil(onset * rate)
+        for i in range(first, min(count, int((onset + HOLD) * rate) + 1)):
+            t = i / rate
+            temps[i * MOTORS + motor] = STEP_TEMP if kind == "limit" else BASE + RISE_RATE * (t - onset)
+    return temps, schedule, count
+
+
+def replay(temps, count, rate, load_ms, period_ms):
+    """Проигрывание в реальном времени; возвращает сторожевой таймер и пары (срабатывание, время блокировки)
+
+    Время блокировки - секунды от начала проигрывания по часам, а не по
+    меткам записи: в него входит и опоздание потока опроса под нагрузкой.
+    """
+    logger = logging.getLogger("bench_watchdog")
+    logger.addHandler(logging.NullHandler())
+    logger.propagate = False
+    core = RobotCore(logger=logger)
+    trips = []
+
+    def on_trip(trip):
+        core.trip(describe(trip))
+        trips.append((trip, time.perf_counter() - start))
+
+    watchdog = Watchdog(on_trip, motors=MOTORS, limit=LIMIT, max_rise=MAX_RISE, rise_window=RISE_WINDOW,
+                        rise_hysteresis=RISE_HYSTERESIS)
+
+    start = time.perf_counter()
+
+    def feeder():
+        clock = time.perf_counter_ns
+        for i in range(count):
+            delay = start + i / rate - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            arrived = clock()
+            ts = i / rate
+            base = i * MOTORS
+            for motor in range(MOTORS):
+                if watchdog.feed(motor, temps[base + motor], ts, arrived) is not None:
+                    # Следующее событие снова должно дойти до блокировки; вне замера задержки
+                    core.clear_trip()
+
+    thread = threading.Thread(target=feeder, name="replay")
+    thread.start()
+    # Главный поток изображает обработчики Tk, которые держат GIL
+    while thread.is_alive():
+        if load_ms:
+            end = time.perf_counter() + load_ms / 1000
+            while time.perf_counter() < end:
+                pass
+        time.sleep(max(0.001, (period_ms - load_ms) / 1000))
+    thread.join()
+    return watchdog, trips
+
+
+def match(schedule, trips, spacing):
+    """Задержки от начала события до блокировки по часам, с; число ложных и пропущенных срабатываний"""
+    delays, used = [], set()
+    for onset, motor, kind in schedule:
+        for k, (trip, blocked) in enumerate(trips):
+            if k not in used and trip.motor == motor and onset <= trip.timestamp < onset + spacing / 2:
+                used.add(k)
+                delays.append(blocked - onset)
+                break
+    return delays, len(trips) - len(used), len(schedule) - len(delays)
+
+
+def polled(schedule, interval, load_ms=0.0, period_ms=100.0):
+    """Расчёт для опроса раз в interval секунд: следующий опрос плюс ожидание очереди Tk (load_ms)"""
+    delays = []
+    for onset, _, _ in schedule:
+        poll = math.ceil(onset / interval) * interval
+        busy = poll * 1000 % period_ms
+        wait = max(0.0, load_ms - busy) / 1000
+        delays.append(poll - onset + wait)
+    return delays
+
+
+def quantile(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))] if values else 0.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Задержка срабатывания сторожевого таймера")
+    parser.add_argument("--events", type=int, default=100)
+    parser.add_argument("--spacing", type=float, default=0.2, help="интервал между событиями, с")
+    parser.add_argument("--rate", type=int, default=1000, help="отсчётов в секунду на мотор")
+    parser.add_argument("--load-ms", type=float, default=30)
+    parser.add_argument("--period-ms", type=float, default=100)
+    parser.add_argument("--seed", type=int, default=1)
+    options = parser.parse_args()
+
+    temps, schedule, count = build_record(options.events, options.spacing, options.rate,
+                                          random.Random(options.seed))
+    print(f"Запись: {count} отсчётов x {MOTORS} моторов, {count / options.rate:.1f} с, событий {len(schedule)}")
+    print(f"{'режим':>28}{'сраб.':>7}{'ложных':>8}{'пропущ.':>9}"
+          f"{'p50, мкс':>10}{'p99, мкс':>10}{'max, мкс':>10}{'обнаруж. p50/p99, мс':>22}")
+    for name, load_ms in (("без нагрузки", 0), (f"Tk {options.load_ms:g}/{options.period_ms:g} мс", options.load_ms)):
+        watchdog, trips = replay(temps, count, options.rate, load_ms, options.period_ms)
+        delays, false, missed = match(schedule, trips, options.spacing)
+        latency = watchdog.latency
+        print(f"{name:>28}{latency.count:>7}{false:>8}{missed:>9}"
+              f"{latency.percentile(0.5) / 1000:>10.1f}{latency.percentile(0.99) / 1000:>10.1f}"
+              f"{latency.max / 1000:>10.1f}"
+              f"{quantile(delays, 0.5) * 1000:>11.1f} / {quantile(delays, 0.99) * 1000:<8.1f}")
+    # Расчёт для опроса в приложении: прежний кадр раз в секунду через очередь Tk
+    # и опрос сторожевого таймера gui.py (только скачки выше предела, рост за окно не виден)
+    limits = [event for event in schedule if event[2] == "limit"]
+    for name, delays in (("прежний: 1 с + Tk", polled(schedule, 1.0, options.load_ms, options.period_ms)),
+                         (f"сейчас: опрос {POLL * 1000:g} мс", polled(limits, POLL))):
+        print(f"{name + ' (расчёт)':>28}{'':>44}"
+              f"{quantile(delays, 0.5) * 1000:>11.1f} / {quantile(delays, 0.99) * 1000:<8.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""Индекс рабочей зоны: построение, загрузка и скорость запросов.
+
+Сравнивает запросы к индексу с холодным решением обратной кинематики для
+тех же точек. Индекс пишется во временный каталог.
+
+Запуск: python bench_workspace.py [--step 6] [--cell 5] [--queries 20000]
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from inverse_kinematics import IKSolver
+from workspace_index import WorkspaceIndex
+
+CURRENT = [30, 60, 30, 20, 0, 0]
+
+
+def per_query_us(func, points):
+    start = time.perf_counter()
+    for x, y in points:
+        func(x, y)
+    return (time.perf_counter() - start) / len(points) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Индекс рабочей зоны")
+    parser.add_argument("--step", type=int, default=6, help="шаг перебора суставов, градусы")
+    parser.add_argument("--cell", type=float, default=5.0, help="размер ячейки сетки")
+    parser.add_argument("--queries", type=int, default=20000)
+    options = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        start = time.perf_counter()
+        index = WorkspaceIndex.load_or_build(directory, options.step, options.cell)
+        built = time.perf_counter() - start
+        path = next(os.path.join(directory, name) for name in os.listdir(directory))
+        size = os.path.getsize(path)
+        start = time.perf_counter()
+        WorkspaceIndex.load_or_build(directory, options.step, options.cell)
+        loaded = time.perf_counter() - start
+
+    print(f"Поз: {len(index):,}, ячеек: {index.width ** 2:,}, файл {size / 1e6:.1f} МБ")
+    print(f"Построение {built * 1000:.0f} мс, загрузка {loaded * 1000:.1f} мс")
+
+    rng = random.Random(1)
+    points = [(rng.uniform(-index.reach, index.reach), rng.uniform(-index.reach, index.reach))
+              for _ in range(options.queries)]
+    reachable = sum(index.reachable(x, y) for x, y in points)
+    print(f"\nСлучайные точки: достижимо {reachable / len(points):.0%}")
+    print(f"  reachable:                 {per_query_us(index.reachable, points):>8.2f} мкс")
+    print(f"  nearest:                   {per_query_us(index.nearest, points[:options.queries // 10]):>8.2f} мкс")
+    print(f"  nearest с текущей позой:   "
+          f"{per_query_us(lambda x, y: index.nearest(x, y, prefer=CURRENT), points[:options.queries // 10]):>8.2f} мкс")
+
+    inside = [p for p in points if index.reachable(*p)][:1000]
+    solver = IKSolver(cache_size=0)
+    converged = 0
+
+    def cold(x, y):
+        nonlocal converged
+        converged += solver.solve((x, y), CURRENT).converged
+
+    ik_us = per_query_us(cold, inside)
+    print(f"  IK из текущей позы:        {ik_us:>8.2f} мкс, сошлось {converged / len(inside):.0%}")
+    converged = 0
+
+    def seeded(x, y):
+        nonlocal converged
+        angles, _, _ = index.nearest(x, y, prefer=CURRENT)
+        converged += solver.solve((x, y), angles + CURRENT[4:]).converged
+
+    print(f"  индекс + IK:               {per_query_us(seeded, inside):>8.2f} мкс, сошлось {converged / len(inside):.0%}")
+
+
+if __name__ == "__main__":
+    main()
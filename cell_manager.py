@@ -0,0 +1,268 @@
+"""Ячейка из нескольких манипуляторов в одном процессе и одном окне Tk.
+
+CellManager держит N экземпляров RobotCore без собственных окон и потоков:
+- опрос моторов всех манипуляторов (MotorMonitor без своего потока) - задачи
+  одного TimerWheel со сдвигом фаз, чтобы опросы не собирались в один тик;
+  телеметрия пишется в общее TelemetryStore, каждому манипулятору выделены
+  свои оси;
+- манипуляторы рисуются плитками RobotRenderer на общих холстах, по
+  PER_PAGE плиток на вкладку; один RenderScheduler перерисовывает только
+  изменившиеся плитки видимой вкладки.
+
+Запуск: python cell_manager.py [--arms 12] [--columns 4] [--demo]
+"""
+import argparse
+import logging
+import math
+import tkinter as tk
+from tkinter import ttk
+
+from kinematics import SEGMENTS, to_canvas
+from motor_monitor import MotorMonitor
+from render_scheduler import RenderScheduler
+from renderer import RobotRenderer
+from robot_core import RobotCore
+from telemetry import TelemetryStore
+from timer_wheel import TimerWheel
+
+REACH = sum(SEGMENTS)
+
+
+def demo_pose(t, k):
+    """Поза k-го манипулятора в момент t демонстрационного движения"""
+    return [90 + 30 * math.sin(t + k), 30 + 20 * math.sin(0.7 * t + k), 30 + 20 * math.cos(0.9 * t + k), 20, 0, 0]
+
+
+class CellArm:
+    """Манипулятор ячейки: ядро, опрос моторов с осями в общем хранилище и плитка на холсте"""
+
+    def __init__(self, name, core, monitor, page):
+        self.name = name
+        self.core = core
+        self.monitor = monitor
+        self.page = page
+        self.renderer = None
+        self.border = None
+        self.caption = None
+        self.timer = None
+        self.max_temp = 0.0
+        self.dirty = True
+        self._caption = None
+
+
+class CellPage:
+    """Вкладка с общим холстом для нескольких плиток"""
+
+    def __init__(self, frame, canvas):
+        self.frame = frame
+        self.canvas = canvas
+        self.arms = []
+
+
+class CellManager:
+    SAMPLE_MS = 1000
+    PER_PAGE = 12
+    COLUMNS = 4
+    OVERHEAT = 60
+    FPS = 30
+
+    def __init__(self, master, arms=4, columns=None, telemetry=None, logger=None, wheel=None):
+        self.master = master
+        self.columns = columns or self.COLUMNS
+        self.logger = logger or logging.getLogger('robot_logger')
+        self.telemetry = telemetry or TelemetryStore(axes=0)
+        self.wheel = wheel or TimerWheel(master)
+        self.render_scheduler = RenderScheduler(master, self.render, fps=self.FPS)
+        self.arms = []
+        self.pages = []
+        self.current = None  # видимая вкладка
+        self._demo = None
+        self.create_widgets()
+        for _ in range(arms):
+            self.add_arm()
+        self.wheel.start()
+
+    def create_widgets(self):
+        toolbar = ttk.Frame(self.master)
+        toolbar.pack(fill=tk.X, padx=10, pady=5)
+        for text, cmd in [("Включить все", self.power_on_all), ("Выключить все", self.power_off_all),
+                          ("Аварийная остановка", self.emergency_stop_all)]:
+            ttk.Button(toolbar, text=text, command=cmd).pack(side=tk.LEFT, padx=2)
+        self.status_label = ttk.Label(toolbar, text="")
+        self.status_label.pack(side=tk.RIGHT, padx=5)
+
+        self.notebook = ttk.Notebook(self.master)
+        self.notebook.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
+        self.notebook.bind("<<NotebookTabChanged>>",
+                           lambda e: self.show_page(self.pages[self.notebook.index('current')]))
+
+    # --- Состав ячейки ---
+
+    def _add_page(self):
+        frame = ttk.Frame(self.notebook)
+        canvas = tk.Canvas(frame, bg='white', width=800, height=500)
+        canvas.pack(fill=tk.BOTH, expand=True)
+        page = CellPage(frame, canvas)
+        canvas.bind("<Configure>", lambda e: self.layout(page))
+        self.pages.append(page)
+        self.notebook.add(frame, text="")
+        if self.current is None:
+            self.current = page
+        return page
+
+    def add_arm(self, name=None):
+        index = len(self.arms)
+        name = name or f"R{index + 1}"
+        if index % self.PER_PAGE == 0:
+            self._add_page()
+        page = self.pages[-1]
+        core = RobotCore(logger=self.logger.getChild(name))
+        # Колесо крутится в потоке Tk, поэтому авария объявляется сразу, без переноса
+        monitor = MotorMonitor(core, self.telemetry, limit=self.OVERHEAT)
+        arm = CellArm(name, core, monitor, page)
+        monitor.listeners.append(lambda ts, temps, angles: self.on_frame(arm, temps))
+
+        canvas, tag = page.canvas, f"arm_{name}"
+        arm.border = canvas.create_rectangle(0, 0, 0, 0, outline='lightgray', tags=(tag,))
+        arm.renderer = RobotRenderer(canvas, tag=tag, viewport=(0, 0, 1, 1))
+        arm.caption = canvas.create_text(0, 0, text=name, anchor=tk.NW, font=('Arial', 9), tags=(tag,))
+        core.subscribe(lambda event, *args: self.on_core_event(arm, event))
+        # Опросы соседних манипуляторов расходятся по разным тикам колеса
+        ticks = max(1, self.SAMPLE_MS // self.wheel.tick_ms)
+        arm.timer = self.wheel.every(self.SAMPLE_MS, lambda: self.sample(arm),
+                                     phase_ms=self.wheel.tick_ms * (1 + index % ticks))
+
+        self.arms.append(arm)
+        page.arms.append(arm)
+        first = index - index % self.PER_PAGE + 1
+        self.notebook.tab(page.frame, text=f"{first}-{index + 1}")
+        self.layout(page)
+        self.status_label.config(text=f"Манипуляторов: {len(self.arms)}")
+        return arm
+
+    def layout(self, page):
+        """Разбивка холста вкладки на плитки"""
+        canvas, arms = page.canvas, page.arms
+        if not arms:
+            return
+        width, height = canvas.winfo_width(), canvas.winfo_height()
+        columns = min(self.columns, len(arms))
+        rows = math.ceil(len(arms) / columns)
+        tile_w, tile_h = width / columns, height / rows
+        scale = min(1.0, tile_w / (2 * REACH + 20), (tile_h - 40) / (REACH + 70))
+        for k, arm in enumerate(arms):
+            x, y = int(k % columns * tile_w), int(k // columns * tile_h)
+            arm.renderer.viewport = (x, y, int(tile_w), int(tile_h))
+            arm.renderer.scale = max(scale, 0.05)
+            arm.renderer.resize()
+            canvas.coords(arm.border, x + 1, y + 1, x + int(tile_w) - 1, y + int(tile_h) - 1)
+            canvas.coords(arm.caption, x + 25, y + 6)
+            arm.dirty = True
+        self.render_scheduler.request()
+
+    def show_page(self, page):
+        self.current = page
+        for arm in page.arms:
+            arm.dirty = True
+        self.render_scheduler.request()
+
+    # --- Телеметрия и события ---
+
+    def sample(self, arm):
+        if arm.core.active:
+            arm.monitor.sample()
+
+    def on_frame(self, arm, temps):
+        arm.max_temp = max(temps)
+        self.update_caption(arm)
+
+    def on_core_event(self, arm, event):
+        arm.dirty = True
+        if event == "state":
+            self.update_caption(arm)
+        if arm.page is self.current:
+            self.render_scheduler.request()
+
+    def update_caption(self, arm):
+        text = f"{arm.name}  {arm.core.system_state}  {arm.max_temp:.0f}°C"
+        if text != arm._caption:
+            arm._caption = text
+            arm.page.canvas.itemconfig(arm.caption, text=text)
+
+    def render(self):
+        for arm in self.current.arms:
+            if arm.dirty:
+                arm.dirty = False
+                self.draw_arm(arm)
+
+    def draw_arm(self, arm):
+        renderer, core = arm.renderer, arm.core
+        x0, y0 = renderer.origin()
+        scale = renderer.scale
+        renderer.draw(to_canvas(core.points, x0, y0, scale), to_canvas(core.fingers(), x0, y0, scale),
+                      core.system_state)
+
+    # --- Команды ячейки ---
+
+    def power_on_all(self):
+        for arm in self.arms:
+            arm.core.power_on()
+
+    def power_off_all(self):
+        for arm in self.arms:
+            arm.core.power_off()
+
+    def emergency_stop_all(self, reason="Ручная активация"):
+        for arm in self.arms:
+            arm.core.emergency_stop(reason)
+
+    def start_demo(self, interval_ms=100):
+        """Плавное движение всех включённых манипуляторов (проверка нагрузки)"""
+        if self._demo is None:
+            self._demo = self.wheel.every(interval_ms, self._demo_step)
+
+    def stop_demo(self):
+        if self._demo is not None:
+            self.wheel.cancel(self._demo)
+            self._demo = None
+
+    def _demo_step(self):
+        t = self.wheel.ticks * self.wheel.tick_ms / 1000
+        for k, arm in enumerate(self.arms):
+            if arm.core.active:
+                arm.core.set_joints(demo_pose(t, k))
+
+    def stats(self):
+        stats = {"arms": len(self.arms), "pages": len(self.pages)}
+        stats.update(self.wheel.stats())
+        stats.update(self.render_scheduler.stats())
+        return stats
+
+    def close(self):
+        self.stop_demo()
+        for arm in self.arms:
+            self.wheel.cancel(arm.timer)
+        self.wheel.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Ячейка манипуляторов ARM-IMR-165")
+    parser.add_argument("--arms", type=int, default=4)
+    parser.add_argument("--columns", type=int, default=CellManager.COLUMNS)
+    parser.add_argument("--demo", action="store_true", help="включить все манипуляторы и двигать их")
+    options = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+    root = tk.Tk()
+    root.title(f"Ячейка ARM-IMR-165: {options.arms} манипуляторов")
+    root.geometry("1200x800")
+    cell = CellManager(root, arms=options.arms, columns=options.columns)
+    if options.demo:
+        cell.power_on_all()
+        cell.start_demo()
+    root.protocol("WM_DELETE_WINDOW", lambda: (cell.close(), root.destroy()))
+    root.mainloop()
+
+
+if __name__ == "__main__":
+    main()
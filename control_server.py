@@ -0,0 +1,424 @@
+"""Многоклиентский сервер управления на asyncio (развитие сокета из main3.py).
+
+Соединения постоянные, запросы в одном соединении можно слать конвейером:
+ответы приходят в том же порядке. Команды применяются к RobotCore одной
+задачей-владельцем, запросы отвечаются из последнего снимка состояния.
+Сервер подписан на события RobotCore: снимок обновляется и после изменений
+из других потоков (интерфейс, сторожевой таймер), не только после своих команд.
+
+Текстовый протокол, одна строка - один запрос:
+    SET <сустав 1-6> <угол>   -> OK
+    JOINTS <6 углов>          -> OK
+    GRIP <0|1>                -> OK
+    STATE <off|ready|...>     -> OK
+    GET                       -> JOINTS <6 углов>
+    STATUS                    -> STATUS <состояние> <захват>
+    POSE                      -> POSE <x> <y>
+    PING                      -> PONG
+    REACH <x> <y>             -> REACH <1|0> <расстояние> <4 угла ближайшей позы>
+Ошибки: ERR <описание>.
+
+На отдельном порту (--binary-port) работает бинарный протокол из protocol.py:
+кадры SET_JOINTS / GRIPPER / STATE_QUERY, ответы ACK / STATE_REPLY в том же
+порядке. Текстовый порт остаётся для отладки.
+
+REACH отвечает по индексу рабочей зоны (workspace_index.py, нужен numpy).
+С check=True позы, к которым приводят SET и JOINTS, проверяются пачкой
+(trajectory_check.py): команда с недопустимой позой отвечается ERR и не
+применяется. Проверка только позиционная (пределы, пол, самопересечение):
+SET и JOINTS - уставки без шкалы времени, скорость перехода к ним задаёт не
+сервер. Скорость по STYLE_LIMITS проверяется там, где есть частота отсчётов,
+- для траекторий воспроизведения (check_trajectory в окне и simulate.py).
+
+Запуск: python control_server.py [--port 2000] [--binary-port 2001] [--max-connections 64]
+"""
+import argparse
+import asyncio
+import collections
+import math
+
+import protocol
+import trajectory_check
+from robot_core import STATES, RobotCore
+
+COMMANDS = {"SET", "JOINTS", "GRIP", "STATE"}
+ACK_OK = protocol.encode(protocol.ACK, 0)
+ACK_ERROR = protocol.encode(protocol.ACK, 1)
+ACK_BUSY = protocol.encode(protocol.ACK, 2)
+GRIP_ARGS = (["0"], ["1"])
+MAX_PENDING = 1024  # ответов в очереди соединения, после которых чтение приостанавливается
+
+
+def parse_angle(text):
+    """Угол из запроса; nan и inf отклоняются до ядра, пределы проверяет RobotCore"""
+    angle = float(text)
+    if not math.isfinite(angle):
+        raise ValueError(f"угол должен быть конечным числом: {text}")
+    return angle
+
+
+def apply_command(core, command, args):
+    if command == "SET":
+        done = core.set_joint(int(args[0]) - 1, parse_angle(args[1]))
+    elif command == "JOINTS":
+        done = core.set_joints([parse_angle(a) for a in args])
+    elif command == "GRIP":
+        done = core.set_gripper(args[0] not in ("0", "false", "open"))
+    else:
+        core.set_state(args[0])
+        done = True
+    if not done:
+        raise ValueError(f"система в состоянии {core.system_state}")
+
+
+def text_snapshot(core):
+    x, y = core.tool_position
+    return {
+        "GET": "JOINTS " + " ".join(f"{a:g}" for a in core.joint_angles),
+        "STATUS": f"STATUS {core.system_state} {int(core.gripper_state)}",
+        "POSE": f"POSE {x:.2f} {y:.2f}",
+        "PING": "PONG",
+    }
+
+
+def state_frame(core):
+    """Кадр STATE_REPLY бинарного протокола"""
+    x, y = core.tool_position
+    return protocol.encode(protocol.STATE_REPLY, STATES.index(core.system_state),
+                           int(core.gripper_state), *core.joint_angles, x, y)
+
+
+class BinaryConnection(asyncio.BufferedProtocol):
+    """Соединение бинарного протокола: приём прямо в буфер FrameParser"""
+
+    def __init__(self, server):
+        self.server = server
+        self.parser = protocol.FrameParser()
+        self.pending = collections.deque()  # Future команды или STATE_QUERY
+        self.transport = None
+        self.paused = False
+
+    def connection_made(self, transport):
+        server = self.server
+        self.transport = transport
+        if server.connections >= server.max_connections:
+            server.rejected += 1
+            transport.write(ACK_BUSY)
+            transport.close()
+            return
+        server.connections += 1
+        server._binary.add(self)
+
+    def connection_lost(self, exc):
+        if self in self.server._binary:
+            self.server._binary.discard(self)
+            self.server.connections -= 1
+        for item in self.pending:
+            if isinstance(item, asyncio.Future):
+                item.remove_done_callback(self._pump)
+        self.pending.clear()
+
+    def get_buffer(self, sizehint):
+        return self.parser.free()
+
+    def buffer_updated(self, nbytes):
+        self.parser.feed(nbytes)
+        loop = asyncio.get_running_loop()
+        queue = self.server._commands
+        try:
+            for kind, payload in self.parser.frames():
+                if kind == protocol.STATE_QUERY:
+                    # Как и в текстовом протоколе, ответ берётся в момент отправки
+                    self.pending.append(protocol.STATE_QUERY)
+                    continue
+                if kind == protocol.SET_JOINTS:
+                    angles = protocol.decode(kind, payload)
+                    if not all(map(math.isfinite, angles)):
+                        self.pending.append(ACK_ERROR)
+                        continue
+                    command = ("JOINTS", angles)
+                elif kind == protocol.GRIPPER:
+                    command = ("GRIP", GRIP_ARGS[payload[0] != 0])
+                else:
+                    self.pending.append(ACK_ERROR)
+                    continue
+                future = loop.create_future()
+                try:
+                    queue.put_nowait((*command, future))
+                except asyncio.QueueFull:
+                    future.set_result("ERR busy")
+                future.add_done_callback(self._pump)
+                self.pending.append(future)
+        except (protocol.ProtocolError, ValueError):
+            self.transport.close()
+            return
+        self._pump()
+
+    def _pump(self, _=None):
+        """Отправить готовые ответы строго в порядке запросов"""
+        pending, chunks = self.pending, []
+        while pending:
+            item = pending[0]
+            if isinstance(item, asyncio.Future):
+                if not item.done():
+                    break
+                chunks.append(ACK_OK if item.result() == "OK" else ACK_ERROR)
+            elif item == protocol.STATE_QUERY:
+                chunks.append(self.server.state_frame)
+            else:
+                chunks.append(item)
+            pending.popleft()
+        if chunks and not self.transport.is_closing():
+            self.transport.write(b"".join(chunks))
+        # Клиент, который не читает ответы, не должен копить их без предела
+        if not self.paused and len(pending) > MAX_PENDING:
+            self.paused = True
+            self.transport.pause_reading()
+        elif self.paused and len(pending) <= MAX_PENDING // 2:
+            self.paused = False
+            self.transport.resume_reading()
+
+
+class ControlServer:
+    def __init__(self, core=None, host="127.0.0.1", port=2000, max_connections=64, queue_size=10000,
+                 binary_port=None, workspace=None, check=False):
+        if core is None:
+            core = RobotCore()
+            core.power_on()
+        self.core = core
+        self.workspace = workspace
+        self.check = check
+        self.host = host
+        self.port = port
+        self.binary_port = binary_port
+        self.max_connections = max_connections
+        self.queue_size = queue_size
+        self.connections = 0
+        self.rejected = 0
+        self.commands_applied = 0
+        self.commands_rejected = 0
+        self.snapshot = text_snapshot(self.core)
+        self.state_frame = state_frame(self.core)
+        self._loop = None
+        self._refresh_pending = False
+        self._commands = None
+        self._server = None
+        self._binary_server = None
+        self._owner = None
+        self._handlers = {}  # задача -> writer активного соединения
+        self._binary = set()  # активные BinaryConnection
+
+    async def start(self):
+        self._loop = asyncio.get_running_loop()
+        self.core.subscribe(self._on_core_event)
+        self._commands = asyncio.Queue(self.queue_size)
+        self._owner = asyncio.create_task(self._apply_commands())
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        if self.port == 0:
+            self.port = self._server.sockets[0].getsockname()[1]
+        if self.binary_port is not None:
+            loop = asyncio.get_running_loop()
+            self._binary_server = await loop.create_server(lambda: BinaryConnection(self),
+                                                           self.host, self.binary_port)
+            if self.binary_port == 0:
+                self.binary_port = self._binary_server.sockets[0].getsockname()[1]
+        return self
+
+    async def serve_forever(self):
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def close(self):
+        self._server.close()
+        for writer in self._handlers.values():
+            writer.close()
+        await asyncio.gather(*self._handlers, return_exceptions=True)
+        await self._server.wait_closed()
+        if self._binary_server is not None:
+            self._binary_server.close()
+            for connection in list(self._binary):
+                connection.transport.close()
+            await self._binary_server.wait_closed()
+        self._owner.cancel()
+        self.core.unsubscribe(self._on_core_event)
+
+    def _on_core_event(self, event, *args):
+        """Наблюдатель RobotCore, вызывается в потоке того, кто менял состояние"""
+        # Несколько событий подряд дают одно обновление снимка в цикле сервера
+        if not self._refresh_pending:
+            self._refresh_pending = True
+            self._loop.call_soon_threadsafe(self._refresh)
+
+    def _refresh(self):
+        self._refresh_pending = False
+        self.snapshot = text_snapshot(self.core)
+        self.state_frame = state_frame(self.core)
+
+    async def _apply_commands(self):
+        """Единственная задача, которая меняет состояние робота"""
+        queue = self._commands
+        while True:
+            batch = [await queue.get()]
+            while not queue.empty():
+                batch.append(queue.get_nowait())
+            rejected = self._check_batch(batch) if self.check else {}
+            for k, (command, args, future) in enumerate(batch):
+                if k in rejected:
+                    result = f"ERR {rejected[k]}"
+                    self.commands_rejected += 1
+                else:
+                    try:
+                        apply_command(self.core, command, args)
+                        result = "OK"
+                        self.commands_applied += 1
+                    except (ValueError, IndexError) as e:
+                        result = f"ERR {e}"
+                if not future.cancelled():
+                    future.set_result(result)
+            # Ответы на запросы за этой пачкой должны видеть её результат сразу
+            self._refresh()
+
+    def _check_batch(self, batch):
+        """Команды пачки, приводящие к недопустимой позе: номер -> описание.
+
+        Позы после каждой SET / JOINTS проверяются одним проходом; после
+        отклонённой команды остаток пачки проверяется от последней допустимой позы.
+        Скорость не проверяется: у уставок нет шкалы времени (см. описание модуля).
+        """
+        rejected = {}
+        angles = list(self.core.joint_angles)
+        first = 0
+        while True:
+            poses, owners = [], []
+            q = list(angles)
+            for k in range(first, len(batch)):
+                command, args, _ = batch[k]
+                try:
+                    if command == "SET":
+                        idx = int(args[0]) - 1
+                        if not 0 <= idx < len(q):
+                            continue
+                        q[idx] = parse_angle(args[1])
+                    elif command == "JOINTS" and len(args) == len(q):
+                        q = [parse_angle(a) for a in args]
+                    else:
+                        continue
+                except (ValueError, IndexError):
+                    # Ошибку разбора сообщит apply_command
+                    continue
+                poses.append(list(q))
+                owners.append(k)
+            violation = trajectory_check.check(poses) if poses else None
+            if violation is None:
+                return rejected
+            k = owners[violation.index]
+            rejected[k] = trajectory_check.describe(violation)
+            if violation.index:
+                angles = poses[violation.index - 1]
+            first = k + 1
+
+    async def _handle(self, reader, writer):
+        if self.connections >= self.max_connections:
+            self.rejected += 1
+            writer.write(b"ERR busy\n")
+            await writer.drain()
+            writer.close()
+            return
+        self.connections += 1
+        task = asyncio.current_task()
+        self._handlers[task] = writer
+        # Очередь ограничена: клиент, который шлёт запросы и не читает ответы,
+        # останавливает чтение своих строк на MAX_PENDING, как на бинарном порту
+        responses = asyncio.Queue(MAX_PENDING)
+        sender = asyncio.create_task(self._send(responses, writer))
+        loop = asyncio.get_running_loop()
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                parts = line.decode('utf-8', 'replace').split()
+                if not parts:
+                    continue
+                command, args = parts[0].upper(), parts[1:]
+                if command in COMMANDS:
+                    future = loop.create_future()
+                    await self._commands.put((command, args, future))
+                    await responses.put(future)
+                elif command == "REACH":
+                    await responses.put((command, args))
+                else:
+                    # Запрос отвечается в момент отправки: снимок уже учитывает предыдущие команды соединения
+                    await responses.put(command)
+        except ConnectionError:
+            pass
+        finally:
+            await responses.put(None)
+            await sender
+            self.connections -= 1
+            del self._handlers[task]
+            writer.close()
+
+    def _reach(self, args):
+        if self.workspace is None:
+            return "ERR нет индекса рабочей зоны"
+        try:
+            x, y = float(args[0]), float(args[1])
+        except (ValueError, IndexError):
+            return "ERR REACH <x> <y>"
+        angles, distance, _ = self.workspace.nearest(x, y, prefer=self.core.joint_angles)
+        # Та же проверка по сетке занятости, что и в окне
+        reachable = int(self.workspace.reachable(x, y))
+        return f"REACH {reachable} {distance:.2f} " + " ".join(str(a) for a in angles)
+
+    async def _send(self, responses, writer):
+        """Ответы уходят строго в порядке запросов"""
+        broken = False
+        while True:
+            item = await responses.get()
+            if item is None:
+                break
+            if broken:
+                # Клиент ушёл: очередь дочитывается, чтобы читатель не ждал места в ней
+                continue
+            try:
+                if isinstance(item, asyncio.Future):
+                    item = await item
+                elif isinstance(item, tuple):
+                    item = self._reach(item[1])
+                else:
+                    item = self.snapshot.get(item, f"ERR неизвестная команда {item}")
+                writer.write(item.encode('utf-8') + b"\n")
+                if responses.empty():
+                    await writer.drain()
+            except ConnectionError:
+                broken = True
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Сервер управления ARM-IMR-165")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=2000)
+    parser.add_argument("--binary-port", type=int, default=2001)
+    parser.add_argument("--max-connections", type=int, default=64)
+    options = parser.parse_args()
+    try:
+        from workspace_index import WorkspaceIndex
+        workspace = WorkspaceIndex.load_or_build()
+        check = True
+    except ImportError:
+        print("numpy не установлен: команда REACH и проверка поз недоступны")
+        workspace, check = None, False
+    server = await ControlServer(host=options.host, port=options.port,
+                                 max_connections=options.max_connections,
+                                 binary_port=options.binary_port, workspace=workspace,
+                                 check=check).start()
+    print(f"Working... {server.host}:{server.port} (binary {server.binary_port})")
+    await server.serve_forever()
+
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,91 @@
+"""Окно диагностики: задержки обработчиков интерфейса по гистограммам.
+
+Раз в секунду показывает число вызовов и p50/p95/p99/max для каждого
+обработчика из Instrumentation, позволяет включить запись, сбросить
+гистограммы и сохранить их в JSON.
+"""
+import time
+import tkinter as tk
+from tkinter import ttk
+
+from tree_diff import TreeviewDiff
+
+COLUMNS = ('handler', 'count', 'p50', 'p95', 'p99', 'max')
+HEADINGS = ('Обработчик', 'Вызовов', 'p50, мс', 'p95, мс', 'p99, мс', 'max, мс')
+
+
+class DiagnosticsPanel:
+    REFRESH_MS = 1000
+
+    def __init__(self, master, instrumentation, logger=None):
+        self.master = master
+        self.instrumentation = instrumentation
+        self.logger = logger
+        self.window = tk.Toplevel(master)
+        self.window.title("Диагностика")
+        self.window.protocol("WM_DELETE_WINDOW", self.close)
+        self._after = None
+
+        toolbar = ttk.Frame(self.window)
+        toolbar.pack(fill=tk.X, padx=5, pady=5)
+        self.enabled_var = tk.BooleanVar(value=instrumentation.enabled)
+        ttk.Checkbutton(toolbar, text="Запись замеров", variable=self.enabled_var,
+                        command=self.toggle).pack(side=tk.LEFT)
+        ttk.Button(toolbar, text="Сбросить", command=self.reset).pack(side=tk.LEFT, padx=5)
+        ttk.Button(toolbar, text="Сохранить", command=self.dump).pack(side=tk.LEFT)
+
+        self.tree = ttk.Treeview(self.window, columns=COLUMNS, show='headings',
+                                 height=len(instrumentation.histograms))
+        for column, text in zip(COLUMNS, HEADINGS):
+            self.tree.heading(column, text=text)
+            self.tree.column(column, width=140 if column == 'handler' else 80, anchor=tk.CENTER)
+        self.tree.pack(fill=tk.BOTH, expand=True, padx=5)
+        self.items = {name: self.tree.insert('', 'end', values=(name, 0, '', '', '', ''))
+                      for name in instrumentation.histograms}
+        self.tree_diff = TreeviewDiff(self.tree, COLUMNS)
+
+        self.status = ttk.Label(self.window, text="")
+        self.status.pack(fill=tk.X, padx=5, pady=5)
+        self.refresh()
+
+    def toggle(self):
+        self.instrumentation.enabled = bool(self.enabled_var.get())
+
+    def reset(self):
+        self.instrumentation.reset()
+        self.refresh()
+
+    def dump(self):
+        path = f"diagnostics_{time.strftime('%Y%m%d_%H%M%S')}.json"
+        try:
+            self.instrumentation.dump(path)
+        except OSError as e:
+            self.status.config(text=f"Ошибка записи: {e}")
+            return
+        self.status.config(text=f"Сохранено: {path}")
+        if self.logger is not None:
+            self.logger.info(f"Гистограммы задержек сохранены в {path}")
+
+    def refresh(self):
+        self._after = None
+        summary = self.instrumentation.summary()
+        self.tree_diff.update((self.items[name], (
+            name,
+            str(stats['count']),
+            f"{stats['p50_ms']:.3f}",
+            f"{stats['p95_ms']:.3f}",
+            f"{stats['p99_ms']:.3f}",
+            f"{stats['max_ms']:.3f}",
+        )) for name, stats in summary.items() if name in self.items)
+        self._after = self.master.after(self.REFRESH_MS, self.refresh)
+
+    def lift(self):
+        self.window.deiconify()
+        self.window.lift()
+
+    def close(self):
+        if self._after is not None:
+            self.master.after_cancel(self._after)
+            self._after = None
+        self.window.destroy()
+        self.window = None
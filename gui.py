@@ -1,33 +1,117 @@
-import tkinter as tk
-from tkinter import ttk, messagebox, scrolledtext
-import math
-import time
-import json
 import logging
+import os
 from logging.handlers import RotatingFileHandler
-import random
 import threading
 
+from async_logging import AsyncLogDispatcher, HandlerSink, TkSink
+from instrumentation import Instrumentation
+from inverse_kinematics import IKSolver
+from kinematics import to_canvas
+from motor_monitor import MotorMonitor
+from position_store import PositionStore
+from render_scheduler import RenderScheduler
+from renderer import RobotRenderer
+from robot_core import ACTIVE_STATES, RobotCore
+from telemetry_hub import TelemetryHub
+from trajectory import TrajectoryPlayer, plan_trajectory
+from trajectory_check import check_trajectory, describe
+from tree_diff import TreeviewDiff
+from workspace_index import WorkspaceIndex
+
+# tkinter и модули виджетов загружаются при создании окна (load_tkinter), а не
+# при импорте gui: ядро, сервер и симуляции импортируют модуль без дисплея
+tk = ttk = messagebox = filedialog = None
+DiagnosticsPanel = LogView = SparklinePanel = None
+
+
+def load_tkinter():
+    global tk, ttk, messagebox, filedialog, DiagnosticsPanel, LogView, SparklinePanel
+    import tkinter as tk
+    from tkinter import ttk, messagebox, filedialog
+    from diagnostics_panel import DiagnosticsPanel
+    from log_view import LogView
+    from sparkline import SparklinePanel
+
 
 class RobotARM_IMR165_GUI:
-    def __init__(self, master):
+    RENDER_FPS = 60
+    LOG_CAPACITY = 5000
+    HISTORY_RETENTION = 3600
+    POSITIONS_FILE = "positions.bin"
+    POSITIONS_FLUSH_MS = 5000
+    PLAYBACK_POSES = 10
+    PLAYBACK_RATE = 50
+    TELEMETRY_PORT = 2002
+    JOG_STEP = 5  # шаг перемещения инструмента, единицы модели
+    OVERHEAT_LIMIT = 60  # °C
+    OVERHEAT_HYSTERESIS = 5
+    # Предел скорости роста температуры, °C/с; у имитации датчиков температура - шум, проверка выключена
+    MAX_TEMP_RISE = None
+    # Окна статистики в мониторе моторов, с: максимум и среднее
+    TEMP_MAX_WINDOW = 30
+    TEMP_MEAN_WINDOW = 300
+    TEMP_EWMA_TAU = 10
+    # Обработчики, время которых пишется в гистограммы окна диагностики
+    INSTRUMENTED = ("update_joint_angle", "draw_robot", "update_motor_monitor", "emergency_stop",
+                    "save_position")
+
+    def __init__(self, master, telemetry=None, core=None):
+        load_tkinter()
         self.master = master
         master.title("Управление роботом ARM-IMR-165")
         master.geometry("1200x800")
 
-        # Инициализация системы
-        self.system_state = "off"
+        # Состояние и логика - в RobotCore, окно только отображает его события
+        self.core = core or RobotCore()
         self.movement_style = "normal"
         self.connection_status = True
-        self.joint_angles = [0] * 6
-        self.gripper_state = False
-        self.motor_data = {'temp': [0.0] * 6, 'position_ticks': [0] * 6, 'position_rad': [0.0] * 6,
-                           'position_deg': [0] * 6}
-
+        self.player = None
+        self._syncing_sliders = False  # слайдеры ставятся из ядра, их command не должен менять углы
+        self.ik = IKSolver()
+        # Обёртки ставятся до создания виджетов и таймеров, которые запоминают методы;
+        # запись включается в окне диагностики или переменной ROBOT_INSTRUMENT=1
+        self.instrumentation = Instrumentation(enabled=os.environ.get("ROBOT_INSTRUMENT") == "1")
+        self.instrumentation.install(self, self.INSTRUMENTED)
+        self.diagnostics = None
+        # Опрос моторов, сторожевой таймер и статистика работают без Tk; перегрев
+        # блокирует движение в потоке опроса, авария объявляется в потоке Tk
+        self.motors = MotorMonitor(self.core, telemetry,
+                                   on_trip=lambda reason: master.after(0, self.emergency_stop, reason),
+                                   limit=self.OVERHEAT_LIMIT, hysteresis=self.OVERHEAT_HYSTERESIS,
+                                   max_rise=self.MAX_TEMP_RISE, windows=(self.TEMP_MAX_WINDOW, self.TEMP_MEAN_WINDOW),
+                                   tau=self.TEMP_EWMA_TAU, retention=self.HISTORY_RETENTION)
+        self.telemetry = self.motors.telemetry
+        self.instrumentation.install(self.motors, ["sample"])
+        self.instrumentation.histograms["watchdog_trip"] = self.motors.watchdog.latency
+
+        self.render_scheduler = RenderScheduler(master, self.draw_robot, fps=self.RENDER_FPS)
         self.setup_logging()
+        self.setup_positions()
+        self.setup_telemetry_hub()
+        self.setup_workspace()
         self.create_widgets()
+        self.core.subscribe(self.on_core_event)
         self.update_status("Система выключена", "red")
-        threading.Thread(target=self.monitor_motors, daemon=True).start()
+        self.motors.listeners.append(self.telemetry_hub.publish)
+        self.motors.listeners.append(lambda *frame: master.after(0, self.update_motor_monitor))
+        self.motors.start()
+        master.protocol("WM_DELETE_WINDOW", self.on_close)
+
+    @property
+    def system_state(self):
+        return self.core.system_state
+
+    @property
+    def joint_angles(self):
+        return self.core.joint_angles
+
+    @property
+    def gripper_state(self):
+        return self.core.gripper_state
+
+    @property
+    def chain(self):
+        return self.core.chain
 
     def setup_logging(self):
         self.logger = logging.getLogger('robot_logger')
@@ -39,9 +123,44 @@ class RobotARM_IMR165_GUI:
             logging.FileHandler('emergency.log'),
             logging.StreamHandler()
         ]
+        # Файлы и консоль пишет фоновый поток, вызывающий поток не блокируется
+        self.log_dispatcher = AsyncLogDispatcher()
         for handler in handlers:
             handler.setFormatter(formatter)
-            self.logger.addHandler(handler)
+            self.log_dispatcher.add_sink(HandlerSink(handler))
+        self.logger.addHandler(self.log_dispatcher)
+
+    def setup_positions(self):
+        first_run = not os.path.exists(self.POSITIONS_FILE)
+        self.positions = PositionStore(self.POSITIONS_FILE)
+        self._positions_flush = None
+        # Перенос позиций, сохранённых прежней версией в positions.json
+        if first_run and os.path.exists("positions.json"):
+            count = self.positions.import_jsonl("positions.json")
+            self.logger.info(f"Импортировано позиций из positions.json: {count}")
+
+    def setup_telemetry_hub(self):
+        # Внешние панели и регистраторы подписываются на телеметрию по сокету
+        self.telemetry_hub = TelemetryHub(port=self.TELEMETRY_PORT)
+        try:
+            self.telemetry_hub.start()
+        except OSError as e:
+            self.logger.warning(f"Рассылка телеметрии недоступна: {e}")
+
+    def setup_workspace(self):
+        # Индекс строится один раз для текущей геометрии, дальше загружается из файла
+        self.workspace = None
+
+        def load():
+            try:
+                index = WorkspaceIndex.load_or_build()
+            except ImportError:
+                self.logger.warning("numpy не установлен: выбор точки на холсте недоступен")
+                return
+            self.workspace = index
+            self.logger.info(f"Индекс рабочей зоны загружен: {len(index)} поз")
+
+        threading.Thread(target=load, daemon=True).start()
 
     def create_widgets(self):
         # Основные фреймы
@@ -118,6 +237,16 @@ class RobotARM_IMR165_GUI:
         self.gripper_btn = ttk.Button(f, text="Закрыть", command=self.toggle_gripper)
         self.gripper_btn.pack(side=tk.RIGHT, padx=5)
 
+        # Перемещение инструмента по X/Y через обратную кинематику
+        f = ttk.LabelFrame(frame, text="Перемещение инструмента", padding=10)
+        f.pack(fill=tk.X, pady=5)
+        self.jog_buttons = []
+        for text, dx, dy in [("X−", -1, 0), ("X+", 1, 0), ("Y−", 0, -1), ("Y+", 0, 1)]:
+            button = ttk.Button(f, text=text, width=5, state=tk.DISABLED,
+                                command=lambda dx=dx, dy=dy: self.jog(dx * self.JOG_STEP, dy * self.JOG_STEP))
+            button.pack(side=tk.LEFT, expand=True, padx=2)
+            self.jog_buttons.append(button)
+
         # Стиль движения
         f = ttk.LabelFrame(frame, text="Стиль движения", padding=10)
         f.pack(fill=tk.X, pady=10)
@@ -130,7 +259,9 @@ class RobotARM_IMR165_GUI:
         f = ttk.Frame(frame)
         f.pack(fill=tk.X, pady=10)
         for text, cmd in [("Домой", self.home_position), ("Сброс", self.reset_robot),
-                          ("Сохранить", self.save_position)]:
+                          ("Сохранить", self.save_position), ("Экспорт", self.export_positions),
+                          ("Воспроизвести", self.play_positions),
+                          ("Диагностика", self.open_diagnostics)]:
             ttk.Button(f, text=text, command=cmd).pack(side=tk.LEFT, fill=tk.X, expand=True, padx=5)
 
         # Аварийная кнопка (исправлено - сохраняем в self.emergency_btn)
@@ -143,80 +274,61 @@ class RobotARM_IMR165_GUI:
         frame = ttk.LabelFrame(parent, text="Логи системы", padding=10)
         frame.pack(fill=tk.BOTH, expand=True)
 
-        self.log_text = scrolledtext.ScrolledText(frame, width=80, height=15)
-        self.log_text.pack(fill=tk.BOTH, expand=True)
-        self.log_text.configure(state='disabled')
+        self.log_view = LogView(frame, capacity=self.LOG_CAPACITY)
 
-        class TextHandler(logging.Handler):
-            def __init__(self, text):
-                super().__init__()
-                self.text = text
-
-            def emit(self, record):
-                self.text.configure(state='normal')
-                self.text.insert(tk.END, self.format(record) + '\n')
-                self.text.configure(state='disabled')
-                self.text.see(tk.END)
-
-        handler = TextHandler(self.log_text)
-        handler.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(message)s'))
-        self.logger.addHandler(handler)
+        # Виджет обновляется пачками в потоке Tk
+        self.log_dispatcher.add_sink(TkSink(self.master, self.log_view.append,
+                                            formatter=logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')))
 
     def create_visualization_panel(self, parent):
         frame = ttk.LabelFrame(parent, text="Визуализация", padding=10)
         frame.pack(fill=tk.BOTH, expand=True)
         self.canvas = tk.Canvas(frame, bg='white', width=400, height=400)
         self.canvas.pack(fill=tk.BOTH, expand=True)
+        self.renderer = RobotRenderer(self.canvas)
+        self.canvas.bind("<Configure>", lambda e: self.render_scheduler.request())
+        self.canvas.bind("<Button-1>", self.reach_point)
 
     def create_motor_monitor(self, parent):
         frame = ttk.LabelFrame(parent, text="Мониторинг моторов", padding=10)
         frame.pack(fill=tk.BOTH, expand=True)
 
-        self.motor_tree = ttk.Treeview(frame, columns=('motor', 'temp', 'pos_ticks', 'pos_rad', 'pos_deg'),
-                                       show='headings', height=6)
-        for col, text in [('motor', 'Мотор'), ('temp', 'Темп (°C)'), ('pos_ticks', 'Поз. (тики)'),
-                          ('pos_rad', 'Поз. (рад)'), ('pos_deg', 'Поз. (°)')]:
+        columns = ('motor', 'temp', 'temp_max', 'temp_mean', 'pos_ticks', 'pos_rad', 'pos_deg')
+        self.motor_tree = ttk.Treeview(frame, columns=columns, show='headings', height=6)
+        for col, text in [('motor', 'Мотор'), ('temp', 'Темп (°C)'),
+                          ('temp_max', f'Макс. {self.TEMP_MAX_WINDOW} с'),
+                          ('temp_mean', f'Сред. {self.TEMP_MEAN_WINDOW // 60} мин'),
+                          ('pos_ticks', 'Поз. (тики)'), ('pos_rad', 'Поз. (рад)'), ('pos_deg', 'Поз. (°)')]:
             self.motor_tree.heading(col, text=text)
             self.motor_tree.column(col, width=80 if col == 'motor' else 100, anchor=tk.CENTER)
         self.motor_tree.pack(fill=tk.BOTH, expand=True)
 
         for i in range(6):
-            self.motor_tree.insert('', 'end', values=(f'Мотор {i + 1}', '0.0', '0', '0.00', '0'))
+            self.motor_tree.insert('', 'end', values=(f'Мотор {i + 1}', '0.0', '-', '-', '0', '0.00', '0'))
+        self.motor_tree_diff = TreeviewDiff(self.motor_tree, columns)
+
+        self.sparklines = SparklinePanel(frame, self.motors.history, [f'Мотор {i + 1}' for i in range(6)])
 
         ttk.Button(frame, text="Обновить данные", command=self.update_motor_monitor).pack(pady=5)
 
     def update_motor_monitor(self):
-        for i, item in enumerate(self.motor_tree.get_children()):
-            self.motor_tree.item(item, values=(
-                f'Мотор {i + 1}',
-                f'{self.motor_data["temp"][i]:.1f}',
-                f'{self.motor_data["position_ticks"][i]}',
-                f'{self.motor_data["position_rad"][i]:.2f}',
-                f'{self.motor_data["position_deg"][i]}'
-            ))
-
-    def monitor_motors(self):
-        while True:
-            if self.system_state in ["ready", "running", "paused"]:
-                for i in range(6):
-                    self.motor_data['temp'][i] = random.uniform(25.0, 45.0)
-                    self.motor_data['position_ticks'][i] = int(self.joint_angles[i] * 10)
-                    self.motor_data['position_rad'][i] = math.radians(self.joint_angles[i])
-                    self.motor_data['position_deg'][i] = self.joint_angles[i]
-
-                self.master.after(0, self.update_motor_monitor)
-                if any(temp > 60 for temp in self.motor_data['temp']):
-                    self.emergency_stop("Перегрев двигателей")
-            time.sleep(1)
+        data = self.telemetry.snapshot()
+        # Максимум и среднее по окнам; до первого отсчёта окна пусты
+        stats = [(f'{s[self.TEMP_MAX_WINDOW]["max"]:.1f}', f'{s[self.TEMP_MEAN_WINDOW]["mean"]:.1f}')
+                 if s["count"] else ('-', '-') for s in self.motors.stats.snapshot()]
+        # В Tk уходят только ячейки, чьё отформатированное значение изменилось
+        self.motor_tree_diff.update((item, (
+            f'Мотор {i + 1}',
+            f'{data.temp[axis]:.1f}',
+            *stats[i],
+            f'{data.position_ticks[axis]:.0f}',
+            f'{data.position_rad[axis]:.2f}',
+            f'{data.position_deg[axis]:.0f}'
+        )) for i, (item, axis) in enumerate(zip(self.motor_tree.get_children(), self.motors.axes)))
+        self.sparklines.refresh()
 
     def power_on(self):
-        self.system_state = "ready"
-        self.update_system_state()
-        self.power_on_btn.config(state=tk.DISABLED)
-        self.power_off_btn.config(state=tk.NORMAL)
-        self.pause_btn.config(state=tk.NORMAL)
-        self.logger.info("Система включена")
-        self.update_status("Система готова", "green")
+        self.core.power_on()
 
     def power_off(self):
         if self.system_state == "emergency":
@@ -227,30 +339,68 @@ class RobotARM_IMR165_GUI:
         if not messagebox.askyesno("Подтверждение", "Вы уверены, что хотите выключить систему?"):
             return
 
-        # Возврат в домашнее положение
-        self.home_position()
-
-        # Выключение системы
-        self.system_state = "off"
-        self.update_system_state()
-        self.power_on_btn.config(state=tk.NORMAL)
-        self.power_off_btn.config(state=tk.DISABLED)
-        self.pause_btn.config(state=tk.DISABLED)
-        self.logger.info("Система выключена")
-        self.update_status("Система выключена", "red")
+        # Возврат в домашнее положение и выключение
+        self.stop_playback()
+        self.core.power_off()
 
     def pause(self):
-        if self.system_state == "running":
-            self.system_state = "paused"
-            self.pause_btn.config(text="Продолжить")
-            self.logger.info("Пауза")
-            self.update_status("Пауза", "orange")
-        elif self.system_state == "paused":
-            self.system_state = "running"
+        state = self.core.pause()
+        if self.player is not None:
+            if state == "paused":
+                self.player.pause()
+            else:
+                self.player.resume()
+
+    def on_core_event(self, event, *args):
+        """Наблюдатель RobotCore: синхронизация виджетов с состоянием"""
+        if event == "state":
+            self.update_system_state()
+            self.update_controls(args[0])
+        elif event == "joint":
+            idx, angle = args
+            getattr(self, f"joint_{idx}_label").config(text=f"{angle}°")
+            self.render_scheduler.request()
+        elif event == "joints":
+            # Во время воспроизведения слайдеры синхронизируются один раз, в конце
+            if self.player is None:
+                # scale.set вызывает command слайдера; без флага углы IK округлялись бы до градуса
+                self._syncing_sliders = True
+                try:
+                    for i, angle in enumerate(args[0]):
+                        getattr(self, f"joint_{i}_scale").set(angle)
+                        getattr(self, f"joint_{i}_label").config(text=f"{angle:.0f}°")
+                finally:
+                    self._syncing_sliders = False
+            self.render_scheduler.request()
+        elif event == "gripper":
+            closed = args[0]
+            self.gripper_label.config(text=f"Захват: {'Закрыт' if closed else 'Открыт'}")
+            self.gripper_btn.config(text="Открыть" if closed else "Закрыть")
+            self.render_scheduler.request()
+        elif event == "emergency":
+            reason = args[0]
+            self.stop_playback()
+            self.master.bell()
+            self.update_status(f"АВАРИЯ! Причина: {reason}", "red")
+            messagebox.showerror("Авария", f"Аварийная остановка!\nПричина: {reason}")
+
+    def update_controls(self, state):
+        if state == "off":
+            self.power_on_btn.config(state=tk.NORMAL)
+            self.power_off_btn.config(state=tk.DISABLED)
+            self.pause_btn.config(state=tk.DISABLED, text="Пауза")
+            self.update_status("Система выключена", "red")
+        elif state == "ready":
+            self.power_on_btn.config(state=tk.DISABLED)
+            self.power_off_btn.config(state=tk.NORMAL)
+            self.pause_btn.config(state=tk.NORMAL, text="Пауза")
+            self.update_status("Система готова", "green")
+        elif state == "running":
             self.pause_btn.config(text="Пауза")
-            self.logger.info("Продолжение")
             self.update_status("Работает", "green")
-        self.update_system_state()
+        elif state == "paused":
+            self.pause_btn.config(text="Продолжить")
+            self.update_status("Пауза", "orange")
 
     def update_system_state(self):
         states = {
@@ -277,10 +427,12 @@ class RobotARM_IMR165_GUI:
             self.lights['red'].itemconfig('red', fill='red')
             self.master.after(500, self.blink_red_light)
 
-        state = tk.NORMAL if self.system_state in ["ready", "running", "paused"] else tk.DISABLED
+        state = tk.NORMAL if self.system_state in ACTIVE_STATES else tk.DISABLED
         for i in range(6):
             getattr(self, f"joint_{i}_scale").config(state=state)
         self.gripper_btn.config(state=state)
+        for button in self.jog_buttons:
+            button.config(state=state)
         if hasattr(self, "emergency_btn"):
             self.emergency_btn.config(state=state)
 
@@ -291,21 +443,23 @@ class RobotARM_IMR165_GUI:
             self.master.after(500, self.blink_red_light)
 
     def update_joint_angle(self, value, joint_idx):
-        if self.system_state not in ["ready", "running", "paused"]: return
-        angle = round(float(value))
-        self.joint_angles[joint_idx] = angle
-        getattr(self, f"joint_{joint_idx}_label").config(text=f"{angle}°")
-        self.logger.debug(f"Сустав {joint_idx + 1} установлен на {angle}°")
-        self.draw_robot()
+        if self._syncing_sliders:
+            return
+        self.core.set_joint(joint_idx, round(float(value)))
 
     def toggle_gripper(self):
-        if self.system_state not in ["ready", "running", "paused"]: return
-        self.gripper_state = not self.gripper_state
-        state = "Закрыт" if self.gripper_state else "Открыт"
-        self.gripper_label.config(text=f"Захват: {state}")
-        self.gripper_btn.config(text="Открыть" if self.gripper_state else "Закрыть")
-        self.logger.info(f"Захват {state.lower()}")
-        self.draw_robot()
+        self.core.toggle_gripper()
+
+    def jog(self, dx, dy):
+        if not self.core.active or self.player is not None:
+            return
+        x, y = self.core.tool_position
+        result = self.ik.solve((x + dx, y + dy), self.joint_angles)
+        if not result.converged:
+            self.update_status("Точка недостижима", "orange")
+            return
+        self.core.set_joints(result.angles)
+        self.logger.debug(f"Инструмент: X={x + dx:.0f}, Y={y + dy:.0f}, итераций {result.iterations}")
 
     def update_movement_style(self):
         style = self.movement_style.get()
@@ -315,13 +469,8 @@ class RobotARM_IMR165_GUI:
 
     def home_position(self):
         if self.system_state == "emergency": return
-        for i in range(6):
-            getattr(self, f"joint_{i}_scale").set(0)
-            self.joint_angles[i] = 0
-            getattr(self, f"joint_{i}_label").config(text="0°")
-        if self.gripper_state: self.toggle_gripper()
-        self.logger.info("Домашняя позиция")
-        self.draw_robot()
+        self.stop_playback()
+        self.core.home()
 
     def reset_robot(self):
         if self.system_state == "emergency":
@@ -332,61 +481,131 @@ class RobotARM_IMR165_GUI:
             self.logger.warning("Сброс системы")
 
     def save_position(self):
-        data = {"joints": self.joint_angles, "gripper": self.gripper_state,
-                "timestamp": time.strftime("%Y-%m-%d %H:%M:%S")}
         try:
-            with open("positions.json", "a") as f:
-                json.dump(data, f)
-                f.write("\n")
-            self.logger.info("Позиция сохранена")
+            name = f"P{len(self.positions) + 1}"
+            self.positions.append(self.joint_angles, self.gripper_state, name)
+            # Запись на диск пачками: не чаще раза в POSITIONS_FLUSH_MS
+            if self._positions_flush is None:
+                self._positions_flush = self.master.after(self.POSITIONS_FLUSH_MS, self.flush_positions)
+            self.logger.info(f"Позиция {name} сохранена")
             self.update_status("Позиция сохранена", "blue")
         except Exception as e:
             self.logger.error(f"Ошибка сохранения: {str(e)}")
             self.update_status("Ошибка сохранения", "red")
 
+    def flush_positions(self, sync=False):
+        self._positions_flush = None
+        try:
+            self.positions.flush(sync=sync)
+        except OSError as e:
+            self.logger.error(f"Ошибка записи позиций: {str(e)}")
+
+    def export_positions(self):
+        """Выгрузить сохранённые позиции в JSON lines (формат прежнего positions.json)"""
+        path = filedialog.asksaveasfilename(defaultextension=".json", initialfile="positions.json",
+                                            filetypes=[("JSON lines", "*.json *.jsonl"), ("Все файлы", "*")])
+        if not path:
+            return
+        try:
+            self.positions.export_jsonl(path)
+        except OSError as e:
+            self.logger.error(f"Ошибка экспорта позиций: {str(e)}")
+            self.update_status("Ошибка экспорта", "red")
+            return
+        self.logger.info(f"Позиции выгружены в {path}: {len(self.positions)}")
+        self.update_status("Позиции выгружены", "blue")
+
+    def open_diagnostics(self):
+        if self.diagnostics is not None and self.diagnostics.window is not None:
+            self.diagnostics.lift()
+            return
+        self.diagnostics = DiagnosticsPanel(self.master, self.instrumentation, self.logger)
+
+    def on_close(self):
+        self.motors.stop()
+        self.telemetry_hub.close()
+        self.positions.close()
+        self.log_dispatcher.close()
+        self.master.destroy()
+
+    def play_positions(self):
+        if self.system_state != "ready":
+            self.update_status("Воспроизведение доступно в состоянии «Готова»", "orange")
+            return
+        saved = self.positions.latest(self.PLAYBACK_POSES)
+        if not saved:
+            self.update_status("Нет сохранённых позиций", "orange")
+            return
+        style = self.movement_style.get()
+        poses = [(list(self.joint_angles), self.gripper_state)] + [(p.joints, p.gripper) for p in saved]
+        trajectory = plan_trajectory(poses, style, rate=self.PLAYBACK_RATE)
+        try:
+            violation = check_trajectory(trajectory, style)
+        except ImportError:
+            violation = None
+        if violation is not None:
+            message = f"Траектория отклонена: отсчёт {violation.index}, {describe(violation)}"
+            self.logger.warning(message)
+            self.update_status(message, "red")
+            return
+        self.player = TrajectoryPlayer(self.master, trajectory, self._on_playback_tick, self._on_playback_finish)
+        self.core.start_motion()
+        self.logger.info(f"Воспроизведение {len(saved)} позиций: {trajectory.duration:.1f} с, стиль {style}")
+        self.player.start()
+
+    def _on_playback_tick(self, angles, gripper):
+        self.core.set_joints(angles)
+        self.core.set_gripper(gripper)
+
+    def _on_playback_finish(self, stats):
+        self.player = None
+        self.core.set_joints([round(angle) for angle in self.joint_angles])
+        if stats["ticks"]:
+            self.logger.info(f"Траектория завершена: {stats['ticks']} тиков, джиттер p50={stats['p50_ms']:.1f} мс, "
+                             f"p99={stats['p99_ms']:.1f} мс, max={stats['max_ms']:.1f} мс")
+        self.core.finish_motion()
+
+    def stop_playback(self):
+        if self.player is None:
+            return
+        self.player.stop()
+        self.player = None
+        self.logger.info("Воспроизведение остановлено")
+        self.core.finish_motion()
+
     def emergency_stop(self, reason="Неизвестно"):
-        if self.system_state == "emergency": return
-        self.system_state = "emergency"
-        self.update_system_state()
-        self.logger.critical(f"АВАРИЯ! Причина: {reason}")
-        self.master.bell()
-        self.update_status(f"АВАРИЯ! Причина: {reason}", "red")
-        messagebox.showerror("Авария", f"Аварийная остановка!\nПричина: {reason}")
+        self.core.emergency_stop(reason)
+
+    def reach_point(self, event):
+        """Щелчок по холсту: перевести инструмент в выбранную точку"""
+        if not self.core.active or self.player is not None:
+            return
+        if self.workspace is None:
+            self.update_status("Индекс рабочей зоны ещё строится", "orange")
+            return
+        x0, y0 = self.renderer.origin()
+        x, y = event.x - x0, y0 - event.y
+        if not self.workspace.reachable(x, y):
+            self.update_status(f"Точка X={x:.0f}, Y={y:.0f} недостижима", "orange")
+            return
+        angles, _, _ = self.workspace.nearest(x, y, prefer=self.joint_angles)
+        rest = list(self.joint_angles[len(angles):])
+        # Поза из индекса - начальное приближение, точное положение даёт обратная кинематика
+        result = self.ik.solve((x, y), angles + rest)
+        self.core.set_joints(result.angles if result.converged else angles + rest)
+        self.logger.info(f"Инструмент переведён в X={x:.0f}, Y={y:.0f}")
 
     def update_status(self, message, color="black"):
         self.status_label.config(text=message, foreground=color)
 
     def draw_robot(self):
-        self.canvas.delete("all")
-        w, h = self.canvas.winfo_width(), self.canvas.winfo_height()
-        base_radius, lengths = 50, [80, 120, 80, 40]
-        x0, y0 = w // 2, h - 50
-        self.canvas.create_oval(x0 - base_radius, y0 - 20, x0 + base_radius, y0 + 20, fill="gray", outline="black")
-
-        angles = [math.radians(a) for a in self.joint_angles]
-        points = [(x0, y0)]
-        for i in range(4):
-            x = points[-1][0] + (base_radius if i == 0 else lengths[i - 1]) * math.cos(sum(angles[:i + 1]))
-            y = points[-1][1] - (base_radius if i == 0 else lengths[i - 1]) * math.sin(sum(angles[:i + 1]))
-            points.append((x, y))
-            self.canvas.create_line(points[-2][0], points[-2][1], x, y,
-                                    width=10 - 2 * i, fill=["blue", "green"][i % 2])
-            self.canvas.create_oval(x - 5, y - 5, x + 5, y + 5, fill="red")
-
-        gripper_width = 30 if self.gripper_state else 60
-        angle = sum(angles[:5]) + angles[5]
-        for side in [math.pi / 2, -math.pi / 2]:
-            x = points[-1][0] + gripper_width * math.cos(angle + side)
-            y = points[-1][1] - gripper_width * math.sin(angle + side)
-            self.canvas.create_line(points[-1][0], points[-1][1], x, y, width=3, fill="red")
-
-        self.canvas.create_text(w // 2, 20, text=f"Координаты: X={int(points[-1][0])}, Y={int(points[-1][1])}",
-                                font=('Arial', 10))
-        colors = {"off": "gray", "ready": "yellow", "running": "green", "paused": "orange", "emergency": "red"}
-        self.canvas.create_rectangle(10, 10, 20, 20, fill=colors.get(self.system_state, "white"))
+        x0, y0 = self.renderer.origin()
+        core = self.core
+        self.renderer.draw(to_canvas(core.points, x0, y0), to_canvas(core.fingers(), x0, y0), core.system_state)
 
 
 if __name__ == "__main__":
+    load_tkinter()
     root = tk.Tk()
     app = RobotARM_IMR165_GUI(root)
     root.mainloop()
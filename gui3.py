@@ -1,6 +1,8 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
-import math
+
+from kinematics import forward_kinematics, gripper_fingers, to_canvas
+from renderer import RobotRenderer
 
 class RobotARM_IMR165_GUI:
     def __init__(self, master):
@@ -29,6 +31,8 @@ class RobotARM_IMR165_GUI:
         # Холст для визуализации робота
         self.canvas = tk.Canvas(self.visual_frame, bg='white', width=400, height=500)
         self.canvas.pack(fill=tk.BOTH, expand=True)
+        self.renderer = RobotRenderer(self.canvas, state_marker=False)
+        self.canvas.bind("<Configure>", lambda e: self.draw_robot())
 
         # Параметры робота
         self.joint_angles = [0, 0, 0, 0, 0, 0]  # 6 степеней свободы
@@ -153,60 +157,10 @@ class RobotARM_IMR165_GUI:
 
     def draw_robot(self):
         """Рисуем робота на холсте"""
-        self.canvas.delete("all")
-        width = self.canvas.winfo_width()
-        height = self.canvas.winfo_height()
-
-        # Параметры робота
-        base_radius = 50
-        link_lengths = [80, 120, 80, 40]
-
-
-        x0, y0 = width // 2, height - 50
-        self.canvas.create_oval(x0 - base_radius, y0 - 20, x0 + base_radius, y0 + 20, fill="gray", outline="black")
-
-        # Рисуем манипулятор
-        angles = [math.radians(a) for a in self.joint_angles]
-
-
-        x1 = x0 + base_radius * math.cos(angles[0])
-        y1 = y0 - base_radius * math.sin(angles[0])
-        self.canvas.create_line(x0, y0, x1, y1, width=10, fill="blue")
-        self.canvas.create_oval(x1 - 5, y1 - 5, x1 + 5, y1 + 5, fill="red")
-
-
-        x2 = x1 + link_lengths[0] * math.cos(angles[0] + angles[1])
-        y2 = y1 - link_lengths[0] * math.sin(angles[0] + angles[1])
-        self.canvas.create_line(x1, y1, x2, y2, width=8, fill="green")
-        self.canvas.create_oval(x2 - 5, y2 - 5, x2 + 5, y2 + 5, fill="red")
-
-        x3 = x2 + link_lengths[1] * math.cos(angles[0] + angles[1] + angles[2])
-        y3 = y2 - link_lengths[1] * math.sin(angles[0] + angles[1] + angles[2])
-        self.canvas.create_line(x2, y2, x3, y3, width=6, fill="blue")
-        self.canvas.create_oval(x3 - 5, y3 - 5, x3 + 5, y3 + 5, fill="red")
-
-
-        x4 = x3 + link_lengths[2] * math.cos(sum(angles[:4]))
-        y4 = y3 - link_lengths[2] * math.sin(sum(angles[:4]))
-        self.canvas.create_line(x3, y3, x4, y4, width=4, fill="green")
-        self.canvas.create_oval(x4 - 5, y4 - 5, x4 + 5, y4 + 5, fill="red")
-
-
-
-        gripper_width = 30 if self.gripper_state else 60
-        angle = sum(angles[:5]) + angles[5]
-
-        x5_left = x4 + gripper_width * math.cos(angle + math.pi / 2)
-        y5_left = y4 - gripper_width * math.sin(angle + math.pi / 2)
-        self.canvas.create_line(x4, y4, x5_left, y5_left, width=3, fill="red")
-
-
-        x5_right = x4 + gripper_width * math.cos(angle - math.pi / 2)
-        y5_right = y4 - gripper_width * math.sin(angle - math.pi / 2)
-        self.canvas.create_line(x4, y4, x5_right, y5_right, width=3, fill="red")
-
-
-        self.canvas.create_text(width // 2, 20, text=f"Координаты: X={int(x4)}, Y={int(y4)}", font=('Arial', 10))
+        x0, y0 = self.renderer.origin()
+        points, tool_angle = forward_kinematics(self.joint_angles)
+        fingers = gripper_fingers(points[-1], tool_angle, self.gripper_state)
+        self.renderer.draw(to_canvas(points, x0, y0), to_canvas(fingers, x0, y0))
 
 
 # Запуск приложения
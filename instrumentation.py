@@ -0,0 +1,135 @@
+"""Замеры длительности обработчиков в гистограммах фиксированного размера.
+
+LatencyHistogram хранит счётчики в логарифмически-линейных корзинах (как
+HDR Histogram): 32 корзины на каждую степень двойки, относительная ошибка
+не больше ~3%, память постоянна и не зависит от числа замеров.
+Instrumentation.install() подменяет методы объекта обёртками; пока запись
+выключена, обёртка только проверяет флаг, а после uninstall() методы
+вызываются напрямую.
+"""
+import functools
+import json
+import time
+from array import array
+
+SUB_BITS = 5
+SUB = 1 << SUB_BITS
+MAX_SHIFT = 36  # значения до ~2^42 нс (больше часа)
+
+
+def _index(value):
+    if value < 2 * SUB:
+        return value
+    shift = value.bit_length() - SUB_BITS - 1
+    if shift > MAX_SHIFT:
+        return (MAX_SHIFT + 2) * SUB - 1
+    return shift * SUB + (value >> shift)
+
+
+def _value(index):
+    """Середина корзины, нс"""
+    if index < 2 * SUB:
+        return index
+    shift = index // SUB - 1
+    lower = (index - shift * SUB) << shift
+    return lower + (1 << shift) // 2
+
+
+class LatencyHistogram:
+    def __init__(self):
+        self.counts = array('Q', bytes(8 * (MAX_SHIFT + 2) * SUB))
+        self.reset()
+
+    def reset(self):
+        for i in range(len(self.counts)):
+            self.counts[i] = 0
+        self.count = 0
+        self.total = 0
+        self.max = 0
+
+    def record(self, ns):
+        self.counts[_index(ns)] += 1
+        self.count += 1
+        self.total += ns
+        if ns > self.max:
+            self.max = ns
+
+    def percentile(self, q):
+        """Значение q-квантиля (0..1), нс"""
+        if not self.count:
+            return 0
+        rank = max(1, round(q * self.count))
+        seen = 0
+        for i, n in enumerate(self.counts):
+            if n:
+                seen += n
+                if seen >= rank:
+                    return min(_value(i), self.max)
+        return self.max
+
+    def summary(self):
+        ms = 1e-6
+        return {
+            "count": self.count,
+            "mean_ms": self.total / self.count * ms if self.count else 0.0,
+            "p50_ms": self.percentile(0.50) * ms,
+            "p95_ms": self.percentile(0.95) * ms,
+            "p99_ms": self.percentile(0.99) * ms,
+            "max_ms": self.max * ms,
+        }
+
+    def buckets(self):
+        """Непустые корзины: [(значение, нс, число замеров)]"""
+        return [(_value(i), n) for i, n in enumerate(self.counts) if n]
+
+
+class Instrumentation:
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self.histograms = {}
+        self._installed = []  # (объект, имя метода)
+
+    def histogram(self, name):
+        if name not in self.histograms:
+            self.histograms[name] = LatencyHistogram()
+        return self.histograms[name]
+
+    def install(self, obj, names):
+        """Обернуть методы объекта; вызывать до того, как они переданы виджетам и таймерам"""
+        for name in names:
+            method = getattr(obj, name)
+            setattr(obj, name, self._wrap(method, self.histogram(name)))
+            self._installed.append((obj, name))
+
+    def uninstall(self):
+        for obj, name in self._installed:
+            # Снова виден метод класса
+            obj.__dict__.pop(name, None)
+        self._installed.clear()
+
+    def _wrap(self, method, histogram):
+        clock = time.perf_counter_ns
+
+        @functools.wraps(method)
+        def wrapper(*args, **kwargs):
+            if not self.enabled:
+                return method(*args, **kwargs)
+            start = clock()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                histogram.record(clock() - start)
+        return wrapper
+
+    def reset(self):
+        for histogram in self.histograms.values():
+            histogram.reset()
+
+    def summary(self):
+        return {name: histogram.summary() for name, histogram in self.histograms.items()}
+
+    def dump(self, path):
+        data = {name: dict(histogram.summary(), buckets=histogram.buckets())
+                for name, histogram in self.histograms.items()}
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({"time": time.strftime("%Y-%m-%d %H:%M:%S"), "handlers": data}, f, indent=2)
@@ -0,0 +1,183 @@
+"""Обратная кинематика манипулятора ARM-IMR-165 для перемещения инструмента по X/Y.
+
+Решатель - демпфированный метод наименьших квадратов по якобиану (DLS) для
+первых четырёх суставов (стойка и три звена), остальные суставы не меняются.
+Решение начинается с текущих углов, так что соседние точки при пошаговом
+перемещении сходятся за несколько итераций. LRU-кэш по квантованной цели
+хранит недавние решения: повторный шаг в уже пройденную точку начинается
+с готового решения. solve_path решает целый путь за один вызов: каждая
+точка начинается с решения предыдущей (результат - массивы numpy). Маска
+суставов закрепляет суставы, которые решатель не должен двигать.
+"""
+import collections
+import math
+
+from kinematics import SEGMENTS
+
+ANGLE_MIN, ANGLE_MAX = 0.0, 180.0
+
+IKResult = collections.namedtuple('IKResult', 'angles converged iterations error')
+
+
+def _clamp(angle):
+    return min(ANGLE_MAX, max(ANGLE_MIN, angle))
+
+
+class IKSolver:
+    def __init__(self, tolerance=0.1, max_iterations=100, damping=0.5, max_step=10.0,
+                 cache_size=256, resolution=0.5, seed_distance=15.0):
+        self.tolerance = tolerance  # допустимая ошибка положения, единицы модели
+        self.max_iterations = max_iterations
+        self.damping = damping
+        self.max_step = max_step  # наибольшее изменение сустава за итерацию, градусы
+        self.cache_size = cache_size
+        self.resolution = resolution  # шаг квантования цели для кэша
+        self.seed_distance = seed_distance  # кэшированное решение дальше этого от текущих углов не берётся
+        self._cache = collections.OrderedDict()
+        self.solves = 0
+        self.iterations = 0
+        self.hits = 0
+        self.misses = 0
+
+    def _key(self, x, y):
+        return round(x / self.resolution), round(y / self.resolution)
+
+    def _seed(self, key, current):
+        seed = self._cache.get(key)
+        if seed is not None and max(abs(a - b) for a, b in zip(seed, current)) <= self.seed_distance:
+            self._cache.move_to_end(key)
+            self.hits += 1
+            return list(seed)
+        self.misses += 1
+        return list(current)
+
+    def _remember(self, key, q):
+        self._cache[key] = tuple(q)
+        self._cache.move_to_end(key)
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    def _step(self, jx, jy, ex, ey, damping2):
+        """dq = J^T (J J^T + λ²I)^-1 e с ограничением наибольшего шага"""
+        a = sum(v * v for v in jx) + damping2
+        b = sum(u * v for u, v in zip(jx, jy))
+        d = sum(v * v for v in jy) + damping2
+        det = a * d - b * b
+        fx = (d * ex - b * ey) / det
+        fy = (a * ey - b * ex) / det
+        step = [u * fx + v * fy for u, v in zip(jx, jy)]
+        largest = max(abs(s) for s in step)
+        if largest > self.max_step:
+            step = [s * self.max_step / largest for s in step]
+        return step
+
+    def _free(self, mask):
+        """Суставы, которые может двигать решатель: mask[i] ложно - сустав закреплён"""
+        links = len(SEGMENTS)
+        if mask is None:
+            return [True] * links
+        return [bool(m) for m in mask[:links]]
+
+    def _iterate(self, tx, ty, q, free, max_iterations):
+        """Итерации DLS от углов q; возвращает (углы, ошибка, итераций)"""
+        links = len(SEGMENTS)
+        scale = math.pi / 180
+        damping2 = self.damping * self.damping
+
+        error = best = float('inf')
+        stalls = 0
+        iterations = 0
+        while True:
+            # Прямая кинематика: начала звеньев и конец цепи
+            xs, ys = [0.0] * links, [0.0] * links
+            x = y = total = 0.0
+            for i in range(links):
+                xs[i], ys[i] = x, y
+                total += q[i] * scale
+                x += SEGMENTS[i] * math.cos(total)
+                y += SEGMENTS[i] * math.sin(total)
+            ex, ey = tx - x, ty - y
+            error = math.hypot(ex, ey)
+            if error < best * 0.999:
+                best, stalls = error, 0
+            else:
+                stalls += 1
+            # Остановка по точности, по числу итераций или когда ошибка перестала уменьшаться
+            if error <= self.tolerance or iterations >= max_iterations or stalls >= 3:
+                break
+            iterations += 1
+
+            # Якобиан 2 x links в единицах модели на градус; у закреплённых суставов столбец нулевой
+            jx = [-(y - ys[i]) * scale if free[i] else 0.0 for i in range(links)]
+            jy = [(x - xs[i]) * scale if free[i] else 0.0 for i in range(links)]
+            step = self._step(jx, jy, ex, ey, damping2)
+            # Суставы, упёртые в ограничение, исключаются из якобиана, движение берут остальные
+            for _ in range(links):
+                blocked = [i for i in range(links)
+                           if step[i] and not ANGLE_MIN <= q[i] + step[i] <= ANGLE_MAX]
+                if not blocked:
+                    break
+                for i in blocked:
+                    jx[i] = jy[i] = 0.0
+                step = self._step(jx, jy, ex, ey, damping2)
+            q = [_clamp(a + s) for a, s in zip(q, step)]
+        return q, error, iterations
+
+    def solve(self, target, joint_angles, mask=None):
+        """Углы, переводящие фланец в target = (x, y) в координатах модели.
+
+        mask - суставы, которые можно двигать (по одному значению на сустав);
+        закреплённые остаются как в joint_angles. С маской кэш не используется.
+        """
+        tx, ty = target
+        links = len(SEGMENTS)
+        free = self._free(mask)
+        current = [float(a) for a in joint_angles[:links]]
+        cached = all(free)
+        key = self._key(tx, ty)
+        q = self._seed(key, current) if cached else current
+        self.solves += 1
+
+        q, error, iterations = self._iterate(tx, ty, q, free, self.max_iterations)
+        self.iterations += iterations
+        converged = error <= self.tolerance
+        if converged and cached:
+            self._remember(key, q)
+        return IKResult(q + [float(a) for a in joint_angles[links:]], converged, iterations, error)
+
+    def solve_path(self, targets, joint_angles, max_iterations=None, mask=None):
+        """Решение для массива целей формы (N, 2) по порядку точек пути.
+
+        Точка i начинается с решения точки i-1 (первая - с joint_angles), так
+        что соседние точки плотного пути сходятся за доли итерации и остаются
+        на одной ветви решения. mask - как в solve(). Возвращает IKResult с
+        angles формы (N, 6), converged и error формы (N,) и суммой итераций.
+        """
+        import numpy as np
+
+        targets = np.asarray(targets, dtype=np.float64).reshape(-1, 2)
+        links = len(SEGMENTS)
+        free = self._free(mask)
+        max_iterations = max_iterations or self.max_iterations
+        rest = [float(a) for a in joint_angles[links:]]
+        q = [float(a) for a in joint_angles[:links]]
+        solutions, errors = [], []
+
+        total = 0
+        for tx, ty in targets.tolist():
+            q, error, iterations = self._iterate(tx, ty, q, free, max_iterations)
+            solutions.append(q + rest)
+            errors.append(error)
+            total += iterations
+        self.solves += len(errors)
+        self.iterations += total
+        angles = np.array(solutions, dtype=np.float64).reshape(-1, len(joint_angles))
+        error = np.array(errors, dtype=np.float64)
+        return IKResult(angles, error <= self.tolerance, total, error)
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {"solves": self.solves,
+                "avg_iterations": self.iterations / self.solves if self.solves else 0.0,
+                "cache_hits": self.hits,
+                "hit_ratio": self.hits / lookups if lookups else 0.0}
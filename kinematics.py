@@ -0,0 +1,130 @@
+"""Прямая кинематика манипулятора ARM-IMR-165.
+
+Координаты модели: начало в центре основания, ось Y направлена вверх.
+Для холста Tk координаты переводятся функцией to_canvas.
+Пакетный расчёт (forward_kinematics_batch) требует numpy.
+"""
+import math
+
+BASE_RADIUS = 50
+BASE_HEIGHT = 20  # полувысота основания; низ основания - линия пола
+FLOOR_Y = -BASE_HEIGHT
+LINK_LENGTHS = [80, 120, 80, 40]
+# Отрезки цепи от основания до фланца: стойка длиной BASE_RADIUS и три звена
+SEGMENTS = [BASE_RADIUS] + LINK_LENGTHS[:3]
+GRIPPER_OPEN, GRIPPER_CLOSED = 60, 30
+
+
+def forward_kinematics(joint_angles):
+    """Точки суставов (включая основание) и угол инструмента для одной позы в градусах"""
+    points = [(0.0, 0.0)]
+    x = y = total = 0.0
+    for length, angle in zip(SEGMENTS, joint_angles):
+        total += math.radians(angle)
+        x += length * math.cos(total)
+        y += length * math.sin(total)
+        points.append((x, y))
+    tool_angle = total + sum(math.radians(a) for a in joint_angles[len(SEGMENTS):])
+    return points, tool_angle
+
+
+def gripper_fingers(tip, tool_angle, closed):
+    """Концы губок захвата"""
+    width = GRIPPER_CLOSED if closed else GRIPPER_OPEN
+    x, y = tip
+    return [(x + width * math.cos(tool_angle + side), y + width * math.sin(tool_angle + side))
+            for side in (math.pi / 2, -math.pi / 2)]
+
+
+def to_canvas(points, x0, y0, scale=1.0):
+    """Перевод точек модели в координаты холста с основанием в (x0, y0)"""
+    if scale != 1.0:
+        return [(x0 + x * scale, y0 - y * scale) for x, y in points]
+    return [(x0 + x, y0 - y) for x, y in points]
+
+
+def forward_kinematics_batch(angles, degrees=True):
+    """Прямая кинематика для массива поз формы (N, 6).
+
+    Возвращает (points, tool_angle): points формы (N, 5, 2) - основание, суставы
+    и фланец; tool_angle формы (N,) - угол инструмента в радианах.
+    """
+    import numpy as np
+
+    angles = np.asarray(angles, dtype=np.float64)
+    if angles.ndim == 1:
+        angles = angles[np.newaxis, :]
+    if degrees:
+        angles = np.radians(angles)
+
+    links = len(SEGMENTS)
+    theta = np.cumsum(angles, axis=1)
+    points = np.zeros((angles.shape[0], links + 1, 2))
+    segments = np.asarray(SEGMENTS, dtype=np.float64)
+    np.cumsum(segments * np.cos(theta[:, :links]), axis=1, out=points[:, 1:, 0])
+    np.cumsum(segments * np.sin(theta[:, :links]), axis=1, out=points[:, 1:, 1])
+    return points, theta[:, -1]
+
+
+class KinematicChain:
+    """Цепь с кэшем префиксных преобразований.
+
+    Изменение сустава idx сбрасывает кэш только начиная с idx; звенья выше по цепи
+    берутся из кэша. Счётчики reused / recomputed показывают экономию.
+    """
+
+    def __init__(self, joint_angles=None):
+        self.angles = list(joint_angles) if joint_angles is not None else [0] * 6
+        links = len(SEGMENTS)
+        self._theta = [0.0] * links
+        self._points = [(0.0, 0.0)] * (links + 1)
+        self._valid = 0  # число звеньев с актуальным кэшем
+        self._tool_angle = None
+        self.reused = 0
+        self.recomputed = 0
+
+    def set_angle(self, idx, angle):
+        if self.angles[idx] == angle:
+            return
+        self.angles[idx] = angle
+        self._valid = min(self._valid, idx)
+        self._tool_angle = None
+
+    def set_angles(self, angles):
+        for idx, angle in enumerate(angles):
+            self.set_angle(idx, angle)
+
+    def update(self):
+        links = len(SEGMENTS)
+        valid = self._valid
+        self.reused += valid
+        self.recomputed += links - valid
+        if valid < links:
+            x, y = self._points[valid]
+            total = self._theta[valid - 1] if valid else 0.0
+            for i in range(valid, links):
+                total += math.radians(self.angles[i])
+                x += SEGMENTS[i] * math.cos(total)
+                y += SEGMENTS[i] * math.sin(total)
+                self._theta[i] = total
+                self._points[i + 1] = (x, y)
+            self._valid = links
+        if self._tool_angle is None:
+            self._tool_angle = self._theta[-1] + sum(math.radians(a) for a in self.angles[links:])
+
+    @property
+    def points(self):
+        """Точки суставов от основания до фланца (координаты модели)"""
+        self.update()
+        return self._points
+
+    @property
+    def tool_angle(self):
+        if self._valid < len(SEGMENTS) or self._tool_angle is None:
+            self.update()
+        return self._tool_angle
+
+    def stats(self):
+        total = self.reused + self.recomputed
+        return {"reused": self.reused, "recomputed": self.recomputed,
+                "reuse_ratio": self.reused / total if total else 0.0}
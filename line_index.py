@@ -0,0 +1,336 @@
+"""Чтение больших текстовых файлов (журналы, positions.json) по номеру строки.
+
+Файл читается через mmap, рядом хранится индекс <файл>.lines: заголовок и
+смещения концов строк (uint64). При открытии индекс проверяется по размеру и
+контрольной сумме начала файла; если файл вырос, индексируется только
+дописанная часть (refresh), если обрезан или заменён ротацией - индекс
+строится заново. Запись на месте того же размера узнаётся по st_mtime_ns,
+замена файла - по st_ino. Строка N, хвост и обратный проход - O(1) на
+строку, без чтения файла целиком. Поиск переводов строк идёт кусками через
+numpy, без него - через mmap.find.
+
+Индекс не следит за файлом сам: перед чтением после возможных изменений
+вызывайте refresh(). Если файл обрезали после последнего refresh()
+(copytruncate), чтение через mmap за новым концом файла убило бы процесс
+SIGBUS, поэтому перед чтением проверяется текущий размер и бросается
+StaleIndexError.
+
+Запуск: python line_index.py <файл> [--tail 10] [--line N] [--reverse] [--follow]
+"""
+import argparse
+import mmap
+import os
+import struct
+import sys
+import time
+import zlib
+from array import array
+
+# Метка, CRC32 начала файла, проиндексировано байт, строк, st_ino и st_mtime_ns файла
+INDEX_HEADER = struct.Struct('<4sIQQQq')
+INDEX_MAGIC = b'LIX2'
+OFFSET = struct.Struct('<Q')
+PREFIX = 4096  # байт начала файла под контрольную сумму
+CHUNK = 64 << 20
+BLOCK = 1024  # строк за одно чтение при итерации
+
+
+class StaleIndexError(Exception):
+    """Файл изменился после последнего refresh()"""
+
+
+def _newlines(buf, start, end):
+    """Смещения за каждым переводом строки в buf[start:end] (array 'Q')"""
+    ends = array('Q')
+    try:
+        import numpy as np
+    except ImportError:
+        find = buf.find
+        pos = find(b'\n', start, end)
+        while pos >= 0:
+            ends.append(pos + 1)
+            pos = find(b'\n', pos + 1, end)
+        return ends
+    for offset in range(start, end, CHUNK):
+        count = min(CHUNK, end - offset)
+        view = np.frombuffer(buf, np.uint8, count, offset)
+        found = np.flatnonzero(view == 10).astype('<u8')
+        found += offset + 1
+        ends.frombytes(found.tobytes())
+        # Ссылка numpy на mmap не даст закрыть его при следующем remap
+        del view
+    return ends
+
+
+class LineIndex:
+    def __init__(self, path, encoding='utf-8', save=True):
+        self.path = path
+        self.index_path = path + ".lines"
+        self.encoding = encoding
+        self.save = save  # False или индекс не записать - смещения только в памяти
+        self.size = 0  # проиндексировано байт
+        self._prefix_crc = 0  # CRC32 начала файла на момент индексации
+        self._stat = None  # (st_ino, st_size, st_mtime_ns) на момент индексации
+        self._file = None  # открыт, пока жив _map: по нему проверяется размер перед чтением
+        self._map = None
+        self._index_map = None
+        self._stored = 0  # строк в файле индекса
+        self._ends = array('Q')  # смещения, ещё не записанные в файл индекса
+        self._remap()
+        if not self._load_index():
+            self._reset_index()
+        self.refresh()
+
+    # --- Файл данных ---
+
+    def _remap(self):
+        """Отобразить файл заново; возвращает os.stat открытого файла"""
+        self._unmap()
+        self._file = open(self.path, 'rb')
+        st = os.fstat(self._file.fileno())
+        if st.st_size:
+            self._map = mmap.mmap(self._file.fileno(), st.st_size, access=mmap.ACCESS_READ)
+        return st
+
+    def _unmap(self):
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _check_mapped(self):
+        """Отображённая часть файла ещё существует (файл не обрезан после refresh)"""
+        if self._file is not None and os.fstat(self._file.fileno()).st_size < self.size:
+            raise StaleIndexError(f"{self.path}: файл обрезан, нужен refresh()")
+
+    def _crc(self, size):
+        return zlib.crc32(self._map[:min(PREFIX, size)]) if size else 0
+
+    # --- Индекс ---
+
+    def _load_index(self):
+        try:
+            with open(self.index_path, 'rb') as f:
+                magic, crc, size, lines, ino, mtime = INDEX_HEADER.unpack(f.read(INDEX_HEADER.size))
+                index_map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError, struct.error):
+            return False
+        st = self._stat_now
+        # Тот же размер с другим временем изменения - запись на месте
+        valid = (magic == INDEX_MAGIC and ino == st.st_ino and size <= st.st_size
+                 and (size < st.st_size or mtime == st.st_mtime_ns)
+                 and len(index_map) >= INDEX_HEADER.size + 8 * lines and crc == self._crc(size))
+        if valid and lines:
+            # Последняя проиндексированная строка должна по-прежнему кончаться переводом строки
+            end = OFFSET.unpack_from(index_map, INDEX_HEADER.size + 8 * (lines - 1))[0]
+            valid = 0 < end <= size and self._map[end - 1] == 10
+        if not valid:
+            index_map.close()
+            return False
+        self._index_map, self._stored, self.size, self._prefix_crc = index_map, lines, size, crc
+        self._stat = (ino, size, mtime)
+        return True
+
+    def _reset_index(self):
+        if self._index_map is not None:
+            self._index_map.close()
+            self._index_map = None
+        self._stored, self.size, self._prefix_crc, self._stat = 0, 0, 0, None
+        self._ends = array('Q')
+        if self.save:
+            try:
+                with open(self.index_path, 'wb') as f:
+                    f.write(INDEX_HEADER.pack(INDEX_MAGIC, 0, 0, 0, 0, 0))
+            except OSError:
+                self.save = False
+
+    def _store(self, ends, st):
+        """Дописать смещения в файл индекса; заголовок пишется последним"""
+        size = st.st_size
+        try:
+            with open(self.index_path, 'r+b') as f:
+                f.seek(INDEX_HEADER.size + 8 * self._stored)
+                ends.tofile(f)
+                f.seek(0)
+                f.write(INDEX_HEADER.pack(INDEX_MAGIC, self._crc(size), size, self._stored + len(ends),
+                                          st.st_ino, st.st_mtime_ns))
+                f.flush()
+                if self._index_map is not None:
+                    self._index_map.close()
+                self._index_map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except OSError:
+            self.save = False
+            self._ends.extend(ends)
+            return
+        self._stored += len(ends)
+
+    @property
+    def _stat_now(self):
+        return os.fstat(self._file.fileno())
+
+    def refresh(self):
+        """Проиндексировать изменения файла; возвращает число новых строк.
+
+        Вызывать перед чтением, если файл мог измениться: после обрезки без
+        refresh() чтение бросает StaleIndexError.
+        """
+        st = os.stat(self.path)
+        if (st.st_ino, st.st_size, st.st_mtime_ns) == self._stat:
+            return 0
+        st = self._remap()
+        if not self._unchanged(st):
+            # Файл обрезан, переписан или заменён (ротация журнала)
+            self._reset_index()
+        before = self.lines
+        size = st.st_size
+        if size > self.size:
+            ends = _newlines(self._map, self.size, size)
+            if self.save and not self._ends:
+                self._store(ends, st)
+            else:
+                self._ends.extend(ends)
+            self.size = size
+            self._prefix_crc = self._crc(size)
+        self._stat = (st.st_ino, st.st_size, st.st_mtime_ns)
+        return self.lines - before
+
+    def _unchanged(self, st):
+        """Проиндексированная часть файла на месте: тот же файл не короче, начало и конец последней строки"""
+        if self._stat is None:
+            return True
+        ino, size, mtime = self._stat
+        if st.st_ino != ino or st.st_size < size or (st.st_size == size and st.st_mtime_ns != mtime):
+            return False
+        if self._crc(self.size) != self._prefix_crc:
+            return False
+        return not self.lines or self._map[self._end(self.lines - 1) - 1] == 10
+
+    @property
+    def lines(self):
+        """Число полных строк (с переводом строки)"""
+        return self._stored + len(self._ends)
+
+    def _end(self, n):
+        if n < self._stored:
+            return OFFSET.unpack_from(self._index_map, INDEX_HEADER.size + 8 * n)[0]
+        return self._ends[n - self._stored]
+
+    # --- Чтение строк ---
+
+    def __len__(self):
+        """Строк с учётом недописанной последней"""
+        lines = self.lines
+        last = self._end(lines - 1) if lines else 0
+        return lines + (self.size > last)
+
+    def raw(self, n):
+        """Строка n без перевода строки, bytes; отрицательные n - с конца"""
+        self._check_mapped()
+        count = len(self)
+        if n < 0:
+            n += count
+        if not 0 <= n < count:
+            raise IndexError("номер строки вне файла")
+        start = self._end(n - 1) if n else 0
+        if n < self.lines:
+            stop = self._end(n) - 1
+            if stop > start and self._map[stop - 1] == 13:
+                stop -= 1
+        else:
+            stop = self.size
+        return self._map[start:stop]
+
+    def __getitem__(self, n):
+        return self.raw(n).decode(self.encoding, 'replace')
+
+    def _block(self, start, stop):
+        """Строки start..stop-1 (bytes) одним срезом map сразу после проверки размера"""
+        self._check_mapped()
+        if start >= stop:
+            return []
+        lo = self._end(start - 1) if start else 0
+        complete = stop <= self.lines
+        hi = self._end(stop - 1) if complete else self.size
+        lines = self._map[lo:hi].split(b'\n')
+        if complete:
+            lines.pop()  # пусто после последнего перевода строки
+        last = len(lines) if complete else len(lines) - 1
+        return [line[:-1] if i < last and line.endswith(b'\r') else line for i, line in enumerate(lines)]
+
+    def read(self, start, stop):
+        """Строки start..stop-1 одним списком"""
+        start, stop, _ = slice(start, stop).indices(len(self))
+        encoding = self.encoding
+        return [line.decode(encoding, 'replace') for line in self._block(start, stop)]
+
+    def tail(self, count=10):
+        return self.read(max(0, len(self) - count), len(self))
+
+    def reverse(self, start=None):
+        """Строки от start (по умолчанию последней) к началу файла"""
+        stop = len(self) if start is None else start + 1
+        while stop > 0:
+            lo = max(0, stop - BLOCK)
+            yield from reversed(self.read(lo, stop))
+            stop = lo
+
+    def __iter__(self):
+        for lo in range(0, len(self), BLOCK):
+            yield from self.read(lo, lo + BLOCK)
+
+    def close(self):
+        self._unmap()
+        if self._index_map is not None:
+            self._index_map.close()
+            self._index_map = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Строки большого файла по индексу")
+    parser.add_argument("path")
+    parser.add_argument("--tail", type=int, default=10, help="последние N строк")
+    parser.add_argument("--line", type=int, nargs="+", help="строки с данными номерами (с 0, отрицательные - с конца)")
+    parser.add_argument("--reverse", action="store_true", help="последние --tail строк от конца к началу")
+    parser.add_argument("--follow", action="store_true", help="после хвоста ждать новые строки")
+    parser.add_argument("--no-save", action="store_true", help="не записывать индекс рядом с файлом")
+    options = parser.parse_args()
+
+    start = time.perf_counter()
+    index = LineIndex(options.path, save=not options.no_save)
+    print(f"{options.path}: строк {len(index)}, индекс {(time.perf_counter() - start) * 1000:.1f} мс",
+          file=sys.stderr)
+    try:
+        if options.line:
+            for n in options.line:
+                print(index[n])
+        elif options.reverse:
+            for _, line in zip(range(options.tail), index.reverse()):
+                print(line)
+        else:
+            for line in index.tail(options.tail):
+                print(line)
+        shown = len(index)
+        while options.follow:
+            time.sleep(0.5)
+            # Выводятся только дописанные до конца строки
+            index.refresh()
+            for n in range(shown, index.lines):
+                print(index[n])
+            shown = max(shown, index.lines)
+            sys.stdout.flush()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        index.close()
+
+
+if __name__ == "__main__":
+    main()
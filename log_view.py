@@ -0,0 +1,150 @@
+"""Панель логов с ограниченной памятью.
+
+Последние записи хранятся в кольцевом буфере фиксированного размера, в виджет
+выводится только видимое окно строк. Записи добавляются пачками (раз в кадр),
+поддерживается фильтр по уровню и по тексту.
+"""
+import collections
+import itertools
+import logging
+import tkinter as tk
+from tkinter import ttk
+import tkinter.font as tkfont
+
+LEVELS = [("Все", logging.NOTSET), ("DEBUG", logging.DEBUG), ("INFO", logging.INFO),
+          ("WARNING", logging.WARNING), ("ERROR", logging.ERROR), ("CRITICAL", logging.CRITICAL)]
+LEVEL_COLORS = {"WARNING": "orange", "ERROR": "red", "CRITICAL": "red"}
+
+
+class LogView:
+    def __init__(self, parent, capacity=5000, width=80, height=15):
+        self.capacity = capacity
+        self.records = collections.deque(maxlen=capacity)  # (levelno, строка)
+        self._filtered = None  # None - фильтр выключен, иначе deque отобранных записей
+        self.level = logging.NOTSET
+        self.pattern = ""
+        self.rows = height
+        self.follow = True  # держать вид в конце
+        self.start = 0  # первая видимая строка, когда follow выключен
+        self.renders = 0
+        self._linespace = None
+
+        # Фильтры
+        toolbar = ttk.Frame(parent)
+        toolbar.pack(fill=tk.X, pady=(0, 5))
+        ttk.Label(toolbar, text="Уровень:").pack(side=tk.LEFT)
+        self.level_var = tk.StringVar(value=LEVELS[0][0])
+        level_box = ttk.Combobox(toolbar, textvariable=self.level_var, values=[name for name, _ in LEVELS],
+                                 state="readonly", width=10)
+        level_box.pack(side=tk.LEFT, padx=5)
+        level_box.bind("<<ComboboxSelected>>", lambda e: self._apply_filter())
+        ttk.Label(toolbar, text="Поиск:").pack(side=tk.LEFT)
+        self.pattern_var = tk.StringVar()
+        entry = ttk.Entry(toolbar, textvariable=self.pattern_var)
+        entry.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=5)
+        entry.bind("<KeyRelease>", lambda e: self._apply_filter())
+
+        # Текст показывает только видимое окно, прокрутка своя
+        body = ttk.Frame(parent)
+        body.pack(fill=tk.BOTH, expand=True)
+        self.scrollbar = ttk.Scrollbar(body, orient=tk.VERTICAL, command=self._on_scroll)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.text = tk.Text(body, width=width, height=height, wrap=tk.NONE, state='disabled')
+        self.text.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        for level, color in LEVEL_COLORS.items():
+            self.text.tag_configure(level, foreground=color)
+        self.text.bind("<Configure>", self._on_resize)
+        self.text.bind("<MouseWheel>", lambda e: self.scroll(-1 if e.delta > 0 else 1))
+        self.text.bind("<Button-4>", lambda e: self.scroll(-1))
+        self.text.bind("<Button-5>", lambda e: self.scroll(1))
+
+    def _match(self, record):
+        levelno, line = record
+        return levelno >= self.level and self.pattern in line
+
+    def _view(self):
+        return self.records if self._filtered is None else self._filtered
+
+    def append(self, records):
+        """Добавить пачку записей (levelno, строка) и перерисовать окно"""
+        view = self._view()
+        before = len(view)
+        self.records.extend(records)
+        if self._filtered is not None:
+            records = [r for r in records if self._match(r)]
+            self._filtered.extend(records)
+        # Пока пользователь смотрит в середину, вытесненные из буфера строки сдвигают окно
+        added = len(records)
+        evicted = max(0, before + added - view.maxlen)
+        if evicted and not self.follow:
+            self.start = max(0, self.start - evicted)
+        self.render()
+
+    def _apply_filter(self):
+        self.level = dict(LEVELS).get(self.level_var.get(), logging.NOTSET)
+        self.pattern = self.pattern_var.get()
+        if self.level == logging.NOTSET and not self.pattern:
+            self._filtered = None
+        else:
+            self._filtered = collections.deque((r for r in self.records if self._match(r)), maxlen=self.capacity)
+        self.follow = True
+        self.render()
+
+    def set_filter(self, level=logging.NOTSET, pattern=""):
+        self.level_var.set(next(name for name, value in LEVELS if value == level))
+        self.pattern_var.set(pattern)
+        self._apply_filter()
+
+    def visible_lines(self):
+        view = self._view()
+        total = len(view)
+        if self.follow or total <= self.rows:
+            start = max(0, total - self.rows)
+        else:
+            start = min(self.start, total - self.rows)
+        self.start = start
+        if start >= total // 2:
+            # Конец ближе: идём с хвоста, чтобы не проходить весь буфер
+            tail = list(itertools.islice(reversed(view), total - start))
+            return start, tail[::-1][:self.rows]
+        return start, list(itertools.islice(view, start, start + self.rows))
+
+    def render(self):
+        start, lines = self.visible_lines()
+        args = []
+        for levelno, line in lines:
+            args += [line + "\n", logging.getLevelName(levelno)]
+        self.text.configure(state='normal')
+        self.text.delete("1.0", tk.END)
+        if args:
+            self.text.insert(tk.END, *args)
+        self.text.configure(state='disabled')
+        total = len(self._view())
+        if total:
+            self.scrollbar.set(start / total, min(1.0, (start + self.rows) / total))
+        else:
+            self.scrollbar.set(0.0, 1.0)
+        self.renders += 1
+
+    def scroll(self, lines):
+        total = len(self._view())
+        self.start = max(0, min(self.start + lines, total - self.rows))
+        self.follow = self.start >= total - self.rows
+        self.render()
+
+    def _on_scroll(self, action, value, unit=None):
+        total = len(self._view())
+        if action == "moveto":
+            self.start = max(0, min(int(float(value) * total), total - self.rows))
+            self.follow = self.start >= total - self.rows
+            self.render()
+        elif action == "scroll":
+            self.scroll(int(value) * (self.rows if unit == "pages" else 1))
+
+    def _on_resize(self, event):
+        if self._linespace is None:
+            self._linespace = tkfont.Font(font=self.text.cget("font")).metrics("linespace")
+        rows = max(1, event.height // self._linespace)
+        if rows != self.rows:
+            self.rows = rows
+            self.render()
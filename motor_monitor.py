@@ -0,0 +1,121 @@
+"""Опрос моторов манипулятора без интерфейса.
+
+MotorMonitor читает датчики температуры, проверяет каждый отсчёт сторожевым
+таймером (safety_watchdog.py) и раз в кадр телеметрии пишет температуры и
+положения суставов в TelemetryStore, историю и потоковую статистику. Кадр
+передаётся слушателям listeners(время, температуры, углы) в потоке опроса:
+окну, рассылке телеметрии, ячейке.
+
+Опрос идёт своим потоком (start/stop) или шагами внешнего планировщика:
+tick() - как в потоке, sample() - кадр без проверки времени (TimerWheel ячейки).
+
+При срабатывании сторожевого таймера движение блокируется сразу
+(RobotCore.trip), а аварию объявляет on_trip(причина): окно переносит её в
+поток Tk. Без on_trip вызывается RobotCore.emergency_stop в потоке опроса.
+"""
+import math
+import random
+import threading
+import time
+
+from robot_core import ACTIVE_STATES
+from rolling_stats import RollingStats
+from safety_watchdog import Watchdog, describe as describe_trip
+from telemetry import TelemetryStore
+from telemetry_history import TelemetryHistory
+
+
+class MotorMonitor:
+    POLL_INTERVAL = 0.05  # опрос датчиков для сторожевого таймера, с
+    FRAME_INTERVAL = 1.0  # кадр телеметрии, с
+
+    def __init__(self, core, telemetry=None, on_trip=None, limit=60.0, hysteresis=5.0, max_rise=None,
+                 windows=None, tau=10.0, retention=None):
+        self.core = core
+        self.motors = len(core.joint_angles)
+        # Хранилище может быть общим для нескольких манипуляторов
+        self.telemetry = telemetry or TelemetryStore(axes=0)
+        self.axes = self.telemetry.allocate(self.motors)
+        self.on_trip = on_trip or core.emergency_stop
+        self.watchdog = Watchdog(self._on_watchdog_trip, motors=self.motors, limit=limit,
+                                 hysteresis=hysteresis, max_rise=max_rise)
+        # История и окна статистики нужны монитору окна, ячейке хватает последнего кадра
+        self.history = TelemetryHistory(self.motors, retention=retention) if retention else None
+        self.stats = RollingStats(self.motors, windows=windows, tau=tau) if windows else None
+        self.listeners = []
+        self._next_frame = 0.0
+        self._stop = threading.Event()
+        self._thread = None
+        core.subscribe(self._on_core_event)
+
+    def read_temperature(self, motor):
+        """Температура двигателя, °C (имитация датчика)"""
+        return random.uniform(25.0, 45.0)
+
+    def poll(self):
+        """Опрос между кадрами телеметрии: только сторожевой таймер"""
+        watchdog = self.watchdog
+        for i in range(self.motors):
+            watchdog.feed(i, self.read_temperature(i), time.monotonic())
+
+    def sample(self):
+        """Кадр телеметрии: все датчики, хранилище, история, статистика и слушатели"""
+        angles = self.core.joint_angles
+        watchdog = self.watchdog
+        with self.telemetry.writing() as frame:
+            for i, axis in enumerate(self.axes):
+                temp = self.read_temperature(i)
+                # Отсчёт проверяется сразу, не дожидаясь остальных моторов
+                watchdog.feed(i, temp, time.monotonic())
+                frame.temp[axis] = temp
+                frame.position_ticks[axis] = int(angles[i] * 10)
+                frame.position_rad[axis] = math.radians(angles[i])
+                frame.position_deg[axis] = angles[i]
+            temps = [frame.temp[axis] for axis in self.axes]
+        now = time.time()
+        if self.history is not None:
+            self.history.add(now, temps)
+        if self.stats is not None:
+            self.stats.add(now, temps)
+        for listener in self.listeners:
+            listener(now, temps, angles)
+
+    def tick(self):
+        """Шаг опроса включённого манипулятора: кадр раз в FRAME_INTERVAL, между ними poll()"""
+        if self.core.system_state not in ACTIVE_STATES:
+            return
+        now = time.monotonic()
+        if now >= self._next_frame:
+            self._next_frame = now + self.FRAME_INTERVAL
+            self.sample()
+        else:
+            self.poll()
+
+    def _run(self):
+        # Датчики опрашиваются часто, чтобы перегрев блокировал движение за POLL_INTERVAL
+        while not self._stop.is_set():
+            self.tick()
+            self._stop.wait(self.POLL_INTERVAL)
+
+    def start(self):
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="motor-monitor", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout=1)
+        self._thread = None
+
+    def _on_watchdog_trip(self, trip):
+        """Срабатывание в потоке опроса: сначала блокировка движения, потом авария у владельца"""
+        reason = describe_trip(trip)
+        if self.core.trip(reason):
+            self.on_trip(reason)
+
+    def _on_core_event(self, event, *args):
+        # Блокировка снята оператором: сторожевой таймер взводится заново
+        if event == "trip_cleared":
+            self.watchdog.reset()
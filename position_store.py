@@ -0,0 +1,300 @@
+"""Хранилище сохранённых позиций с индексами.
+
+Записи фиксированного размера в бинарном файле (positions.bin) читаются через
+mmap. Рядом лежит индекс (positions.idx): номера записей в порядке времени и в
+порядке имён, поиск и выборка по диапазону - двоичным поиском, O(log n).
+Запись идёт через постоянно открытый файл пачками; flush() и flush(sync=True)
+- явные точки сброса на диск. flush() пишет только данные: индекс в памяти
+пополняется при каждой записи, а файл индекса целиком переписывается при
+close() и при уплотнении, когда непроиндексированный в файле хвост дорастает до
+проиндексированной части. При открытии хвост за сохранённым индексом
+доиндексируется из данных. Поддерживается импорт и экспорт прежнего формата
+JSON lines (positions.json).
+
+Запуск: python position_store.py export positions.bin positions.json
+        python position_store.py import positions.json positions.bin
+"""
+import argparse
+import collections
+import json
+import mmap
+import os
+import struct
+import time
+from array import array
+
+RECORD = struct.Struct('<d6dB31s')  # время, 6 углов, захват, имя (UTF-8)
+INDEX_HEADER = struct.Struct('<4sQ')
+INDEX_MAGIC = b'PIDX'
+INDEX_COMPACT = 4096  # записей хвоста, после которых индекс переписывается и без close()
+TIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+Position = collections.namedtuple('Position', 'timestamp joints gripper name')
+
+
+def _encode_name(name):
+    data = name.encode('utf-8')[:31]
+    return data.decode('utf-8', 'ignore').encode('utf-8')
+
+
+class PositionStore:
+    def __init__(self, path="positions.bin", batch_size=256):
+        self.path = path
+        self.index_path = os.path.splitext(path)[0] + ".idx"
+        self.batch_size = batch_size
+        self._truncate_torn()
+        self._file = open(path, 'a+b')
+        self._map = None
+        self._flushed = 0  # записей на диске
+        self._indexed = 0  # записей, покрытых файлом индекса
+        self._pending = []  # упакованные, ещё не записанные
+        self._ts = array('d')  # время в порядке возрастания
+        self._by_time = array('q')  # номера записей в порядке времени
+        self._by_name = array('q')  # номера записей в порядке имён
+        self._remap()
+        if self._load_index():
+            for recno in range(self._indexed, self._flushed):
+                self._index(recno)
+        else:
+            self._rebuild_index()
+
+    # --- Чтение записей ---
+
+    def __len__(self):
+        return self._flushed + len(self._pending)
+
+    def _raw(self, recno):
+        if recno < self._flushed:
+            return RECORD.unpack_from(self._map, recno * RECORD.size)
+        return RECORD.unpack(self._pending[recno - self._flushed])
+
+    def get(self, recno):
+        ts, *rest = self._raw(recno)
+        joints, gripper, name = rest[:6], rest[6], rest[7]
+        return Position(ts, joints, bool(gripper), name.rstrip(b'\0').decode('utf-8'))
+
+    def _time(self, recno):
+        return self._raw(recno)[0]
+
+    def _name(self, recno):
+        return self._raw(recno)[8].rstrip(b'\0')
+
+    def _truncate_torn(self):
+        """Отрезать недописанную последнюю запись (обрыв записи на диск)"""
+        try:
+            size = os.path.getsize(self.path)
+        except OSError:
+            return
+        if size % RECORD.size:
+            os.truncate(self.path, size - size % RECORD.size)
+
+    def _remap(self):
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        size = os.fstat(self._file.fileno()).st_size
+        self._flushed = size // RECORD.size
+        if self._flushed:
+            self._map = mmap.mmap(self._file.fileno(), self._flushed * RECORD.size, access=mmap.ACCESS_READ)
+
+    # --- Индексы ---
+
+    def _name_position(self, name):
+        """Первая позиция в _by_name с именем не меньше name"""
+        lo, hi = 0, len(self._by_name)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._name(self._by_name[mid]) < name:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def _time_position(self, ts, right=False):
+        lo, hi = 0, len(self._ts)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._ts[mid] < ts or (right and self._ts[mid] == ts):
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def _index(self, recno):
+        # Записи обычно идут по времени, а имена часто повторяются или растут:
+        # тогда запись дописывается в конец индекса, без сдвига массива
+        ts = self._time(recno)
+        if not self._ts or ts >= self._ts[-1]:
+            self._ts.append(ts)
+            self._by_time.append(recno)
+        else:
+            i = self._time_position(ts, right=True)
+            self._ts.insert(i, ts)
+            self._by_time.insert(i, recno)
+        name = self._name(recno)
+        if not self._by_name or name >= self._name(self._by_name[-1]):
+            self._by_name.append(recno)
+            return
+        i = self._name_position(name)
+        while i < len(self._by_name) and self._name(self._by_name[i]) == name:
+            i += 1
+        self._by_name.insert(i, recno)
+
+    def _rebuild_index(self):
+        records = range(len(self))
+        by_time = sorted(records, key=self._time)
+        self._ts = array('d', (self._time(recno) for recno in by_time))
+        self._by_time = array('q', by_time)
+        self._by_name = array('q', sorted(records, key=lambda recno: (self._name(recno), recno)))
+
+    def _load_index(self):
+        try:
+            with open(self.index_path, 'rb') as f:
+                magic, count = INDEX_HEADER.unpack(f.read(INDEX_HEADER.size))
+                # Индекс может отставать от данных (flush без close), но не опережать их
+                if magic != INDEX_MAGIC or count > self._flushed:
+                    return False
+                self._ts.fromfile(f, count)
+                self._by_time.fromfile(f, count)
+                self._by_name.fromfile(f, count)
+        except (OSError, EOFError, struct.error):
+            self._ts, self._by_time, self._by_name = array('d'), array('q'), array('q')
+            return False
+        self._indexed = count
+        return True
+
+    def _save_index(self, sync=False):
+        """Переписать файл индекса; вызывается после записи данных (без _pending)"""
+        tmp = self.index_path + ".tmp"
+        with open(tmp, 'wb') as f:
+            f.write(INDEX_HEADER.pack(INDEX_MAGIC, len(self._ts)))
+            self._ts.tofile(f)
+            self._by_time.tofile(f)
+            self._by_name.tofile(f)
+            if sync:
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(tmp, self.index_path)
+        self._indexed = len(self._ts)
+
+    # --- Запись ---
+
+    def append(self, joints, gripper, name="", timestamp=None):
+        ts = time.time() if timestamp is None else timestamp
+        joints = [float(a) for a in joints]
+        self._pending.append(RECORD.pack(ts, *joints, int(bool(gripper)), _encode_name(name)))
+        recno = len(self) - 1
+        self._index(recno)
+        if len(self._pending) >= self.batch_size:
+            self.flush()
+        return recno
+
+    def flush(self, sync=False):
+        """Записать накопленные данные; sync=True дополнительно делает fsync.
+
+        Файл индекса переписывается, только когда хвост за ним дорос до
+        INDEX_COMPACT записей и до размера проиндексированной части: так
+        стоимость перезаписи на одну запись остаётся постоянной.
+        """
+        if self._pending:
+            self._file.write(b''.join(self._pending))
+            self._pending.clear()
+            self._file.flush()
+            self._remap()
+        if sync:
+            os.fsync(self._file.fileno())
+        tail = self._flushed - self._indexed
+        if tail >= max(INDEX_COMPACT, self._indexed):
+            self._save_index(sync)
+
+    def close(self):
+        if self._file.closed:
+            return
+        self.flush(sync=True)
+        if self._indexed != self._flushed:
+            self._save_index(sync=True)
+        self._file.close()
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+
+    # --- Запросы ---
+
+    def find(self, name):
+        """Все записи с данным именем"""
+        key = _encode_name(name)
+        i = self._name_position(key)
+        result = []
+        while i < len(self._by_name) and self._name(self._by_name[i]) == key:
+            result.append(self.get(self._by_name[i]))
+            i += 1
+        return result
+
+    def range(self, start, end):
+        """Записи со временем start <= t <= end в порядке времени"""
+        lo = self._time_position(start)
+        hi = self._time_position(end, right=True)
+        return [self.get(self._by_time[i]) for i in range(lo, hi)]
+
+    def latest(self, count=1):
+        return [self.get(self._by_time[i]) for i in range(max(0, len(self._ts) - count), len(self._ts))]
+
+    def __iter__(self):
+        for recno in range(len(self)):
+            yield self.get(recno)
+
+    # --- Формат JSON lines ---
+
+    def import_jsonl(self, path):
+        """Импорт файла в формате прежнего save_position; возвращает число записей"""
+        count = 0
+        with open(path, encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                data = json.loads(line)
+                ts = time.mktime(time.strptime(data["timestamp"], TIME_FORMAT))
+                self.append(data["joints"], data["gripper"], data.get("name", ""), timestamp=ts)
+                count += 1
+        self.flush()
+        return count
+
+    def export_jsonl(self, path):
+        with open(path, 'w', encoding='utf-8') as f:
+            for i in range(len(self._by_time)):
+                position = self.get(self._by_time[i])
+                data = {"joints": [int(a) if a.is_integer() else a for a in position.joints],
+                        "gripper": position.gripper,
+                        "timestamp": time.strftime(TIME_FORMAT, time.localtime(position.timestamp))}
+                if position.name:
+                    data["name"] = position.name
+                json.dump(data, f)
+                f.write("\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Импорт и экспорт позиций в формате JSON lines")
+    parser.add_argument("command", choices=["export", "import"])
+    parser.add_argument("source")
+    parser.add_argument("target")
+    options = parser.parse_args()
+
+    if options.command == "export":
+        store = PositionStore(options.source)
+        try:
+            store.export_jsonl(options.target)
+            print(f"{options.target}: позиций {len(store)}")
+        finally:
+            store.close()
+    else:
+        store = PositionStore(options.target)
+        try:
+            count = store.import_jsonl(options.source)
+            print(f"{options.target}: импортировано {count}, всего {len(store)}")
+        finally:
+            store.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+"""Бинарный протокол сервера управления: кадры с длиной в заголовке.
+
+Заголовок '<BBH': маркер 0xA5, тип сообщения, длина данных. Данные упакованы
+struct. Приём идёт через recv_into в заранее выделенный bytearray, кадры
+разбираются срезами memoryview без промежуточных объектов bytes.
+Текстовый протокол (control_server.py) остаётся для отладки.
+"""
+import struct
+
+MAGIC = 0xA5
+HEADER = struct.Struct('<BBH')
+
+SET_JOINTS = 0x01  # 6 углов
+GRIPPER = 0x02  # 0 - открыт, 1 - закрыт
+STATE_QUERY = 0x03  # без данных
+STATE_REPLY = 0x04  # состояние (индекс в robot_core.STATES), захват, 6 углов, x, y
+TELEMETRY = 0x05  # время, 6 температур, 6 углов
+ACK = 0x06  # 0 - принято, 1 - ошибка, 2 - сервер занят
+
+PAYLOADS = {
+    SET_JOINTS: struct.Struct('<6f'),
+    GRIPPER: struct.Struct('<B'),
+    STATE_QUERY: struct.Struct('<'),
+    STATE_REPLY: struct.Struct('<BB6f2f'),
+    TELEMETRY: struct.Struct('<d6f6f'),
+    ACK: struct.Struct('<B'),
+}
+
+
+class ProtocolError(Exception):
+    pass
+
+
+def encode(kind, *values):
+    payload = PAYLOADS[kind]
+    return HEADER.pack(MAGIC, kind, payload.size) + payload.pack(*values)
+
+
+def encode_into(buffer, offset, kind, *values):
+    """Упаковать кадр прямо в буфер; возвращает смещение после кадра"""
+    payload = PAYLOADS[kind]
+    HEADER.pack_into(buffer, offset, MAGIC, kind, payload.size)
+    payload.pack_into(buffer, offset + HEADER.size, *values)
+    return offset + HEADER.size + payload.size
+
+
+def decode(kind, payload):
+    return PAYLOADS[kind].unpack(payload)
+
+
+class FrameParser:
+    """Разбор кадров из заранее выделенного буфера"""
+
+    def __init__(self, size=65536):
+        self.buffer = bytearray(size)
+        self.view = memoryview(self.buffer)
+        self.start = 0  # начало неразобранных данных
+        self.end = 0  # конец принятых данных
+
+    def free(self):
+        """Свободный хвост буфера для recv_into / BufferedProtocol.get_buffer"""
+        if self.start == self.end:
+            self.start = self.end = 0
+        elif len(self.buffer) - self.end < HEADER.size + 64:
+            # Недочитанный кадр переносится в начало буфера
+            remaining = self.end - self.start
+            self.buffer[:remaining] = self.view[self.start:self.end]
+            self.start, self.end = 0, remaining
+        return self.view[self.end:]
+
+    def feed(self, nbytes):
+        self.end += nbytes
+
+    def frames(self):
+        """Готовые кадры (тип, memoryview данных); данные действительны до следующего free()"""
+        buffer, view = self.buffer, self.view
+        while self.end - self.start >= HEADER.size:
+            magic, kind, length = HEADER.unpack_from(buffer, self.start)
+            if magic != MAGIC:
+                raise ProtocolError(f"неверный маркер кадра 0x{magic:02x}")
+            # Неизвестный тип отклоняет сервер, у известного длина данных фиксирована
+            expected = PAYLOADS.get(kind)
+            if expected is not None and length != expected.size:
+                raise ProtocolError(f"длина данных {length} для типа 0x{kind:02x}, нужно {expected.size}")
+            frame_end = self.start + HEADER.size + length
+            if frame_end > self.end:
+                if HEADER.size + length > len(buffer):
+                    raise ProtocolError("кадр больше буфера")
+                return
+            payload = view[self.start + HEADER.size:frame_end]
+            self.start = frame_end
+            yield kind, payload
+
+
+class FrameReader(FrameParser):
+    """Чтение кадров из блокирующего сокета через recv_into"""
+
+    def __init__(self, sock, size=65536):
+        super().__init__(size)
+        self.sock = sock
+
+    def receive(self):
+        nbytes = self.sock.recv_into(self.free())
+        if not nbytes:
+            raise ConnectionError("соединение закрыто")
+        self.feed(nbytes)
+
+    def read_frame(self):
+        while True:
+            for frame in self.frames():
+                return frame
+            self.receive()
+
+
+class BinaryClient:
+    """Блокирующий клиент бинарного протокола"""
+
+    def __init__(self, sock):
+        self.sock = sock
+        self.reader = FrameReader(sock)
+        self.out = bytearray(HEADER.size + max(p.size for p in PAYLOADS.values()))
+
+    def _send(self, kind, *values):
+        size = encode_into(self.out, 0, kind, *values)
+        self.sock.sendall(memoryview(self.out)[:size])
+
+    def set_joints(self, angles):
+        self._send(SET_JOINTS, *angles)
+
+    def set_gripper(self, closed):
+        self._send(GRIPPER, int(closed))
+
+    def query_state(self):
+        self._send(STATE_QUERY)
+
+    def read_reply(self):
+        kind, payload = self.reader.read_frame()
+        return kind, decode(kind, payload)
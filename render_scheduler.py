@@ -0,0 +1,78 @@
+"""Планировщик перерисовки с ограничением частоты кадров.
+
+Изменения модели только помечают её "грязной"; все изменения, пришедшие за один
+кадр, объединяются в одну перерисовку через master.after.
+"""
+import time
+
+
+class RenderScheduler:
+    def __init__(self, master, render, fps=60):
+        self.master = master
+        self.render = render
+        self.interval = 1.0 / fps
+        self._pending = None
+        self._dirty_since = None
+        self._due = None
+        self._last_frame = None
+
+        # Статистика
+        self.requests = 0
+        self.frames = 0
+        self.coalesced = 0
+        self.dropped = 0
+        self.last_latency = 0.0
+        self.max_latency = 0.0
+        self._total_latency = 0.0
+
+    @property
+    def fps(self):
+        return 1.0 / self.interval
+
+    @fps.setter
+    def fps(self, value):
+        self.interval = 1.0 / value
+
+    def request(self):
+        """Пометить модель изменённой; кадр будет нарисован не чаще fps"""
+        self.requests += 1
+        if self._pending is not None:
+            self.coalesced += 1
+            return
+        now = time.perf_counter()
+        self._dirty_since = now
+        delay = 0.0 if self._last_frame is None else max(0.0, self._last_frame + self.interval - now)
+        self._due = now + delay
+        self._pending = self.master.after(int(delay * 1000), self._frame)
+
+    def _frame(self):
+        self._pending = None
+        start = time.perf_counter()
+        # Кадры, пропущенные из-за занятости цикла Tk (кадр опоздал больше чем на период)
+        late = start - self._due
+        if late > self.interval:
+            self.dropped += int(late / self.interval)
+        self._last_frame = start
+        self.render()
+        self.frames += 1
+
+        latency = time.perf_counter() - self._dirty_since
+        self.last_latency = latency
+        self.max_latency = max(self.max_latency, latency)
+        self._total_latency += latency
+
+    def flush(self):
+        """Нарисовать отложенный кадр немедленно"""
+        if self._pending is not None:
+            self.master.after_cancel(self._pending)
+            self._frame()
+
+    def stats(self):
+        return {
+            "requests": self.requests,
+            "frames": self.frames,
+            "coalesced": self.coalesced,
+            "dropped": self.dropped,
+            "avg_latency_ms": self._total_latency / self.frames * 1000 if self.frames else 0.0,
+            "max_latency_ms": self.max_latency * 1000,
+        }
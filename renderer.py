@@ -0,0 +1,94 @@
+"""Отрисовка манипулятора на холсте без пересоздания элементов.
+
+Элементы создаются один раз, дальше меняются только координаты, цвета и текст
+через canvas.coords / canvas.itemconfig. Пол, основание и индикатор состояния
+относятся к статическому слою и перерисовываются только при изменении размера.
+"""
+from kinematics import BASE_HEIGHT, BASE_RADIUS
+
+LINK_COLORS = ["blue", "green"]
+STATE_COLORS = {"off": "gray", "ready": "yellow", "running": "green", "paused": "orange", "emergency": "red"}
+
+
+class RobotRenderer:
+    def __init__(self, canvas, tag="robot", viewport=None, state_marker=True, links=4, scale=1.0):
+        self.canvas = canvas
+        self.tag = tag
+        # viewport = (x, y, ширина, высота); None - весь холст
+        self.viewport = viewport
+        # Масштаб основания; точки для draw масштабирует to_canvas с тем же scale
+        self.scale = scale
+        self.items_created = 0
+        self._size = None
+        self._text = None
+        self._state = None
+
+        # Статический слой: пол, основание и индикатор состояния
+        self.floor = self._create("line", fill="black")
+        self.base = self._create("oval", fill="gray", outline="black")
+        self.state_marker = self._create("rectangle", fill="white") if state_marker else None
+
+        # Динамический слой: звенья, суставы, захват, координаты
+        self.links = [self._create("line", width=10 - 2 * i, fill=LINK_COLORS[i % 2]) for i in range(links)]
+        self.joints = [self._create("oval", fill="red") for _ in range(links)]
+        self.fingers = [self._create("line", width=3, fill="red") for _ in range(2)]
+        self.label = self.canvas.create_text(0, 0, text="", font=('Arial', 10), tags=(self.tag,))
+        self.items_created += 1
+
+    def _create(self, kind, **options):
+        self.items_created += 1
+        return getattr(self.canvas, f"create_{kind}")(0, 0, 0, 0, tags=(self.tag,), **options)
+
+    def area(self):
+        """Возвращает (x, y, ширина, высота) области рисования"""
+        if self.viewport is not None:
+            return self.viewport
+        return 0, 0, self.canvas.winfo_width(), self.canvas.winfo_height()
+
+    def origin(self):
+        """Центр основания робота в координатах холста"""
+        x, y, w, h = self.area()
+        return x + w // 2, y + h - round(50 * self.scale)
+
+    def resize(self):
+        """Перерисовка статического слоя под текущий размер области"""
+        x, y, w, h = self.area()
+        self._size = (x, y, w, h)
+        x0, y0 = self.origin()
+        rx, ry = BASE_RADIUS * self.scale, BASE_HEIGHT * self.scale
+        self.canvas.coords(self.floor, x, y0 + ry, x + w, y0 + ry)
+        self.canvas.coords(self.base, x0 - rx, y0 - ry, x0 + rx, y0 + ry)
+        self.canvas.coords(self.label, x + w // 2, y + 20)
+        if self.state_marker is not None:
+            self.canvas.coords(self.state_marker, x + 10, y + 10, x + 20, y + 20)
+
+    def set_state(self, state):
+        if self.state_marker is None or state == self._state:
+            return
+        self._state = state
+        self.canvas.itemconfig(self.state_marker, fill=STATE_COLORS.get(state, "white"))
+
+    def draw(self, points, fingers, state=None):
+        """points - точки суставов от основания, fingers - концы губок захвата"""
+        if self.area() != self._size:
+            self.resize()
+        if state is not None:
+            self.set_state(state)
+
+        coords = self.canvas.coords
+        for i, link in enumerate(self.links):
+            (xa, ya), (xb, yb) = points[i], points[i + 1]
+            coords(link, xa, ya, xb, yb)
+            coords(self.joints[i], xb - 5, yb - 5, xb + 5, yb + 5)
+
+        xt, yt = points[-1]
+        for finger, (x, y) in zip(self.fingers, fingers):
+            coords(finger, xt, yt, x, y)
+
+        text = f"Координаты: X={int(xt)}, Y={int(yt)}"
+        if text != self._text:
+            self._text = text
+            self.canvas.itemconfig(self.label, text=text)
+
+    def clear(self):
+        self.canvas.delete(self.tag)
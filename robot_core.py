@@ -0,0 +1,204 @@
+"""Состояние и логика манипулятора без интерфейса.
+
+RobotCore хранит углы суставов, захват и состояние системы, проверяет
+переходы (вкл/выкл, пауза, авария) и считает кинематику. Интерфейс, сервер
+и симуляции подписываются на события через subscribe(); модуль не
+импортирует tkinter и создаётся за миллисекунды без дисплея.
+
+События наблюдателей: callback(event, *args)
+    "state"     (состояние,)
+    "joint"     (номер сустава, угол)
+    "joints"    (углы,)
+    "gripper"   (закрыт,)
+    "emergency" (причина,)
+    "trip_cleared" ()  - блокировка снята, владелец сторожевого таймера взводит его заново
+"""
+import logging
+
+from kinematics import KinematicChain, gripper_fingers
+
+STATES = ("off", "ready", "running", "paused", "emergency")
+ACTIVE_STATES = ("ready", "running", "paused")
+ANGLE_MIN, ANGLE_MAX = 0, 180
+
+
+def check_angle(angle):
+    """Угол сустава в пределах ANGLE_MIN-ANGLE_MAX; nan и inf не проходят сравнение"""
+    if not ANGLE_MIN <= angle <= ANGLE_MAX:
+        raise ValueError(f"угол {angle} вне {ANGLE_MIN}-{ANGLE_MAX}°")
+    return angle
+
+
+class RobotCore:
+    def __init__(self, logger=None, joints=6):
+        self.joint_angles = [0] * joints
+        self.gripper_state = False
+        self.system_state = "off"
+        self.trip_reason = None  # блокировка движения сторожевым таймером (trip)
+        self.chain = KinematicChain(self.joint_angles)
+        self.logger = logger or logging.getLogger('robot_logger')
+        self._observers = []
+
+    # --- Наблюдатели ---
+
+    def subscribe(self, callback):
+        self._observers.append(callback)
+        return callback
+
+    def unsubscribe(self, callback):
+        self._observers.remove(callback)
+
+    def _notify(self, event, *args):
+        for callback in self._observers:
+            callback(event, *args)
+
+    # --- Состояние ---
+
+    @property
+    def active(self):
+        return self.system_state in ACTIVE_STATES and self.trip_reason is None
+
+    def _set_state(self, state):
+        self.system_state = state
+        self._notify("state", state)
+
+    def set_state(self, state):
+        """Прямая установка состояния (команда STATE сервера)"""
+        if state not in STATES:
+            raise ValueError("неизвестное состояние")
+        # Авария - только через emergency_stop: журнал и событие для наблюдателей
+        if state == "emergency":
+            self.emergency_stop("STATE")
+            return
+        # Выход из аварии командой оператора снимает и блокировку сторожевого таймера
+        self.clear_trip()
+        if state != self.system_state:
+            self._set_state(state)
+
+    def power_on(self):
+        if self.system_state == "emergency":
+            return False
+        self._set_state("ready")
+        self.logger.info("Система включена")
+        return True
+
+    def power_off(self):
+        if self.system_state == "emergency":
+            return False
+        self.home()
+        self._set_state("off")
+        self.logger.info("Система выключена")
+        return True
+
+    def pause(self):
+        """Переключение работа/пауза; возвращает новое состояние"""
+        if self.system_state == "running":
+            self._set_state("paused")
+            self.logger.info("Пауза")
+        elif self.system_state == "paused":
+            self._set_state("running")
+            self.logger.info("Продолжение")
+        return self.system_state
+
+    def start_motion(self):
+        if self.system_state != "ready" or self.trip_reason is not None:
+            return False
+        self._set_state("running")
+        return True
+
+    def finish_motion(self):
+        if self.system_state in ("running", "paused"):
+            self._set_state("ready")
+
+    def trip(self, reason):
+        """Немедленная блокировка движения из любого потока.
+
+        Только выставляет флаг: команды движения отклоняются сразу, а смену
+        состояния, события и журнал делает emergency_stop в потоке владельца.
+        Возвращает False, если движение уже заблокировано.
+        """
+        if self.trip_reason is not None:
+            return False
+        self.trip_reason = reason
+        return True
+
+    def clear_trip(self):
+        """Снять блокировку trip; возвращает False, если её не было"""
+        if self.trip_reason is None:
+            return False
+        self.logger.warning(f"Блокировка снята: {self.trip_reason}")
+        self.trip_reason = None
+        self._notify("trip_cleared")
+        return True
+
+    def emergency_stop(self, reason="Неизвестно"):
+        if self.system_state == "emergency":
+            return False
+        self._set_state("emergency")
+        self.logger.critical(f"АВАРИЯ! Причина: {reason}")
+        self._notify("emergency", reason)
+        return True
+
+    # --- Движение ---
+
+    def set_joint(self, idx, angle):
+        if not 0 <= idx < len(self.joint_angles):
+            raise ValueError(f"номер сустава 1-{len(self.joint_angles)}")
+        check_angle(angle)
+        if not self.active:
+            return False
+        self.joint_angles[idx] = angle
+        self.chain.set_angle(idx, angle)
+        self.logger.debug("Сустав %d установлен на %s°", idx + 1, angle)
+        self._notify("joint", idx, angle)
+        return True
+
+    def set_joints(self, angles):
+        if len(angles) != len(self.joint_angles):
+            raise ValueError(f"нужно {len(self.joint_angles)} углов")
+        for angle in angles:
+            check_angle(angle)
+        if not self.active:
+            return False
+        self.joint_angles[:] = angles
+        self.chain.set_angles(self.joint_angles)
+        self._notify("joints", self.joint_angles)
+        return True
+
+    def set_gripper(self, closed):
+        closed = bool(closed)
+        if not self.active:
+            return False
+        if closed != self.gripper_state:
+            self.gripper_state = closed
+            self.logger.info(f"Захват {'закрыт' if closed else 'открыт'}")
+            self._notify("gripper", closed)
+        return True
+
+    def toggle_gripper(self):
+        return self.set_gripper(not self.gripper_state)
+
+    def home(self):
+        if self.system_state == "emergency" or self.trip_reason is not None:
+            return False
+        self.joint_angles[:] = [0] * len(self.joint_angles)
+        self.chain.set_angles(self.joint_angles)
+        self._notify("joints", self.joint_angles)
+        if self.gripper_state:
+            self.gripper_state = False
+            self._notify("gripper", False)
+        self.logger.info("Домашняя позиция")
+        return True
+
+    # --- Кинематика ---
+
+    @property
+    def points(self):
+        return self.chain.points
+
+    @property
+    def tool_position(self):
+        return self.chain.points[-1]
+
+    def fingers(self):
+        return gripper_fingers(self.chain.points[-1], self.chain.tool_angle, self.gripper_state)
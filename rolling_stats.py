@@ -0,0 +1,203 @@
+"""Потоковая статистика телеметрии моторов, O(1) на отсчёт.
+
+SlidingWindow - окно последних span секунд: минимум и максимум по
+монотонным очередям (каждый отсчёт входит и выходит из очереди один раз),
+среднее и дисперсия по скользящим суммам. Welford - среднее и дисперсия за
+всё время без хранения отсчётов. Ewma - экспоненциальное среднее с
+постоянной времени tau, отсчёты могут идти неравномерно.
+
+RollingStats собирает всё это по каналам (моторам): запись из потока
+опроса, чтение из Tk под одной блокировкой, как в TelemetryHistory.
+"""
+import collections
+import math
+import threading
+
+
+class SlidingWindow:
+    """Статистика по отсчётам за последние span секунд"""
+
+    def __init__(self, span):
+        self.span = span
+        self._samples = collections.deque()  # (время, значение) в окне
+        self._min = collections.deque()  # возрастающие значения
+        self._max = collections.deque()  # убывающие значения
+        self._added = 0  # номер следующего отсчёта; очереди экстремумов хранят (номер, значение)
+        # Суммы считаются от первого значения, чтобы дисперсия не теряла точность
+        self._shift = None
+        self._total = 0.0
+        self._total_sq = 0.0
+
+    def add(self, ts, value):
+        if self._shift is None:
+            self._shift = value
+        samples = self._samples
+        samples.append((ts, value))
+        d = value - self._shift
+        self._total += d
+        self._total_sq += d * d
+
+        n = self._added
+        self._added = n + 1
+        lows = self._min
+        while lows and lows[-1][1] >= value:
+            lows.pop()
+        lows.append((n, value))
+        highs = self._max
+        while highs and highs[-1][1] <= value:
+            highs.pop()
+        highs.append((n, value))
+
+        start = ts - self.span
+        while samples[0][0] <= start:
+            oldest = self._added - len(samples)
+            d = samples.popleft()[1] - self._shift
+            self._total -= d
+            self._total_sq -= d * d
+            if lows[0][0] == oldest:
+                lows.popleft()
+            if highs[0][0] == oldest:
+                highs.popleft()
+
+    def __len__(self):
+        return len(self._samples)
+
+    @property
+    def min(self):
+        return self._min[0][1] if self._min else None
+
+    @property
+    def max(self):
+        return self._max[0][1] if self._max else None
+
+    @property
+    def mean(self):
+        n = len(self._samples)
+        return self._shift + self._total / n if n else None
+
+    @property
+    def variance(self):
+        n = len(self._samples)
+        if n < 2:
+            return 0.0
+        return max(0.0, (self._total_sq - self._total * self._total / n) / (n - 1))
+
+    def oldest(self):
+        """(время, значение) самого старого отсчёта окна или None"""
+        return self._samples[0] if self._samples else None
+
+    def covered(self):
+        """Сколько секунд окна заполнено отсчётами"""
+        samples = self._samples
+        return samples[-1][0] - samples[0][0] if samples else 0.0
+
+    def clear(self):
+        self._samples.clear()
+        self._min.clear()
+        self._max.clear()
+        self._added = 0
+        self._shift = None
+        self._total = self._total_sq = 0.0
+
+
+class Welford:
+    """Среднее и дисперсия за всё время (алгоритм Уэлфорда)"""
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+
+    def add(self, value):
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (value - self.mean)
+
+    @property
+    def variance(self):
+        return self._m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    @property
+    def std(self):
+        return math.sqrt(self.variance)
+
+
+class Ewma:
+    """Экспоненциальное среднее; вес отсчёта зависит от прошедшего времени"""
+
+    def __init__(self, tau):
+        self.tau = tau
+        self.value = None
+        self._ts = None
+
+    def add(self, ts, value):
+        if self.value is None:
+            self.value = value
+        else:
+            alpha = 1.0 - math.exp(-max(0.0, ts - self._ts) / self.tau)
+            self.value += alpha * (value - self.value)
+        self._ts = ts
+
+
+class ChannelStats:
+    """Все оценки одного канала"""
+
+    def __init__(self, windows=(30, 300), tau=10.0):
+        self.windows = {span: SlidingWindow(span) for span in windows}
+        self.total = Welford()
+        self.ewma = Ewma(tau)
+        self.last = None
+
+    def add(self, ts, value):
+        for window in self.windows.values():
+            window.add(ts, value)
+        self.total.add(value)
+        self.ewma.add(ts, value)
+        self.last = value
+
+    def summary(self):
+        summary = {"last": self.last, "mean": self.total.mean, "std": self.total.std,
+                   "ewma": self.ewma.value, "count": self.total.count}
+        for span, window in self.windows.items():
+            summary[span] = {"min": window.min, "max": window.max, "mean": window.mean,
+                             "std": math.sqrt(window.variance)}
+        return summary
+
+
+class RollingStats:
+    """Статистика по каналам; запись из потока телеметрии, чтение из Tk"""
+
+    def __init__(self, channels, windows=(30, 300), tau=10.0):
+        self.windows = tuple(windows)
+        self.channels = [ChannelStats(windows, tau) for _ in range(channels)]
+        self._lock = threading.Lock()
+        self.samples = 0
+
+    def add(self, ts, values):
+        """Кадр: по значению на канал, ts - время, с"""
+        with self._lock:
+            for channel, value in zip(self.channels, values):
+                channel.add(ts, value)
+            self.samples += len(values)
+
+    def add_sample(self, channel, ts, value):
+        with self._lock:
+            self.channels[channel].add(ts, value)
+            self.samples += 1
+
+    def window(self, channel, span):
+        """(min, max, mean) канала за окно span"""
+        with self._lock:
+            window = self.channels[channel].windows[span]
+            return window.min, window.max, window.mean
+
+    def snapshot(self):
+        """Сводки всех каналов (ChannelStats.summary)"""
+        with self._lock:
+            return [channel.summary() for channel in self.channels]
+
+    def clear(self):
+        with self._lock:
+            self.channels = [ChannelStats(self.windows, channel.ewma.tau) for channel in self.channels]
+            self.samples = 0
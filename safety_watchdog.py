@@ -0,0 +1,127 @@
+"""Сторожевой таймер перегрева моторов.
+
+Каждый отсчёт температуры проверяется сразу при поступлении (feed), а не
+после обновления всех моторов. Проверки по каждому мотору:
+    limit - температура выше предела; мотор снова взводится, когда
+            температура опустится на hysteresis ниже предела;
+    rise  - скорость роста за окно rise_window выше max_rise (°C/с);
+            взводится, когда скорость упадёт на rise_hysteresis ниже предела.
+Окно роста - rolling_stats.SlidingWindow, O(1) на отсчёт.
+
+При срабатывании сначала вызывается on_trip(trip) в потоке, который подал
+отсчёт, - без Tk и журнала; интерфейс и запись в журнал - дело обработчика
+и идут после блокировки движения. Задержка от прихода отсчёта до возврата
+из on_trip пишется в гистограмму latency.
+"""
+import collections
+import time
+
+from instrumentation import LatencyHistogram
+from rolling_stats import SlidingWindow
+
+Trip = collections.namedtuple('Trip', 'motor kind value timestamp')
+
+
+def describe(trip):
+    if trip.kind == "rise":
+        return f"Быстрый рост температуры двигателя {trip.motor + 1}: {trip.value:.1f}°C/с"
+    return f"Перегрев двигателя {trip.motor + 1}: {trip.value:.1f}°C"
+
+
+def _per_motor(value, motors):
+    if isinstance(value, (list, tuple)):
+        if len(value) != motors:
+            raise ValueError(f"нужно {motors} значений")
+        return list(value)
+    return [value] * motors
+
+
+class Watchdog:
+    def __init__(self, on_trip, motors=6, limit=60.0, hysteresis=5.0, max_rise=None, rise_window=5.0,
+                 rise_hysteresis=1.0, clock=time.perf_counter_ns):
+        self.on_trip = on_trip
+        self.motors = motors
+        # limit и max_rise - число для всех моторов или список по моторам; max_rise None - без проверки
+        self.limits = _per_motor(limit, motors)
+        self.max_rise = _per_motor(max_rise, motors)
+        self.hysteresis = hysteresis
+        self.rise_window = rise_window
+        self.rise_hysteresis = rise_hysteresis
+        self.clock = clock
+        self.armed = [True] * motors
+        self.rise_armed = [True] * motors
+        self._rise = [SlidingWindow(rise_window) for _ in range(motors)]
+        self.latency = LatencyHistogram()
+        self.tripped = None  # первое срабатывание
+        self.trips = 0
+        self.samples = 0
+
+    def rise_rate(self, motor, temp, ts):
+        """Скорость роста, °C/с, от самого старого отсчёта окна; None, пока окно не заполнено наполовину"""
+        window = self._rise[motor]
+        window.add(ts, temp)
+        span = window.covered()
+        if span < self.rise_window / 2:
+            return None
+        return (temp - window.oldest()[1]) / span
+
+    def feed(self, motor, temp, ts, arrived=None):
+        """Проверить отсчёт мотора; ts - время отсчёта, с; arrived - clock() прихода отсчёта.
+
+        Возвращает Trip, если отсчёт вызвал срабатывание.
+        """
+        if arrived is None:
+            arrived = self.clock()
+        self.samples += 1
+        trip = None
+
+        limit = self.limits[motor]
+        if temp > limit:
+            if self.armed[motor]:
+                self.armed[motor] = False
+                trip = Trip(motor, "limit", temp, ts)
+        elif temp <= limit - self.hysteresis:
+            self.armed[motor] = True
+
+        max_rise = self.max_rise[motor]
+        if max_rise is not None:
+            rate = self.rise_rate(motor, temp, ts)
+            if rate is not None:
+                if rate > max_rise:
+                    if self.rise_armed[motor]:
+                        self.rise_armed[motor] = False
+                        if trip is None:
+                            trip = Trip(motor, "rise", rate, ts)
+                elif rate <= max_rise - self.rise_hysteresis:
+                    self.rise_armed[motor] = True
+
+        if trip is not None:
+            self.on_trip(trip)
+            self.latency.record(self.clock() - arrived)
+            self.trips += 1
+            if self.tripped is None:
+                self.tripped = trip
+        return trip
+
+    def feed_frame(self, temps, ts):
+        """Все моторы подряд; возвращает первое срабатывание или None"""
+        first = None
+        arrived = self.clock()
+        for motor, temp in enumerate(temps):
+            trip = self.feed(motor, temp, ts, arrived)
+            if first is None:
+                first = trip
+        return first
+
+    def reset(self):
+        """Снять отметку о срабатывании и взвести все проверки"""
+        self.tripped = None
+        self.armed = [True] * self.motors
+        self.rise_armed = [True] * self.motors
+        for window in self._rise:
+            window.clear()
+
+    def stats(self):
+        stats = {"samples": self.samples, "trips": self.trips}
+        stats.update(self.latency.summary())
+        return stats
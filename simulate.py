@@ -0,0 +1,250 @@
+"""Пакетная офлайн-симуляция наборов позиций без интерфейса.
+
+Каждый файл каталога (*.jsonl, *.json) - последовательность позиций в
+формате прежнего save_position: одна строка JSON {"joints", "gripper",
+"timestamp"} на позицию. Файлы *.bin - хранилища PositionStore, которые
+пишет окно; позиции из них берутся в порядке времени. Для файла строится траектория plan_trajectory и
+проверяется trajectory_check (пределы, скорость, пол, самопересечения);
+в сводку идут длительность, вылет инструмента и первое нарушение.
+
+Позиции всех файлов читаются один раз и кладутся в общую память
+(multiprocessing.shared_memory): углы (M, 6) float64 и захват (M,) uint8.
+Файлы нарезаются на части примерно по --chunk позиций, части считает
+ProcessPoolExecutor; процессы читают свои строки прямо из общей памяти,
+сводки печатаются по мере готовности частей. Требует numpy.
+
+Запуск:
+    python simulate.py <каталог> [--workers 4] [--style normal] [--rate 50] [--json]
+    python simulate.py <каталог> --scaling        - пропускная способность от 1 до всех ядер
+    python simulate.py <каталог> --generate 2000  - создать случайные наборы для проверки
+"""
+import argparse
+import concurrent.futures
+import json
+import math
+import os
+import random
+import sys
+import time
+from multiprocessing import shared_memory
+
+import numpy as np
+
+import trajectory_check
+from kinematics import forward_kinematics_batch
+from position_store import PositionStore
+from trajectory import STYLE_LIMITS, plan_trajectory
+
+JOINTS = 6
+PATTERNS = (".jsonl", ".json", ".bin")
+
+
+class Study:
+    """Позиции всех файлов в общей памяти; files - список (имя, начало, число позиций)"""
+
+    def __init__(self, files, angles, gripper, errors):
+        self.files = files
+        self.errors = errors  # (имя, описание) файлов, которые не удалось прочитать
+        self.poses = len(gripper)
+        self._angles_shm = shared_memory.SharedMemory(create=True, size=max(1, angles.nbytes))
+        self._gripper_shm = shared_memory.SharedMemory(create=True, size=max(1, gripper.nbytes))
+        np.ndarray(angles.shape, np.float64, self._angles_shm.buf)[:] = angles
+        np.ndarray(gripper.shape, np.uint8, self._gripper_shm.buf)[:] = gripper
+
+    @classmethod
+    def load(cls, directory):
+        files, rows, grips, errors = [], [], [], []
+        for name in sorted(os.listdir(directory)):
+            if not name.endswith(PATTERNS):
+                continue
+            try:
+                poses = read_positions(os.path.join(directory, name))
+            except (OSError, ValueError, KeyError, TypeError) as e:
+                errors.append((name, str(e)))
+                continue
+            files.append((name, len(rows), len(poses)))
+            for joints, gripper in poses:
+                rows.append(joints)
+                grips.append(gripper)
+        angles = np.array(rows, dtype=np.float64).reshape(-1, JOINTS)
+        return cls(files, angles, np.array(grips, dtype=np.uint8), errors)
+
+    @property
+    def names(self):
+        return self._angles_shm.name, self._gripper_shm.name
+
+    def shards(self, chunk):
+        """Части по файлам примерно по chunk позиций; большой файл - отдельная часть"""
+        shard, size = [], 0
+        for entry in self.files:
+            shard.append(entry)
+            size += entry[2]
+            if size >= chunk:
+                yield shard
+                shard, size = [], 0
+        if shard:
+            yield shard
+
+    def close(self):
+        for shm in (self._angles_shm, self._gripper_shm):
+            shm.close()
+            shm.unlink()
+
+
+def read_positions(path):
+    if path.endswith(".bin"):
+        store = PositionStore(path)
+        try:
+            return [(list(p.joints), p.gripper) for p in store.latest(len(store))]
+        finally:
+            store.close()
+    poses = []
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            data = json.loads(line)
+            joints = [float(a) for a in data["joints"]]
+            if len(joints) != JOINTS:
+                raise ValueError(f"нужно {JOINTS} углов")
+            poses.append((joints, bool(data["gripper"])))
+    return poses
+
+
+def simulate_file(angles, gripper, style, rate):
+    """Сводка для одной последовательности позиций"""
+    poses = [(row, grip) for row, grip in zip(angles.tolist(), gripper.tolist())]
+    trajectory = plan_trajectory(poses, style, rate)
+    summary = {"poses": len(poses), "samples": len(trajectory), "duration": trajectory.duration}
+    if not len(trajectory):
+        return summary
+    violation = trajectory_check.check_trajectory(trajectory, style)
+    samples = np.frombuffer(trajectory.samples, dtype=np.float64).reshape(-1, trajectory.joints)
+    points, _ = forward_kinematics_batch(samples[:, :JOINTS])
+    tool = points[:, -1]
+    summary["reach"] = float(np.hypot(tool[:, 0], tool[:, 1]).max())
+    summary["tool_min_y"] = float(tool[:, 1].min())
+    if violation is not None:
+        summary["violation"] = {"sample": violation.index, "time": violation.index / rate,
+                                "kind": violation.kind, "message": trajectory_check.describe(violation)}
+    return summary
+
+
+def simulate_shard(names, poses, shard, style, rate):
+    """Задача процесса: сводки по файлам части, данные берутся из общей памяти"""
+    angles_shm = shared_memory.SharedMemory(name=names[0])
+    gripper_shm = shared_memory.SharedMemory(name=names[1])
+    try:
+        angles = np.ndarray((poses, JOINTS), np.float64, angles_shm.buf)
+        gripper = np.ndarray((poses,), np.uint8, gripper_shm.buf)
+        results = []
+        for name, start, count in shard:
+            summary = simulate_file(angles[start:start + count], gripper[start:start + count], style, rate)
+            summary["file"] = name
+            results.append(summary)
+        del angles, gripper
+        return results
+    finally:
+        angles_shm.close()
+        gripper_shm.close()
+
+
+def run(study, workers, chunk, style, rate, on_result=None):
+    """Прогон всех файлов; on_result(summary) вызывается по мере готовности частей"""
+    results = []
+    with concurrent.futures.ProcessPoolExecutor(workers) as pool:
+        futures = [pool.submit(simulate_shard, study.names, study.poses, shard, style, rate)
+                   for shard in study.shards(chunk)]
+        for future in concurrent.futures.as_completed(futures):
+            for summary in future.result():
+                results.append(summary)
+                if on_result is not None:
+                    on_result(summary)
+    return results
+
+
+def format_summary(summary):
+    text = f"{summary['file']}: {summary['poses']} поз, {summary['samples']} отсчётов, {summary['duration']:.1f} с"
+    if "reach" in summary:
+        text += f", вылет {summary['reach']:.0f}"
+    violation = summary.get("violation")
+    if violation is None:
+        return text + ", OK"
+    return text + f", НАРУШЕНИЕ на {violation['time']:.2f} с: {violation['message']}"
+
+
+def generate(directory, count, poses, seed=1):
+    """Случайные наборы позиций в формате save_position"""
+    os.makedirs(directory, exist_ok=True)
+    rng = random.Random(seed)
+    stamp = time.strftime("%Y-%m-%d %H:%M:%S")
+    for k in range(count):
+        with open(os.path.join(directory, f"study_{k:05d}.jsonl"), 'w', encoding='utf-8') as f:
+            for _ in range(poses):
+                joints = [rng.randint(60, 120), rng.randint(0, 60), rng.randint(0, 60),
+                          rng.randint(0, 40), rng.randint(0, 180), rng.randint(0, 180)]
+                json.dump({"joints": joints, "gripper": rng.random() < 0.5, "timestamp": stamp}, f)
+                f.write("\n")
+
+
+def scaling_report(study, chunk, style, rate, counts):
+    print(f"{'процессов':>10}{'время, с':>10}{'позиций/с':>12}{'отсчётов/с':>14}{'ускорение':>11}{'эффект.':>9}")
+    base = None
+    for workers in counts:
+        start = time.perf_counter()
+        results = run(study, workers, chunk, style, rate)
+        elapsed = time.perf_counter() - start
+        samples = sum(r["samples"] for r in results)
+        base = base or elapsed
+        speedup = base / elapsed
+        print(f"{workers:>10}{elapsed:>10.2f}{study.poses / elapsed:>12,.0f}{samples / elapsed:>14,.0f}"
+              f"{speedup:>10.2f}x{speedup / workers:>9.0%}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Пакетная симуляция наборов позиций")
+    parser.add_argument("directory")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--chunk", type=int, default=5000, help="позиций на задачу процесса")
+    parser.add_argument("--style", choices=sorted(STYLE_LIMITS), default="normal")
+    parser.add_argument("--rate", type=int, default=50, help="отсчётов траектории в секунду")
+    parser.add_argument("--json", action="store_true", help="сводки строками JSON")
+    parser.add_argument("--scaling", action="store_true", help="отчёт о масштабировании по числу процессов")
+    parser.add_argument("--generate", type=int, metavar="N", help="создать N случайных наборов и выйти")
+    parser.add_argument("--poses", type=int, default=20, help="позиций в наборе для --generate")
+    options = parser.parse_args()
+
+    if options.generate:
+        generate(options.directory, options.generate, options.poses)
+        print(f"Создано наборов: {options.generate} в {options.directory}")
+        return
+
+    start = time.perf_counter()
+    study = Study.load(options.directory)
+    loaded = time.perf_counter() - start
+    try:
+        for name, error in study.errors:
+            print(f"{name}: ошибка чтения: {error}", file=sys.stderr)
+        print(f"Файлов: {len(study.files)}, позиций: {study.poses}, чтение {loaded:.2f} с", file=sys.stderr)
+        if options.scaling:
+            cores = os.cpu_count() or 1
+            counts = sorted({1 << k for k in range(int(math.log2(cores)) + 1)} | {cores})
+            scaling_report(study, options.chunk, options.style, options.rate, counts)
+            return
+
+        def emit(summary):
+            print(json.dumps(summary, ensure_ascii=False) if options.json else format_summary(summary), flush=True)
+
+        start = time.perf_counter()
+        results = run(study, options.workers, options.chunk, options.style, options.rate, emit)
+        elapsed = time.perf_counter() - start
+        failed = sum("violation" in r for r in results)
+        print(f"Готово: {len(results)} файлов за {elapsed:.2f} с ({options.workers} процессов), "
+              f"с нарушениями: {failed}", file=sys.stderr)
+    finally:
+        study.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""Панель спарклайнов температуры моторов.
+
+Для каждого мотора рисуются линия максимума и линия среднего по корзинам
+TelemetryHistory. Элементы холста создаются один раз и дальше только
+перемещаются, число точек не превышает ширину строки в пикселях.
+"""
+import tkinter as tk
+from tkinter import ttk
+
+SPANS = [("1 мин", 60), ("10 мин", 600), ("1 ч", 3600)]
+
+
+class SparklinePanel:
+    def __init__(self, parent, history, labels, limit=60, vmin=20, vmax=70, row_height=22):
+        self.history = history
+        self.labels = labels
+        self.limit = limit
+        self.vmin, self.vmax = vmin, vmax
+        self.row_height = row_height
+        self.span = SPANS[0][1]
+        self.label_width = 70
+        self._size = None
+
+        toolbar = ttk.Frame(parent)
+        toolbar.pack(fill=tk.X)
+        ttk.Label(toolbar, text="История температуры:").pack(side=tk.LEFT)
+        self.span_var = tk.StringVar(value=SPANS[0][0])
+        span_box = ttk.Combobox(toolbar, textvariable=self.span_var, values=[name for name, _ in SPANS],
+                                state="readonly", width=8)
+        span_box.pack(side=tk.LEFT, padx=5)
+        span_box.bind("<<ComboboxSelected>>", lambda e: self.set_span(dict(SPANS)[self.span_var.get()]))
+
+        self.canvas = tk.Canvas(parent, bg='white', height=row_height * len(labels))
+        self.canvas.pack(fill=tk.X, pady=5)
+        self.canvas.bind("<Configure>", lambda e: self.refresh())
+
+        # Статический слой: подписи и линия порога перегрева
+        self.row_labels = [self.canvas.create_text(5, 0, text=label, anchor=tk.W, font=('Arial', 8))
+                           for label in labels]
+        self.limit_lines = [self.canvas.create_line(0, 0, 0, 0, fill="red", dash=(2, 2)) for _ in labels]
+        # Динамический слой
+        self.max_lines = [self.canvas.create_line(0, 0, 0, 0, fill="orange") for _ in labels]
+        self.mean_lines = [self.canvas.create_line(0, 0, 0, 0, fill="blue") for _ in labels]
+        self.points_drawn = 0
+
+    def set_span(self, span):
+        self.span = span
+        self.refresh()
+
+    def _y(self, row, value):
+        value = min(max(value, self.vmin), self.vmax)
+        top = row * self.row_height
+        return top + self.row_height - 2 - (value - self.vmin) / (self.vmax - self.vmin) * (self.row_height - 4)
+
+    def resize(self):
+        width = self.canvas.winfo_width()
+        self._size = width
+        for row, label in enumerate(self.row_labels):
+            self.canvas.coords(label, 5, row * self.row_height + self.row_height / 2)
+            y = self._y(row, self.limit)
+            self.canvas.coords(self.limit_lines[row], self.label_width, y, width, y)
+
+    def refresh(self):
+        width = self.canvas.winfo_width()
+        if width != self._size:
+            self.resize()
+        plot_width = max(2, width - self.label_width)
+        scale = plot_width / self.span
+        self.points_drawn = 0
+        for row in range(len(self.labels)):
+            points = self.history.points(row, self.span, plot_width)
+            if len(points) < 2:
+                self.canvas.coords(self.max_lines[row], 0, 0, 0, 0)
+                self.canvas.coords(self.mean_lines[row], 0, 0, 0, 0)
+                continue
+            now = self.history.last_time
+            max_coords, mean_coords = [], []
+            for t, lo, hi, mean in points:
+                x = self.label_width + plot_width - (now - t) * scale
+                max_coords += [x, self._y(row, hi)]
+                mean_coords += [x, self._y(row, mean)]
+            self.canvas.coords(self.max_lines[row], *max_coords)
+            self.canvas.coords(self.mean_lines[row], *mean_coords)
+            self.points_drawn += len(points)
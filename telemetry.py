@@ -0,0 +1,89 @@
+"""Хранилище телеметрии моторов с двойной буферизацией.
+
+Колонки temp / position_ticks / position_rad / position_deg - массивы array('d')
+на все оси. Производитель заполняет задний буфер и публикует его одной
+заменой ссылки; читатели без блокировок получают согласованный снимок.
+Несколько манипуляторов делят одно хранилище, получая свои оси через allocate.
+"""
+import contextlib
+import threading
+import time
+from array import array
+
+COLUMNS = ("temp", "position_ticks", "position_rad", "position_deg")
+
+
+class TelemetryFrame:
+    __slots__ = ("seq", "timestamp") + COLUMNS
+
+    def __init__(self, axes):
+        self.seq = 0
+        self.timestamp = 0.0
+        for column in COLUMNS:
+            setattr(self, column, array('d', bytes(8 * axes)))
+
+    def copy_from(self, other):
+        self.timestamp = other.timestamp
+        for column in COLUMNS:
+            getattr(self, column)[:] = getattr(other, column)
+
+
+class TelemetryStore:
+    def __init__(self, axes=6):
+        self.axes = axes
+        self._allocated = 0
+        self._front = TelemetryFrame(axes)
+        self._back = TelemetryFrame(axes)
+        self._write_lock = threading.Lock()  # только между производителями
+        self.publishes = 0
+        self.retries = 0
+
+    def allocate(self, count):
+        """Выделить оси для манипулятора; возвращает range индексов"""
+        with self._write_lock:
+            start = self._allocated
+            self._allocated += count
+            if self._allocated > self.axes:
+                self._grow(self._allocated)
+        return range(start, start + count)
+
+    def _grow(self, axes):
+        extra = bytes(8 * (axes - self.axes))
+        for frame in (self._front, self._back):
+            for column in COLUMNS:
+                getattr(frame, column).frombytes(extra)
+        self.axes = axes
+
+    @contextlib.contextmanager
+    def writing(self):
+        """Заполнить задний буфер и опубликовать его при выходе из блока"""
+        with self._write_lock:
+            yield self._back
+            self._publish()
+
+    def _publish(self):
+        back = self._back
+        back.seq = self._front.seq + 1
+        back.timestamp = time.time()
+        self._front, self._back = back, self._front
+        # Новый задний буфер начинает с опубликованных значений: оси других манипуляторов не теряются
+        self._back.copy_from(back)
+        self.publishes += 1
+
+    @property
+    def front(self):
+        """Последний опубликованный буфер (без копирования; для коротких чтений)"""
+        return self._front
+
+    def snapshot(self):
+        """Согласованная копия последнего опубликованного буфера"""
+        while True:
+            frame = self._front
+            seq = frame.seq
+            snapshot = TelemetryFrame(0)
+            snapshot.copy_from(frame)
+            snapshot.seq = seq
+            # Буфер не успел смениться и стать задним - копия целостная
+            if self._front is frame and frame.seq == seq:
+                return snapshot
+            self.retries += 1
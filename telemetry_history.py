@@ -0,0 +1,124 @@
+"""История телеметрии: кольцевые буферы с уровнями прореживания.
+
+Каждый канал хранит сырые отсчёты и агрегаты min/max/mean по корзинам
+(по умолчанию 1 с и 1 мин). Для отрисовки выбирается уровень, у которого число
+точек на интервале не больше ширины в пикселях, поэтому часы истории рисуются
+так же быстро, как минута.
+"""
+import threading
+from array import array
+
+
+class SeriesRing:
+    """Кольцевой буфер агрегатов (начало корзины, min, max, сумма, число отсчётов)"""
+
+    def __init__(self, capacity, resolution):
+        self.capacity = capacity
+        self.resolution = resolution  # ширина корзины, с; 0 - сырые отсчёты
+        self.t = array('d', bytes(8 * capacity))
+        self.lo = array('d', bytes(8 * capacity))
+        self.hi = array('d', bytes(8 * capacity))
+        self.total = array('d', bytes(8 * capacity))
+        self.count = array('l', bytes(array('l').itemsize * capacity))
+        self.head = 0  # позиция следующей записи
+        self.size = 0
+
+    def _slot(self, n):
+        """Физический индекс n-й по времени записи"""
+        return (self.head - self.size + n) % self.capacity
+
+    def add(self, t, value):
+        if self.resolution:
+            start = t - t % self.resolution
+            last = (self.head - 1) % self.capacity
+            if self.size and self.t[last] == start:
+                self.lo[last] = min(self.lo[last], value)
+                self.hi[last] = max(self.hi[last], value)
+                self.total[last] += value
+                self.count[last] += 1
+                return
+            t = start
+        i = self.head
+        self.t[i], self.lo[i], self.hi[i], self.total[i], self.count[i] = t, value, value, value, 1
+        self.head = (i + 1) % self.capacity
+        self.size = min(self.size + 1, self.capacity)
+
+    def oldest(self):
+        return self.t[self._slot(0)] if self.size else None
+
+    def first_after(self, t):
+        """Номер первой записи не раньше t (двоичный поиск)"""
+        lo, hi = 0, self.size
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self.t[self._slot(mid)] < t:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def points(self, since):
+        """(t, min, max, mean) начиная с момента since"""
+        for n in range(self.first_after(since), self.size):
+            i = self._slot(n)
+            yield self.t[i], self.lo[i], self.hi[i], self.total[i] / self.count[i]
+
+
+class TieredHistory:
+    """История одного канала: сырые отсчёты и уровни прореживания"""
+
+    def __init__(self, retention=3600, sample_interval=1.0, tiers=(1, 60), raw_retention=600):
+        self.sample_interval = sample_interval
+        self.raw = SeriesRing(max(2, int(raw_retention / sample_interval)), 0)
+        self.tiers = [SeriesRing(int(retention / width) + 1, width) for width in tiers]
+
+    def add(self, t, value):
+        self.raw.add(t, value)
+        for tier in self.tiers:
+            tier.add(t, value)
+
+    def select(self, now, span, width, oversample=4):
+        """Самый подробный уровень, который покрывает span и даёт не больше oversample * width точек"""
+        since = now - span
+        levels = [(self.raw, self.sample_interval)] + [(tier, tier.resolution) for tier in self.tiers]
+        for ring, resolution in levels:
+            covers = ring.size < ring.capacity or ring.oldest() <= since
+            if covers and span / resolution <= width * oversample:
+                return ring
+        return levels[-1][0]
+
+    def points(self, now, span, width):
+        """Не больше width точек (t, min, max, mean) за последние span секунд"""
+        since = now - span
+        points = list(self.select(now, span, width).points(since))
+        if len(points) <= width:
+            return points
+        # Сводим несколько записей в один столбец пикселей, экстремумы сохраняются
+        columns = []
+        for t, lo, hi, mean in points:
+            column = int((t - since) / span * width)
+            if columns and columns[-1][0] == column:
+                _, t0, lo0, hi0, total, n = columns[-1]
+                columns[-1] = (column, t0, min(lo0, lo), max(hi0, hi), total + mean, n + 1)
+            else:
+                columns.append((column, t, lo, hi, mean, 1))
+        return [(t, lo, hi, total / n) for _, t, lo, hi, total, n in columns]
+
+
+class TelemetryHistory:
+    """Истории по каналам (моторам); запись из потока телеметрии, чтение из Tk"""
+
+    def __init__(self, channels, **kwargs):
+        self.channels = [TieredHistory(**kwargs) for _ in range(channels)]
+        self._lock = threading.Lock()
+        self.last_time = 0.0
+
+    def add(self, t, values):
+        with self._lock:
+            for history, value in zip(self.channels, values):
+                history.add(t, value)
+            self.last_time = t
+
+    def points(self, channel, span, width):
+        with self._lock:
+            return self.channels[channel].points(self.last_time, span, width)
@@ -0,0 +1,205 @@
+"""Рассылка телеметрии подписчикам по сокету (publish/subscribe).
+
+Производитель (MotorMonitor) вызывает publish(): снимок один раз
+упаковывается в кадр TELEMETRY из protocol.py и передаётся циклу событий
+хаба через call_soon_threadsafe, так что вызывающий поток не ждёт сеть.
+У каждого подписчика своя ограниченная очередь и политика переполнения:
+    drop_oldest - выбрасывать самые старые кадры;
+    conflate    - хранить только последний снимок;
+    disconnect  - отключать отстающего подписчика.
+
+Подписчик подключается и первой строкой шлёт
+    SUBSCRIBE [drop_oldest|conflate|disconnect] [размер очереди]
+после чего получает поток кадров TELEMETRY.
+"""
+import asyncio
+import collections
+import socket
+import threading
+
+import protocol
+
+DROP_OLDEST = "drop_oldest"
+CONFLATE = "conflate"
+DISCONNECT = "disconnect"
+POLICIES = (DROP_OLDEST, CONFLATE, DISCONNECT)
+
+
+class Subscriber:
+    def __init__(self, writer, policy=DROP_OLDEST, queue_size=64):
+        self.writer = writer
+        self.policy = policy
+        self.queue_size = queue_size
+        self.queue = collections.deque()
+        self.ready = asyncio.Event()
+        self.sent = 0
+        self.dropped = 0
+        self.closed = False
+
+    def offer(self, frame):
+        """Положить кадр в очередь; False - подписчика нужно отключить"""
+        queue = self.queue
+        if len(queue) >= self.queue_size:
+            if self.policy == DISCONNECT:
+                return False
+            if self.policy == CONFLATE:
+                self.dropped += len(queue)
+                queue.clear()
+            else:
+                queue.popleft()
+                self.dropped += 1
+        elif self.policy == CONFLATE and queue:
+            # Новый снимок полностью заменяет неотправленный
+            queue.clear()
+            self.dropped += 1
+        queue.append(frame)
+        self.ready.set()
+        return True
+
+    def stats(self):
+        return {"policy": self.policy, "sent": self.sent, "dropped": self.dropped,
+                "queued": len(self.queue)}
+
+
+class TelemetryHub:
+    def __init__(self, host="127.0.0.1", port=2002, policy=DROP_OLDEST, queue_size=64, send_buffer=65536):
+        self.host = host
+        self.port = port
+        self.policy = policy
+        self.queue_size = queue_size
+        self.send_buffer = send_buffer  # буфер ядра на подписчика, чтобы отставание было видно очереди
+        self.subscribers = set()
+        self.published = 0
+        self.disconnected = 0
+        self._loop = None
+        self._server = None
+        self._thread = None
+        self._handlers = set()
+
+    # --- Поток цикла событий ---
+
+    def start(self):
+        """Запустить хаб в фоновом потоке; OSError, если порт занят"""
+        ready = threading.Event()
+        errors = []
+
+        def run():
+            loop = asyncio.new_event_loop()
+            asyncio.set_event_loop(loop)
+            try:
+                self._server = loop.run_until_complete(
+                    asyncio.start_server(self._handle, self.host, self.port))
+            except OSError as e:
+                errors.append(e)
+                ready.set()
+                loop.close()
+                return
+            self.port = self._server.sockets[0].getsockname()[1]
+            self._loop = loop
+            ready.set()
+            loop.run_forever()
+            loop.run_until_complete(self._shutdown())
+            loop.close()
+
+        self._thread = threading.Thread(target=run, name="telemetry-hub", daemon=True)
+        self._thread.start()
+        ready.wait()
+        if errors:
+            raise errors[0]
+        return self
+
+    def close(self):
+        if self._loop is None:
+            return
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(timeout=2)
+        self._loop = None
+
+    async def _shutdown(self):
+        self._server.close()
+        for subscriber in list(self.subscribers):
+            subscriber.closed = True
+            subscriber.writer.transport.abort()
+            subscriber.ready.set()
+        if self._handlers:
+            await asyncio.wait(self._handlers, timeout=1)
+        await self._server.wait_closed()
+
+    # --- Производитель ---
+
+    def publish(self, timestamp, temps, angles):
+        """Вызывается из любого потока, не блокируется"""
+        loop = self._loop
+        if loop is None or not self.subscribers:
+            return
+        frame = protocol.encode(protocol.TELEMETRY, timestamp, *temps, *angles)
+        loop.call_soon_threadsafe(self._fanout, frame)
+
+    def _fanout(self, frame):
+        self.published += 1
+        for subscriber in list(self.subscribers):
+            if not subscriber.offer(frame):
+                self._disconnect(subscriber)
+
+    def _disconnect(self, subscriber):
+        self.disconnected += 1
+        self.subscribers.discard(subscriber)
+        subscriber.closed = True
+        subscriber.writer.transport.abort()
+        subscriber.ready.set()
+
+    # --- Подписчики ---
+
+    async def _handle(self, reader, writer):
+        task = asyncio.current_task()
+        self._handlers.add(task)
+        try:
+            await self._subscribe(reader, writer)
+        finally:
+            self._handlers.discard(task)
+            writer.close()
+
+    async def _subscribe(self, reader, writer):
+        try:
+            line = await asyncio.wait_for(reader.readline(), timeout=5)
+        except (asyncio.TimeoutError, ConnectionError):
+            return
+        parts = line.decode('utf-8', 'replace').split()
+        if not parts or parts[0].upper() != "SUBSCRIBE":
+            return
+        policy = parts[1] if len(parts) > 1 else self.policy
+        if policy not in POLICIES:
+            writer.write(f"ERR политика {policy}\n".encode('utf-8'))
+            return
+        queue_size = max(1, int(parts[2])) if len(parts) > 2 and parts[2].isdigit() else self.queue_size
+        sock = writer.get_extra_info('socket')
+        if sock is not None and self.send_buffer:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, self.send_buffer)
+        subscriber = Subscriber(writer, policy, queue_size)
+        self.subscribers.add(subscriber)
+        try:
+            await self._stream(subscriber)
+        except ConnectionError:
+            pass
+        finally:
+            self.subscribers.discard(subscriber)
+
+    async def _stream(self, subscriber):
+        queue, writer = subscriber.queue, subscriber.writer
+        while not subscriber.closed:
+            await subscriber.ready.wait()
+            subscriber.ready.clear()
+            if subscriber.closed or writer.is_closing():
+                return
+            if queue:
+                frames = list(queue)
+                queue.clear()
+                writer.write(b"".join(frames))
+                subscriber.sent += len(frames)
+                # Пока подписчик не забирает данные, кадры копятся в его очереди
+                await writer.drain()
+
+    def stats(self):
+        return {"published": self.published, "subscribers": len(self.subscribers),
+                "disconnected": self.disconnected,
+                "dropped": sum(s.dropped for s in list(self.subscribers))}
@@ -0,0 +1,98 @@
+"""Колесо таймеров на одном цикле master.after.
+
+Вместо отдельного потока или after-цепочки на каждую периодическую задачу
+все задачи раскладываются по ячейкам колеса с шагом tick_ms. Каждый тик
+обходит одну ячейку; задача с периодом длиннее оборота колеса ждёт нужное
+число оборотов. Тики идут по плановому времени, как в TrajectoryPlayer,
+поэтому период не накапливает опоздание цикла Tk.
+"""
+import time
+
+
+class TimerWheel:
+    def __init__(self, master, tick_ms=50, slots=64):
+        self.master = master
+        self.tick_ms = tick_ms
+        self.slots = slots
+        self._wheel = [[] for _ in range(slots)]
+        self._timers = {}  # номер -> запись [номер, оборотов осталось, период в тиках, callback]
+        self._next_id = 0
+        self._cursor = 0
+        self._after = None
+        self._start = 0.0
+
+        # Статистика
+        self.ticks = 0
+        self.fired = 0
+        self.max_lateness = 0.0
+        self.max_tick = 0.0
+
+    def every(self, interval_ms, callback, phase_ms=None):
+        """Вызывать callback() каждые interval_ms; первый вызов через phase_ms (по умолчанию interval_ms)"""
+        self._next_id += 1
+        period = max(1, round(interval_ms / self.tick_ms))
+        entry = [self._next_id, 0, period, callback]
+        self._timers[self._next_id] = entry
+        delay = period if phase_ms is None else max(1, round(phase_ms / self.tick_ms))
+        self._insert(entry, delay)
+        return self._next_id
+
+    def cancel(self, timer):
+        # Запись остаётся в ячейке и выбрасывается при обходе
+        self._timers.pop(timer, None)
+
+    def _insert(self, entry, ticks):
+        entry[1] = (ticks - 1) // self.slots
+        self._wheel[(self._cursor + ticks) % self.slots].append(entry)
+
+    def __len__(self):
+        return len(self._timers)
+
+    @property
+    def running(self):
+        return self._after is not None
+
+    def start(self):
+        if self._after is None:
+            self._start = time.perf_counter() - self.ticks * self.tick_ms / 1000
+            self._after = self.master.after(self.tick_ms, self._tick)
+
+    def stop(self):
+        if self._after is not None:
+            self.master.after_cancel(self._after)
+            self._after = None
+
+    def _tick(self):
+        now = time.perf_counter()
+        self.ticks += 1
+        self.max_lateness = max(self.max_lateness, now - (self._start + self.ticks * self.tick_ms / 1000))
+        self._cursor = (self._cursor + 1) % self.slots
+        bucket = self._wheel[self._cursor]
+        self._wheel[self._cursor] = []
+        timers = self._timers
+        for entry in bucket:
+            if timers.get(entry[0]) is not entry:
+                continue
+            if entry[1]:
+                entry[1] -= 1
+                self._wheel[self._cursor].append(entry)
+                continue
+            self.fired += 1
+            entry[3]()
+            # Задачу могли отменить из её же callback
+            if timers.get(entry[0]) is entry:
+                self._insert(entry, entry[2])
+        self.max_tick = max(self.max_tick, time.perf_counter() - now)
+
+        deadline = self._start + (self.ticks + 1) * self.tick_ms / 1000
+        delay = max(0.0, deadline - time.perf_counter())
+        self._after = self.master.after(round(delay * 1000), self._tick)
+
+    def stats(self):
+        return {
+            "timers": len(self._timers),
+            "ticks": self.ticks,
+            "fired": self.fired,
+            "max_lateness_ms": self.max_lateness * 1000,
+            "max_tick_ms": self.max_tick * 1000,
+        }
@@ -0,0 +1,175 @@
+"""Траектории по сохранённым позициям.
+
+plan_trajectory заранее строит траекторию суставов с постоянным шагом по
+времени: между соседними позициями - трапецеидальный профиль скорости,
+ограничения скорости и ускорения зависят от стиля движения. TrajectoryPlayer
+воспроизводит её циклом master.after с фиксированным шагом и считает джиттер
+(разницу между плановым и фактическим временем тиков).
+"""
+import math
+import time
+from array import array
+
+# Ограничения по стилю движения: скорость (°/с), ускорение (°/с²)
+STYLE_LIMITS = {
+    "normal": (60.0, 120.0),
+    "precise": (20.0, 40.0),
+    "rapid": (150.0, 400.0),
+}
+
+
+class Trajectory:
+    def __init__(self, rate, joints=6):
+        self.rate = rate
+        self.joints = joints
+        self.samples = array('d')  # отсчёты подряд по joints углов
+        self.gripper = array('b')
+
+    def __len__(self):
+        return len(self.gripper)
+
+    @property
+    def duration(self):
+        return len(self) / self.rate
+
+    def sample(self, k):
+        base = k * self.joints
+        return self.samples[base:base + self.joints]
+
+
+def segment_profile(distance, v_max, a_max):
+    """Длительность и функция s(t) -> [0, 1] трапецеидального профиля для пути distance"""
+    if distance <= 0:
+        return 0.0, lambda t: 1.0
+    t_acc = v_max / a_max
+    if distance >= v_max * t_acc:
+        t_total = distance / v_max + t_acc
+        v_peak = v_max
+    else:
+        # Треугольный профиль: максимальная скорость не достигается
+        t_acc = math.sqrt(distance / a_max)
+        t_total = 2 * t_acc
+        v_peak = a_max * t_acc
+
+    def s(t):
+        if t <= t_acc:
+            d = 0.5 * a_max * t * t
+        elif t <= t_total - t_acc:
+            d = 0.5 * a_max * t_acc * t_acc + v_peak * (t - t_acc)
+        else:
+            left = max(0.0, t_total - t)
+            d = distance - 0.5 * a_max * left * left
+        return min(1.0, d / distance)
+
+    return t_total, s
+
+
+def plan_trajectory(poses, style="normal", rate=50):
+    """poses - последовательность (углы, захват); возвращает Trajectory с шагом 1/rate"""
+    v_max, a_max = STYLE_LIMITS[style]
+    trajectory = Trajectory(rate)
+    poses = list(poses)
+    if not poses:
+        return trajectory
+    start, gripper = poses[0]
+    trajectory.samples.extend(float(a) for a in start)
+    trajectory.gripper.append(int(gripper))
+    for (q0, _), (q1, gripper) in zip(poses, poses[1:]):
+        deltas = [b - a for a, b in zip(q0, q1)]
+        # Все суставы идут по общему профилю, который задаёт самый длинный ход
+        duration, s = segment_profile(max(abs(d) for d in deltas), v_max, a_max)
+        steps = max(1, math.ceil(duration * rate))
+        previous = trajectory.gripper[-1]
+        for k in range(1, steps + 1):
+            fraction = s(min(duration, k / rate))
+            trajectory.samples.extend(a + d * fraction for a, d in zip(q0, deltas))
+            # Захват переключается по прибытии в позицию
+            trajectory.gripper.append(int(gripper) if k == steps else previous)
+    return trajectory
+
+
+class TrajectoryPlayer:
+    """Воспроизведение с фиксированным шагом через master.after"""
+
+    def __init__(self, master, trajectory, on_tick, on_finish=None):
+        self.master = master
+        self.trajectory = trajectory
+        self.on_tick = on_tick
+        self.on_finish = on_finish
+        self.period = 1.0 / trajectory.rate
+        self.current = [0.0] * trajectory.joints  # переиспользуется на каждом тике
+        self.lateness = array('d', bytes(8 * len(trajectory)))
+        self.index = 0
+        self.running = False
+        self.paused = False
+        self._start = 0.0
+        self._paused_at = 0.0
+        self._after = None
+
+    def start(self):
+        self.index = 0
+        if not len(self.trajectory):
+            if self.on_finish is not None:
+                self.on_finish(self.jitter_stats())
+            return
+        self.running = True
+        self.paused = False
+        self._start = time.perf_counter()
+        self._tick()
+
+    def pause(self):
+        if self.running and not self.paused:
+            self.paused = True
+            self._paused_at = time.perf_counter()
+            self._cancel()
+
+    def resume(self):
+        if self.running and self.paused:
+            self.paused = False
+            # Плановое время сдвигается на длительность паузы
+            self._start += time.perf_counter() - self._paused_at
+            self._tick()
+
+    def stop(self):
+        self._cancel()
+        self.running = False
+
+    def _cancel(self):
+        if self._after is not None:
+            self.master.after_cancel(self._after)
+            self._after = None
+
+    def _tick(self):
+        self._after = None
+        k = self.index
+        now = time.perf_counter()
+        self.lateness[k] = now - (self._start + k * self.period)
+
+        samples, current, joints = self.trajectory.samples, self.current, self.trajectory.joints
+        base = k * joints
+        for j in range(joints):
+            current[j] = samples[base + j]
+        self.on_tick(current, self.trajectory.gripper[k])
+
+        self.index = k + 1
+        if self.index >= len(self.trajectory):
+            self.running = False
+            if self.on_finish is not None:
+                self.on_finish(self.jitter_stats())
+            return
+        deadline = self._start + self.index * self.period
+        delay = max(0.0, deadline - time.perf_counter())
+        self._after = self.master.after(round(delay * 1000), self._tick)
+
+    def jitter_stats(self):
+        """Отставание фактических тиков от плановых, мс"""
+        values = sorted(self.lateness[:self.index])
+        if not values:
+            return {"ticks": 0}
+        return {
+            "ticks": len(values),
+            "mean_ms": sum(values) / len(values) * 1000,
+            "p50_ms": values[len(values) // 2] * 1000,
+            "p99_ms": values[min(len(values) - 1, int(len(values) * 0.99))] * 1000,
+            "max_ms": values[-1] * 1000,
+        }
@@ -0,0 +1,186 @@
+"""Проверка целой траектории суставов до исполнения.
+
+Траектория - массив поз формы (N, 6) или Trajectory из trajectory.py.
+Проверки идут векторными проходами numpy по частям траектории:
+
+    limit     - угол сустава вне 0-180° (или не число)
+    velocity  - скорость сустава между соседними отсчётами выше v_max
+    floor     - сустав или фланец ниже линии пола (низ основания)
+    collision - пересечение или касание несмежных отрезков цепи (стойка и три звена)
+                или смежные отрезки, сложенные друг на друга
+
+Возвращается первое нарушение (Violation) или None. Части берутся по
+порядку, поэтому нарушение в начале длинной траектории находится без
+расчёта остальных отсчётов. Требует numpy.
+"""
+import collections
+
+from kinematics import FLOOR_Y, SEGMENTS
+from trajectory import STYLE_LIMITS
+
+ANGLE_MIN, ANGLE_MAX = 0.0, 180.0
+CHUNK = 1 << 16  # отсчётов за проход: точки части занимают около 5 МБ
+# Пары несмежных отрезков цепи: соседние отрезки всегда имеют общий сустав
+PAIRS = [(i, j) for i in range(len(SEGMENTS)) for j in range(i + 2, len(SEGMENTS))]
+# Смежные отрезки сталкиваются, только сложившись на общей прямой (сустав у предела 180°)
+FOLDS = [(i, i + 1) for i in range(len(SEGMENTS) - 1)]
+# Допуск касания, единицы модели: ошибка точек во float32 около 1e-4, пересечение
+# не должно зависеть от знака почти нулевого векторного произведения
+TOUCH = 1e-3
+SEGMENT_NAMES = ["стойка"] + [f"звено {i}" for i in range(1, len(SEGMENTS))]
+
+Violation = collections.namedtuple('Violation', 'index kind detail')
+
+
+def describe(violation):
+    _, kind, detail = violation
+    if kind == "limit":
+        return f"сустав {detail + 1} вне {ANGLE_MIN:g}-{ANGLE_MAX:g}°"
+    if kind == "velocity":
+        return f"скорость сустава {detail + 1} выше допустимой"
+    if kind == "floor":
+        return f"{SEGMENT_NAMES[detail - 1]} уходит ниже пола"
+    i, j = detail
+    return f"пересекаются {SEGMENT_NAMES[i]} и {SEGMENT_NAMES[j]}"
+
+
+def _first(mask):
+    hits = mask.nonzero()[0]
+    return int(hits[0]) if len(hits) else None
+
+
+def _first_row(mask, axis=1):
+    """Первая поза с нарушением; общий any по всему массиву намного быстрее any по строкам"""
+    if not mask.any():
+        return None
+    return _first(mask.any(axis=axis))
+
+
+def _cross(ox, oy, ax, ay, bx, by):
+    return (ax - ox) * (by - oy) - (ay - oy) * (bx - ox)
+
+
+def _points(q):
+    """Точки цепи по строкам: x и y формы (5, N) - непрерывные строки быстрее, чем (N, 5, 2).
+
+    Считается во float32: векторные sin/cos float32 в десятки раз быстрее
+    float64, а ошибка положения (около 1e-4 единицы модели) на проверку не влияет.
+    """
+    import numpy as np
+
+    links = len(SEGMENTS)
+    theta = np.radians(np.ascontiguousarray(q[:, :links].T, dtype=np.float32))
+    x = np.zeros((links + 1, len(q)), dtype=np.float32)
+    y = np.zeros((links + 1, len(q)), dtype=np.float32)
+    for i in range(links):
+        if i:
+            theta[i] += theta[i - 1]
+        np.add(x[i], SEGMENTS[i] * np.cos(theta[i]), out=x[i + 1])
+        np.add(y[i], SEGMENTS[i] * np.sin(theta[i]), out=y[i + 1])
+    return x, y
+
+
+def _on_segment(px, py, ax, ay, bx, by, d, length):
+    """Точка P лежит на отрезке AB с допуском TOUCH; d - cross(A, B, P)"""
+    tol = TOUCH * length
+    dot = (px - ax) * (bx - ax) + (py - ay) * (by - ay)
+    return (abs(d) <= tol) & (dot >= -tol) & (dot <= length * length + tol)
+
+
+def _intersect(x, y, i, j):
+    """Пересечение или касание отрезков i и j для каждой позы.
+
+    Собственное пересечение - концы каждого отрезка по разные стороны другого
+    с запасом TOUCH; касание и наложение на одной прямой (сложенная цепь) -
+    конец одного отрезка лежит на другом.
+    """
+    li, lj = SEGMENTS[i], SEGMENTS[j]
+    ti, tj = TOUCH * li, TOUCH * lj
+    d1 = _cross(x[j], y[j], x[j + 1], y[j + 1], x[i], y[i])
+    d2 = _cross(x[j], y[j], x[j + 1], y[j + 1], x[i + 1], y[i + 1])
+    d3 = _cross(x[i], y[i], x[i + 1], y[i + 1], x[j], y[j])
+    d4 = _cross(x[i], y[i], x[i + 1], y[i + 1], x[j + 1], y[j + 1])
+    hit = (((d1 > tj) & (d2 < -tj)) | ((d1 < -tj) & (d2 > tj))) & \
+          (((d3 > ti) & (d4 < -ti)) | ((d3 < -ti) & (d4 > ti)))
+    hit |= _on_segment(x[i], y[i], x[j], y[j], x[j + 1], y[j + 1], d1, lj)
+    hit |= _on_segment(x[i + 1], y[i + 1], x[j], y[j], x[j + 1], y[j + 1], d2, lj)
+    hit |= _on_segment(x[j], y[j], x[i], y[i], x[i + 1], y[i + 1], d3, li)
+    hit |= _on_segment(x[j + 1], y[j + 1], x[i], y[i], x[i + 1], y[i + 1], d4, li)
+    return hit
+
+
+def _folded(x, y, i):
+    """Отрезок i + 1 сложен на отрезок i: дальний конец одного лежит на другом"""
+    li, lj = SEGMENTS[i], SEGMENTS[i + 1]
+    d1 = _cross(x[i], y[i], x[i + 1], y[i + 1], x[i + 2], y[i + 2])
+    d2 = _cross(x[i + 1], y[i + 1], x[i + 2], y[i + 2], x[i], y[i])
+    return (_on_segment(x[i + 2], y[i + 2], x[i], y[i], x[i + 1], y[i + 1], d1, li) |
+            _on_segment(x[i], y[i], x[i + 1], y[i + 1], x[i + 2], y[i + 2], d2, lj))
+
+
+def _check_chunk(q, previous, max_step, floor):
+    """Первое нарушение в части траектории: (номер в части, вид, подробности) или None"""
+    import numpy as np
+
+    found = []
+    outside = ~((q >= ANGLE_MIN) & (q <= ANGLE_MAX))
+    row = _first_row(outside)
+    if row is not None:
+        found.append((row, "limit", int(np.argmax(outside[row]))))
+
+    if max_step is not None:
+        steps = np.abs(np.diff(q, axis=0, prepend=previous) if previous is not None else np.diff(q, axis=0))
+        fast = steps > max_step
+        row = _first_row(fast)
+        if row is not None:
+            found.append((row + (previous is None), "velocity", int(np.argmax(fast[row]))))
+
+    # Геометрия только до уже найденного нарушения: дальше искать незачем
+    end = min([f[0] for f in found], default=len(q))
+    x, y = _points(q[:end])
+    low = y[1:] < floor
+    row = _first_row(low, axis=0)
+    if row is not None:
+        found.append((row, "floor", int(np.argmax(low[:, row])) + 1))  # номер точки: конец отрезка
+    for i, j in PAIRS:
+        row = _first(_intersect(x, y, i, j))
+        if row is not None:
+            found.append((row, "collision", (i, j)))
+    for i, j in FOLDS:
+        row = _first(_folded(x, y, i))
+        if row is not None:
+            found.append((row, "collision", (i, j)))
+    # При равных номерах порядок проверок сохраняется: limit, velocity, floor, collision
+    return min(found, key=lambda f: f[0]) if found else None
+
+
+def check(samples, rate=None, v_max=None, start=None, floor=FLOOR_Y, chunk=CHUNK):
+    """Первое нарушение траектории samples формы (N, 6) или None.
+
+    Скорость проверяется, если заданы rate (отсчётов/с) и v_max (°/с);
+    start - поза перед первым отсчётом, от неё считается скорость первого шага.
+    """
+    import numpy as np
+
+    q = np.asarray(samples, dtype=np.float64)
+    if q.ndim == 1:
+        q = q[np.newaxis, :]
+    max_step = v_max / rate * (1 + 1e-9) if rate and v_max is not None else None
+    previous = np.asarray(start, dtype=np.float64)[np.newaxis, :] if start is not None else None
+    for lo in range(0, len(q), chunk):
+        part = q[lo:lo + chunk]
+        found = _check_chunk(part, previous, max_step, floor)
+        if found is not None:
+            row, kind, detail = found
+            return Violation(lo + row, kind, detail)
+        previous = part[-1:]
+    return None
+
+
+def check_trajectory(trajectory, style=None, start=None, floor=FLOOR_Y):
+    """Проверка Trajectory; style задаёт ограничение скорости из STYLE_LIMITS"""
+    import numpy as np
+
+    q = np.frombuffer(trajectory.samples, dtype=np.float64).reshape(-1, trajectory.joints)
+    v_max = STYLE_LIMITS[style][0] if style is not None else None
+    return check(q, trajectory.rate, v_max, start, floor)
@@ -0,0 +1,47 @@
+"""Обновление ttk.Treeview только по изменившимся ячейкам.
+
+Хранит последнее отрисованное значение каждой ячейки и вызывает tree.set
+лишь для тех, чьё отформатированное значение поменялось.
+"""
+
+
+class TreeviewDiff:
+    def __init__(self, tree, columns):
+        self.tree = tree
+        self.columns = columns
+        self.cells = {}  # item -> список последних отрисованных значений
+        self.refreshes = 0
+        self.cells_checked = 0
+        self.cells_updated = 0
+
+    def update(self, rows):
+        """rows - пары (item, значения по колонкам); возвращает число обновлённых ячеек"""
+        self.refreshes += 1
+        updated = 0
+        for item, values in rows:
+            last = self.cells.get(item)
+            self.cells_checked += len(values)
+            if last is None:
+                self.tree.item(item, values=values)
+                self.cells[item] = list(values)
+                updated += len(values)
+                continue
+            for i, value in enumerate(values):
+                if last[i] != value:
+                    self.tree.set(item, self.columns[i], value)
+                    last[i] = value
+                    updated += 1
+        self.cells_updated += updated
+        return updated
+
+    def forget(self):
+        """Сбросить кэш, например после ручного изменения строк"""
+        self.cells.clear()
+
+    def stats(self):
+        return {
+            "refreshes": self.refreshes,
+            "cells_checked": self.cells_checked,
+            "cells_updated": self.cells_updated,
+            "updated_per_refresh": self.cells_updated / self.refreshes if self.refreshes else 0.0,
+        }
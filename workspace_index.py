@@ -0,0 +1,212 @@
+"""Индекс рабочей зоны: достижимые точки инструмента и позы, которые в них приводят.
+
+Пространство первых четырёх суставов (0-180°) перебирается с шагом step,
+положения фланца считаются forward_kinematics_batch и раскладываются по
+квадратным ячейкам сетки. Индекс сохраняется в workspace_<хэш>.npz; хэш
+зависит от длин звеньев и параметров сетки, поэтому индекс перестраивается
+только при изменении геометрии. Требует numpy.
+
+    reachable(x, y)        - есть ли в ячейке точки достижимые позы (доли микросекунды)
+    nearest(x, y, prefer)  - ближайшая достижимая точка и поза для неё
+"""
+import hashlib
+import math
+import os
+
+from kinematics import SEGMENTS, forward_kinematics_batch
+
+ANGLE_MIN, ANGLE_MAX = 0, 180
+FORMAT_VERSION = 1
+
+
+def geometry_hash(step, cell):
+    key = repr((FORMAT_VERSION, SEGMENTS, ANGLE_MIN, ANGLE_MAX, step, cell))
+    return hashlib.sha1(key.encode('utf-8')).hexdigest()[:12]
+
+
+class WorkspaceIndex:
+    def __init__(self, step, cell, positions, angles, starts):
+        self.step = step
+        self.cell = cell
+        self.positions = positions  # (N, 2) float32, отсортированы по ячейкам
+        self.angles = angles  # (N, 4) uint8, градусы
+        self.starts = starts  # начало каждой ячейки в positions, длина cells + 1
+        self.reach = float(sum(SEGMENTS))
+        self.width = math.ceil(2 * self.reach / cell) + 1
+        self.origin = -self.reach
+        # Занятость ячеек отдельным bytes: проверка без numpy
+        self.occupied = (starts[1:] > starts[:-1]).astype('uint8').tobytes()
+        self._starts = starts.tolist()
+        self._rings = self._nearest_rings()
+
+    def _nearest_rings(self):
+        """Для каждой ячейки - кольцо, в котором впервые встречается занятая ячейка (-1 - нигде)"""
+        import numpy as np
+
+        width = self.width
+        found = np.frombuffer(self.occupied, dtype=np.uint8).reshape(width, width).astype(bool)
+        rings = np.full((width, width), -1, dtype=np.int64)
+        ring = 0
+        while found.any() and (rings < 0).any():
+            rings[found & (rings < 0)] = ring
+            # Квадрат растёт на ячейку во все стороны: сдвиги по строкам и столбцам
+            grown = found.copy()
+            grown[1:] |= found[:-1]
+            grown[:-1] |= found[1:]
+            found = grown.copy()
+            found[:, 1:] |= grown[:, :-1]
+            found[:, :-1] |= grown[:, 1:]
+            ring += 1
+        return rings.ravel().tolist()
+
+    # --- Построение и хранение ---
+
+    @classmethod
+    def build(cls, step=6, cell=5.0):
+        import numpy as np
+
+        values = np.arange(ANGLE_MIN, ANGLE_MAX + 1, step, dtype=np.uint8)
+        grids = np.meshgrid(values, values, values, values, indexing='ij')
+        angles = np.stack([g.ravel() for g in grids], axis=1)
+        positions = np.empty((len(angles), 2), dtype=np.float32)
+        # Частями, чтобы не держать в памяти все промежуточные точки суставов
+        chunk = 1 << 18
+        for start in range(0, len(angles), chunk):
+            points, _ = forward_kinematics_batch(angles[start:start + chunk])
+            positions[start:start + chunk] = points[:, -1]
+
+        reach = float(sum(SEGMENTS))
+        width = math.ceil(2 * reach / cell) + 1
+        ix = np.floor((positions[:, 0] + reach) / cell).astype(np.int64)
+        iy = np.floor((positions[:, 1] + reach) / cell).astype(np.int64)
+        keys = iy * width + ix
+        order = np.argsort(keys, kind='stable')
+        starts = np.searchsorted(keys[order], np.arange(width * width + 1)).astype(np.int64)
+        return cls(step, cell, positions[order], angles[order], starts)
+
+    def save(self, path):
+        import numpy as np
+
+        tmp = path + ".tmp.npz"
+        np.savez(tmp, geometry=np.array(geometry_hash(self.step, self.cell)),
+                 params=np.array([self.step, self.cell]), positions=self.positions,
+                 angles=self.angles, starts=self.starts)
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path):
+        import numpy as np
+
+        with np.load(path) as data:
+            step, cell = data["params"].tolist()
+            if str(data["geometry"]) != geometry_hash(int(step), cell):
+                raise ValueError("индекс построен для другой геометрии")
+            return cls(int(step), cell, data["positions"], data["angles"], data["starts"])
+
+    @classmethod
+    def load_or_build(cls, directory=".", step=6, cell=5.0):
+        """Загрузить индекс для текущей геометрии или построить и сохранить его"""
+        path = os.path.join(directory, f"workspace_{geometry_hash(step, cell)}.npz")
+        try:
+            return cls.load(path)
+        except (OSError, ValueError, KeyError):
+            pass
+        index = cls.build(step, cell)
+        try:
+            index.save(path)
+        except OSError:
+            pass
+        return index
+
+    def __len__(self):
+        return len(self.positions)
+
+    # --- Запросы ---
+
+    def _cell(self, x, y):
+        ix = int((x - self.origin) // self.cell)
+        iy = int((y - self.origin) // self.cell)
+        if 0 <= ix < self.width and 0 <= iy < self.width:
+            return ix, iy
+        return None
+
+    def reachable(self, x, y):
+        """Достижима ли точка с точностью до размера ячейки"""
+        cell = self._cell(x, y)
+        return cell is not None and self.occupied[cell[1] * self.width + cell[0]] == 1
+
+    def _candidates(self, ix, iy, ring):
+        starts, width = self._starts, self.width
+        ranges = []
+        for cy in range(max(0, iy - ring), min(width, iy + ring + 1)):
+            row = cy * width
+            lo = starts[row + max(0, ix - ring)]
+            hi = starts[row + min(width - 1, ix + ring) + 1]
+            if hi > lo:
+                ranges.append((lo, hi))
+        return ranges
+
+    def _gap(self, x, y, ix, iy, ring):
+        """Нижняя граница расстояния от (x, y) до точек за кольцом ring; None - за ним нет ячеек"""
+        lo = self.origin + (ix - ring) * self.cell, self.origin + (iy - ring) * self.cell
+        hi = lo[0] + (2 * ring + 1) * self.cell, lo[1] + (2 * ring + 1) * self.cell
+        gaps = []
+        if ix - ring > 0:
+            gaps.append(x - lo[0])
+        if ix + ring + 1 < self.width:
+            gaps.append(hi[0] - x)
+        if iy - ring > 0:
+            gaps.append(y - lo[1])
+        if iy + ring + 1 < self.width:
+            gaps.append(hi[1] - y)
+        return min(gaps) if gaps else None
+
+    def nearest(self, x, y, prefer=None):
+        """Ближайшая достижимая точка: (углы 4 суставов, расстояние, (x, y)).
+
+        Если prefer - текущие углы, среди точек не дальше размера ячейки от
+        ближайшей выбирается поза с наименьшим отклонением суставов от prefer.
+        """
+        import numpy as np
+
+        reach = self.reach + self.cell
+        # Точка вне сетки проецируется на её край
+        cx = min(max(x, -reach + 1e-6), reach - 1e-6)
+        cy = min(max(y, -reach + 1e-6), reach - 1e-6)
+        last = self.width - 1
+        ix = min(max(int((cx - self.origin) // self.cell), 0), last)
+        iy = min(max(int((cy - self.origin) // self.cell), 0), last)
+        # Пустые кольца вокруг точки вне рабочей зоны пропускаются сразу
+        ring = self._rings[iy * self.width + ix]
+        if ring < 0:
+            return None
+        # Ближайшая точка (и для prefer - все точки в пределах ячейки от неё) может
+        # лежать и в дальних кольцах: квадрат расширяется до кольца, граница
+        # которого дальше найденного расстояния (граница отходит на ячейку за кольцо).
+        # С prefer первого непустого кольца не хватает никогда: берётся следующее
+        margin = 0.0
+        if prefer is not None:
+            margin = self.cell
+            ring += 1
+        ranges = self._candidates(ix, iy, ring)
+        point = np.array([x, y], dtype=np.float32)
+        positions = self.positions
+        while True:
+            # Строки квадрата - непрерывные срезы: склейка срезов намного дешевле выборки по индексам
+            delta = np.concatenate([positions[lo:hi] for lo, hi in ranges]) - point
+            distance = np.hypot(delta[:, 0], delta[:, 1])
+            best = int(np.argmin(distance))
+            gap = self._gap(x, y, ix, iy, ring)
+            if gap is None or gap > distance[best] + margin:
+                break
+            ring += int((distance[best] + margin - gap) // self.cell) + 1
+            ranges = self._candidates(ix, iy, ring)
+        indices = np.concatenate([np.arange(lo, hi) for lo, hi in ranges])
+        if prefer is not None:
+            close = np.flatnonzero(distance <= distance[best] + self.cell)
+            deviation = np.abs(self.angles[indices[close]].astype(np.float32) -
+                               np.asarray(prefer[:4], dtype=np.float32)).max(axis=1)
+            best = int(close[np.argmin(deviation)])
+        k = int(indices[best])
+        px, py = self.positions[k].tolist()
+        return self.angles[k].tolist(), float(distance[best]), (px, py)